@@ -1,4 +1,3 @@
-import pyodbc
 import pandas as pd
 import dash
 import dash_bootstrap_components as dbc
@@ -17,6 +16,7 @@ from multiprocessing import Process, Queue
 import plotly.express as px
 import plotly.graph_objects as go
 import base64
+from db_pool import get_pool
 from waitress import serve
 
 time.clock = time.time
@@ -51,74 +51,65 @@ default_date = get_last_business_day().strftime('%Y-%m-%d')
 
 # Function to fetch data
 def fetch_data(selected_date):
-    conn_str = (
-        r'DRIVER={SQL Server};'
-        r'SERVER=SDC01ASRSQPD01S\PSQLINST01;'
-        r'DATABASE=ASPIRE;'
-        r'Trusted_Connection=yes;'
-    )
-    conn = pyodbc.connect(conn_str)
-
-    query = f"""
-    SELECT 
-        CASE 
-            WHEN DATEPART(hour, JSH.StartTime) < 14 THEN CONVERT(varchar, DATEADD(day, -1, JSH.StartTime), 23) 
-            ELSE CONVERT(varchar, JSH.StartTime, 23) 
-        END as ProcessingDate, 
-        JSJ.JobStreamJoboid as Joboid, 
-        JSJ.Name as JobName,
-        CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime], 
-        CONVERT(datetime, JSH.EndTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [EndTime], 
-        JSH.Status, 
-        JSH.Message 
-    FROM JobStreamTaskHistory JSH
-    LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
-    JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
-    WHERE 
-        CASE 
-            WHEN DATEPART(hour, JSH.StartTime) < 14 THEN CONVERT(varchar, DATEADD(day, -1, JSH.StartTime), 23) 
-            ELSE CONVERT(varchar, JSH.StartTime, 23) 
-        END = '{selected_date}'
-    ORDER BY StartTime ASC
-    """
-    df = pd.read_sql(query, conn)
-
-    query_30_days = """
-    SELECT 
-        CONVERT(varchar, JSH.StartTime, 23) as ProcessingDate, 
-        JSH.Status,
-        JSJ.Name as JobName,
-        CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime],
-        CONVERT(datetime, JSH.EndTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [EndTime],
-        JSH.Message
-    FROM JobStreamTaskHistory JSH
-    LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
-    JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
-    WHERE JSH.StartTime >= DATEADD(day, -30, GETDATE())
-    """
-    df_30_days = pd.read_sql(query_30_days, conn)
-
-    query_job_duration = """
-    SELECT 
-        CONVERT(varchar, JSH.StartTime, 23) as ProcessingDate, 
-        JSJ.Name as JobName,
-        DATEDIFF(SECOND, JSH.StartTime, JSH.EndTime) / 60.0 as DurationMinutes
-    FROM JobStreamTaskHistory JSH
-    LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
-    JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
-    WHERE JSH.StartTime >= DATEADD(month, -6, GETDATE())
-    """
-    df_job_duration = pd.read_sql(query_job_duration, conn)
-
-    query_unlock_online = f"""
-    SELECT JobName, CONVERT(datetime, EndTime) AS CompletionTime, Status 
-    FROM Job_StatsVW 
-    WHERE JobName = 'UnLock Online' 
-    AND ProcessingDate = '{selected_date}'
-    """
-    df_unlock_online = pd.read_sql(query_unlock_online, conn)
-
-    conn.close()
+    with get_pool().connection() as conn:
+        query = f"""
+        SELECT 
+            CASE 
+                WHEN DATEPART(hour, JSH.StartTime) < 14 THEN CONVERT(varchar, DATEADD(day, -1, JSH.StartTime), 23) 
+                ELSE CONVERT(varchar, JSH.StartTime, 23) 
+            END as ProcessingDate, 
+            JSJ.JobStreamJoboid as Joboid, 
+            JSJ.Name as JobName,
+            CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime], 
+            CONVERT(datetime, JSH.EndTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [EndTime], 
+            JSH.Status, 
+            JSH.Message 
+        FROM JobStreamTaskHistory JSH
+        LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
+        JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
+        WHERE 
+            CASE 
+                WHEN DATEPART(hour, JSH.StartTime) < 14 THEN CONVERT(varchar, DATEADD(day, -1, JSH.StartTime), 23) 
+                ELSE CONVERT(varchar, JSH.StartTime, 23) 
+            END = '{selected_date}'
+        ORDER BY StartTime ASC
+        """
+        df = pd.read_sql(query, conn)
+
+        query_30_days = """
+        SELECT 
+            CONVERT(varchar, JSH.StartTime, 23) as ProcessingDate, 
+            JSH.Status,
+            JSJ.Name as JobName,
+            CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime],
+            CONVERT(datetime, JSH.EndTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [EndTime],
+            JSH.Message
+        FROM JobStreamTaskHistory JSH
+        LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
+        JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
+        WHERE JSH.StartTime >= DATEADD(day, -30, GETDATE())
+        """
+        df_30_days = pd.read_sql(query_30_days, conn)
+
+        query_job_duration = """
+        SELECT 
+            CONVERT(varchar, JSH.StartTime, 23) as ProcessingDate, 
+            JSJ.Name as JobName,
+            DATEDIFF(SECOND, JSH.StartTime, JSH.EndTime) / 60.0 as DurationMinutes
+        FROM JobStreamTaskHistory JSH
+        LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
+        JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
+        WHERE JSH.StartTime >= DATEADD(month, -6, GETDATE())
+        """
+        df_job_duration = pd.read_sql(query_job_duration, conn)
+
+        query_unlock_online = f"""
+        SELECT JobName, CONVERT(datetime, EndTime) AS CompletionTime, Status 
+        FROM Job_StatsVW 
+        WHERE JobName = 'UnLock Online' 
+        AND ProcessingDate = '{selected_date}'
+        """
+        df_unlock_online = pd.read_sql(query_unlock_online, conn)
 
     return df, df_30_days, df_job_duration, df_unlock_online
 
@@ -0,0 +1,140 @@
+import threading
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# Runs after which an old run counts half as much as a new one in a job's statistics
+HALF_LIFE_RUNS = 20
+
+# Runs a job needs before its runs are scored
+MIN_RUNS = 5
+
+# How far from the job's own mean (in standard deviations) a run must be to count as an anomaly
+Z_THRESHOLD = 3.0
+
+# Floor for a job's standard deviation, so very steady jobs do not flag tiny wobbles:
+# a fraction of the job's mean or a fixed number of minutes, whichever is larger
+MIN_STD_FRACTION = 0.05
+MIN_STD_MINUTES = 0.5
+
+# Days of flagged runs kept for the Anomaly Detection tab
+ANOMALY_WINDOW_DAYS = 30
+
+# Days a folded-in run is remembered, so it is not folded in twice while it is
+# still inside the windows fed to update (longer than the 30-day window)
+SEEN_DAYS = ANOMALY_WINDOW_DAYS + 5
+
+
+# Function to key runs by job, start time and JobStreamTaskHistory row, so two tasks
+# of one job that start together stay apart. Rows without the row id (frames
+# built elsewhere, or day files stored before it was selected) use None.
+def run_keys(runs):
+    if 'TaskHistoryOid' not in runs:
+        return list(zip(runs['JobName'], runs['StartTime'], [None] * len(runs)))
+    oids = runs['TaskHistoryOid'].astype(object)
+    return list(zip(runs['JobName'], runs['StartTime'], oids.where(oids.notna(), None)))
+
+
+# Streaming per-job duration statistics. Each job keeps an exponentially weighted mean
+# and variance (Welford's update with a decay; plain Welford until the job has enough
+# runs), held in arrays indexed by job so an update touches every job at once.
+# Each run is scored against its job's statistics before it is folded in, once it
+# has finished. Runs are remembered by their run_keys, so feeding overlapping
+# windows is safe and a run that was still going at one update is scored at the
+# first update after it ends, however long it overran.
+class AnomalyEngine:
+    def __init__(self, half_life=HALF_LIFE_RUNS, min_runs=MIN_RUNS, threshold=Z_THRESHOLD):
+        self.alpha = 1 - 0.5 ** (1 / half_life)
+        self.min_runs = min_runs
+        self.threshold = threshold
+        self.jobs = {}  # JobName -> array index
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0)
+        self.var = np.zeros(0)
+        self.seen = {}  # run_keys of each run folded in -> StartTime
+        self.newest = None  # StartTime of the newest run folded in
+        self.anomalies = pd.DataFrame(columns=['JobName', 'StartTime', 'DurationMinutes', 'ExpectedMinutes', 'ZScore'])
+        self._lock = threading.Lock()
+
+    # Function to map job names to array indexes, growing the arrays for new jobs
+    def _indexes(self, job_names):
+        for job_name in pd.unique(job_names):
+            if job_name not in self.jobs:
+                self.jobs[job_name] = len(self.jobs)
+        grow = len(self.jobs) - len(self.count)
+        if grow:
+            self.count = np.concatenate([self.count, np.zeros(grow, dtype=np.int64)])
+            self.mean = np.concatenate([self.mean, np.zeros(grow)])
+            self.var = np.concatenate([self.var, np.zeros(grow)])
+        return np.fromiter((self.jobs[job_name] for job_name in job_names), dtype=np.int64, count=len(job_names))
+
+    # Function to fold new runs (JobName, StartTime, DurationMinutes) into the statistics.
+    # Returns the new runs with ExpectedMinutes, ZScore and Anomaly columns.
+    def update(self, runs):
+        with self._lock:
+            runs = runs.dropna(subset=['DurationMinutes'])
+            runs = runs[[key not in self.seen for key in run_keys(runs)]]
+            runs = runs.sort_values('StartTime', kind='mergesort')
+            if runs.empty:
+                return runs.assign(ExpectedMinutes=np.nan, ZScore=np.nan, Anomaly=False)
+
+            indexes = self._indexes(runs['JobName'].to_numpy())
+            durations = runs['DurationMinutes'].to_numpy(dtype=float)
+            expected = np.empty(len(runs))
+            z_scores = np.zeros(len(runs))
+
+            # Round k holds the k-th new run of every job, so within a round each job
+            # appears once and the whole round is one vectorized step
+            rounds = runs.groupby('JobName', sort=False).cumcount().to_numpy()
+            order = np.argsort(rounds, kind='stable')
+            bounds = np.searchsorted(rounds[order], np.arange(rounds.max() + 2))
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                positions = order[start:end]
+                job, x = indexes[positions], durations[positions]
+                mean, count = self.mean[job], self.count[job]
+
+                std = np.maximum(np.sqrt(self.var[job]), np.maximum(MIN_STD_FRACTION * np.abs(mean), MIN_STD_MINUTES))
+                expected[positions] = np.where(count > 0, mean, np.nan)
+                z_scores[positions] = np.where(count >= self.min_runs, (x - mean) / std, 0.0)
+
+                count = count + 1
+                alpha = np.maximum(self.alpha, 1.0 / count)
+                diff = x - mean
+                increment = alpha * diff
+                self.mean[job] = mean + increment
+                self.var[job] = (1 - alpha) * (self.var[job] + diff * increment)
+                self.count[job] = count
+
+            self.newest = max(self.newest, runs['StartTime'].iloc[-1]) if self.newest is not None else runs['StartTime'].iloc[-1]
+            self.seen.update(zip(run_keys(runs), runs['StartTime']))
+            forget = self.newest - timedelta(days=SEEN_DAYS)
+            self.seen = {key: start for key, start in self.seen.items() if start >= forget}
+            scored = runs[['JobName', 'StartTime', 'DurationMinutes']].assign(
+                ExpectedMinutes=expected, ZScore=z_scores, Anomaly=np.abs(z_scores) > self.threshold
+            )
+            flagged = scored.loc[scored['Anomaly'], ['JobName', 'StartTime', 'DurationMinutes', 'ExpectedMinutes', 'ZScore']]
+            if not flagged.empty:
+                cutoff = self.newest - timedelta(days=ANOMALY_WINDOW_DAYS)
+                kept = self.anomalies[self.anomalies['StartTime'] >= cutoff]
+                self.anomalies = pd.concat([kept, flagged], ignore_index=True) if not kept.empty else flagged.reset_index(drop=True)
+            return scored
+
+    # Function to get the flagged runs that started at or after `since`
+    def recent_anomalies(self, since):
+        with self._lock:
+            return self.anomalies[self.anomalies['StartTime'] >= since].reset_index(drop=True)
+
+    # Function to report each job's current statistics
+    def stats(self):
+        with self._lock:
+            return pd.DataFrame({
+                'JobName': list(self.jobs),
+                'Runs': self.count,
+                'MeanMinutes': self.mean,
+                'StdMinutes': np.sqrt(self.var),
+            })
+
+
+# Shared engine, fed by the Anomaly Detection tab from the 30-day rows
+anomaly_engine = AnomalyEngine()
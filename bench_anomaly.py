@@ -0,0 +1,68 @@
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from anomaly_engine import AnomalyEngine
+
+# Benchmark: feed months of synthetic nightly runs into the per-job anomaly
+# engine one night at a time and check that the cost of an update stays flat
+# as history grows. Also reports how many injected slowdowns the engine and
+# the old global z-score (over every row) find.
+# Usage: python bench_anomaly.py [days] [jobs]
+
+DAYS = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+JOBS = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+SLOWDOWN_RATE = 0.002  # share of runs that take 10x their usual time
+
+
+# Function to build synthetic history: each job has its own typical duration,
+# from half a minute to three hours (the TRIAD-like jobs), with some noise
+def synthetic_runs(days=DAYS, jobs=JOBS, seed=11):
+    rng = np.random.default_rng(seed)
+    typical = np.exp(rng.uniform(np.log(0.5), np.log(180), jobs))
+    start = datetime(2025, 1, 1, 21)
+    nights = []
+    for day in range(days):
+        durations = typical * rng.gamma(50.0, 1 / 50.0, jobs)
+        slow = rng.random(jobs) < SLOWDOWN_RATE
+        durations[slow] *= 10
+        nights.append(pd.DataFrame({
+            'JobName': [f"{job}. Job {job}" for job in range(jobs)],
+            'StartTime': [start + timedelta(days=day, minutes=job) for job in range(jobs)],
+            'DurationMinutes': durations,
+            'Injected': slow,
+        }))
+    return nights
+
+
+def main():
+    nights = synthetic_runs()
+    engine = AnomalyEngine()
+
+    update_seconds = []
+    flagged = []
+    for night in nights:
+        start = time.perf_counter()
+        scored = engine.update(night)
+        update_seconds.append(time.perf_counter() - start)
+        flagged.append(scored['Anomaly'].to_numpy())
+
+    history = pd.concat(nights, ignore_index=True)
+    injected = history['Injected'].to_numpy()
+    engine_flags = np.concatenate(flagged)
+    global_flags = (((history['DurationMinutes'] - history['DurationMinutes'].mean()) / history['DurationMinutes'].std()).abs() > 2).to_numpy()
+
+    print(f"{DAYS} nights x {JOBS} jobs ({len(history)} runs)")
+    for month in range(0, DAYS // 30, max(1, DAYS // 30 // 4)):
+        print(f"engine update per night, month {month + 1:2d}: median {statistics.median(update_seconds[month * 30 + 1:(month + 1) * 30]) * 1000:.2f} ms")
+    for name, flags in (('engine', engine_flags), ('global z-score', global_flags)):
+        print(f"{name:>15}: {int((flags & injected).sum())}/{int(injected.sum())} injected slowdowns found, "
+              f"{int((flags & ~injected).sum())} normal runs flagged")
+
+
+if __name__ == '__main__':
+    main()
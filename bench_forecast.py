@@ -0,0 +1,71 @@
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from forecast import BAND_QUANTILES, UNLOCK_JOB, remaining_profile, forecast_unlock
+
+# Benchmark: replay synthetic nights one finished job at a time and forecast when
+# UnLock Online finishes after each one, from a profile of the 30 nights before.
+# Reports the cost of a forecast (what every live poll pays), the cost of building
+# the profile, how often the actual time fell inside the band and the typical error.
+# Usage: python bench_forecast.py [nights] [jobs]
+
+NIGHTS = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+JOBS = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+HISTORY_NIGHTS = 30
+
+
+# Function to build synthetic nights: jobs run one after another from 9 PM, each
+# with its own typical duration and some noise, and UnLock Online comes last
+def synthetic_nights(nights=NIGHTS, jobs=JOBS, seed=7):
+    rng = np.random.default_rng(seed)
+    typical = np.exp(rng.uniform(np.log(1), np.log(45), jobs))
+    names = [f"{job + 1}. Job {job + 1}" for job in range(jobs)] + [UNLOCK_JOB]
+    runs = []
+    for night in range(nights):
+        date = datetime(2025, 1, 1) + timedelta(days=night)
+        time_now = date + timedelta(hours=21)
+        rows = []
+        for name, minutes in zip(names, list(typical * rng.gamma(20.0, 1 / 20.0, jobs)) + [2.0]):
+            end_time = time_now + timedelta(minutes=float(minutes))
+            rows.append({'ProcessingDate': date.strftime('%Y-%m-%d'), 'JobName': name, 'StartTime': time_now,
+                         'EndTime': end_time, 'Status': 'Succeeded'})
+            time_now = end_time + timedelta(minutes=1)
+        runs.append(pd.DataFrame(rows))
+    return runs
+
+
+def main():
+    nights = synthetic_nights()
+    forecast_seconds, profile_seconds = [], []
+    inside, errors = 0, []
+    for night in range(HISTORY_NIGHTS, len(nights)):
+        start = time.perf_counter()
+        profile = remaining_profile(pd.concat(nights[night - HISTORY_NIGHTS:night], ignore_index=True))
+        profile_seconds.append(time.perf_counter() - start)
+
+        tonight = nights[night]
+        actual = tonight['EndTime'].iloc[-1]
+        for finished in range(len(tonight) - 1):
+            so_far = tonight.iloc[:finished]
+            now = so_far['EndTime'].max() if finished else tonight['StartTime'].iloc[0]
+            start = time.perf_counter()
+            forecast = forecast_unlock(tonight['ProcessingDate'].iloc[0], so_far, profile, now=now)
+            forecast_seconds.append(time.perf_counter() - start)
+            inside += forecast['Low'] <= actual <= forecast['High']
+            errors.append(abs((forecast['Estimate'] - actual).total_seconds()) / 60)
+
+    band = round((BAND_QUANTILES[-1] - BAND_QUANTILES[0]) * 100)
+    print(f"{len(nights) - HISTORY_NIGHTS} nights x {JOBS} jobs, profile from {HISTORY_NIGHTS} nights")
+    print(f"profile build: median {statistics.median(profile_seconds) * 1000:.1f} ms")
+    print(f"forecast per poll: median {statistics.median(forecast_seconds) * 1000:.2f} ms")
+    print(f"actual inside the {band}% band: {inside / len(forecast_seconds):.0%} of {len(forecast_seconds)} forecasts")
+    print(f"estimate error: median {statistics.median(errors):.1f} min")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Load test: serves the app with waitress against a stub database and
+# replays concurrent date-picker changes, reporting p50/p95/p99 latency per callback request.
+# Usage: python bench_load.py [requests] [concurrency]
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+PORT = 8765
+THREADS = 16
+STUB_QUERY_LATENCY = 0.2  # seconds each stub query pretends to take
+JOBS_PER_NIGHT = 60
+DATES = 20  # how many recent business days the clients pick from
+
+os.environ.setdefault('ASPIRE_PREFETCH', '0')
+os.environ.setdefault('ASPIRE_SNAPSHOT_DIR', tempfile.mkdtemp(prefix='aspire_snapshots_'))
+
+
+# Function to build synthetic JobStreamTaskHistory rows for the last `days` days
+def synthetic_history(days=190, seed=7):
+    rng = np.random.default_rng(seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    job_names = [f"{i}. Job {i}" for i in range(1, JOBS_PER_NIGHT - 3)] + ['18. TRIAD', '20. Benchmark Update', 'UnLock Online']
+    rows = []
+    for day in range(days):
+        processing_date = today - timedelta(days=day + 1)
+        if processing_date.weekday() >= 5:
+            continue
+        start = processing_date + timedelta(hours=21)
+        for job_id, job_name in enumerate(job_names):
+            duration = timedelta(minutes=float(rng.gamma(2.0, 10.0)))
+            status = 'Failed' if rng.random() < 0.03 else 'Succeeded'
+            rows.append((processing_date.strftime('%Y-%m-%d'), job_id, job_name, start, start + duration, status, 'Stub message'))
+            start += duration
+    history = pd.DataFrame(rows, columns=['ProcessingDate', 'Joboid', 'JobName', 'StartTime', 'EndTime', 'Status', 'Message'])
+    history['DurationMinutes'] = (history['EndTime'] - history['StartTime']).dt.total_seconds() / 60.0
+    return history
+
+
+# Function to answer one dashboard query from the synthetic history
+def stub_frame(history, name, selected_date, since=None):
+    recent = history[history['StartTime'] >= datetime.now() - timedelta(days=30)]
+    if name == 'jobs':
+        return history[history['ProcessingDate'] == selected_date].drop(columns=['DurationMinutes']).reset_index(drop=True)
+    if name == 'last_30_days':
+        # Like the query, these rows are dated by the day they started
+        runs = recent.drop(columns=['Joboid', 'Message']).assign(ProcessingDate=recent['StartTime'].dt.strftime('%Y-%m-%d'))
+        return runs[runs['ProcessingDate'] >= since].reset_index(drop=True)
+    if name == 'unlock_online':
+        unlock = history[(history['ProcessingDate'] == selected_date) & (history['JobName'] == 'UnLock Online')]
+        return unlock[['JobName', 'EndTime', 'Status']].rename(columns={'EndTime': 'CompletionTime'}).reset_index(drop=True)
+    if name == 'failure_trend':
+        failed = recent[(recent['Status'] == 'Failed') & (recent['JobName'] != '20. Benchmark Update')]
+        return failed.groupby(['ProcessingDate', 'JobName', 'StartTime', 'Message']).size().reset_index(name='Count')
+    if name == 'job_metrics':
+        return recent.groupby('JobName').agg(
+            AvgDuration=('DurationMinutes', 'mean'),
+            SuccessRate=('Status', lambda x: (x != 'Failed').mean() * 100),
+            Frequency=('JobName', 'count')
+        ).reset_index()
+    raise KeyError(name)
+
+
+# Function to replace the database-facing functions with the stub
+def install_stub_database(history):
+    import data_cache
+
+    def run_concurrently(queries, pool=None, timeout=None):
+        time.sleep(STUB_QUERY_LATENCY)  # the queries run in parallel, so one latency for all
+        selected_date = None
+        if 'unlock_online' in queries:
+            selected_date = queries['unlock_online'][1][0]
+        elif 'jobs' in queries:
+            selected_date = queries['jobs'][1][0].strftime('%Y-%m-%d')
+        since = queries['last_30_days'][1][0] if 'last_30_days' in queries else None
+        frames = {name: stub_frame(history, name, selected_date, since) for name in queries}
+        return frames, {name: STUB_QUERY_LATENCY for name in queries}
+
+    def fetch_job_duration(pool=None, path=None):
+        return history.groupby(['ProcessingDate', 'JobName'])['DurationMinutes'].mean().reset_index()
+
+    data_cache.run_concurrently = run_concurrently
+    data_cache.fetch_job_duration = fetch_job_duration
+
+
+# Function to build the Dash request bodies a date-picker change sends, one per callback
+# that listens only to the date (the main tab's outputs)
+def date_change_payloads(app, selected_date):
+    payloads = []
+    for output, callback in app.callback_map.items():
+        if [item['id'] for item in callback['inputs']] == ['date-picker-table']:
+            outputs = [dict(zip(('id', 'property'), part.split('.'))) for part in output.strip('.').split('...')]
+            payloads.append({
+                'output': output,
+                'outputs': outputs if output.startswith('..') else outputs[0],
+                'inputs': [{'id': 'date-picker-table', 'property': 'date', 'value': selected_date}],
+                'changedPropIds': ['date-picker-table.date'],
+                'state': [],
+            })
+    if not payloads:
+        raise RuntimeError("No callback listens to the date picker")
+    return payloads
+
+
+# Function to send one request and return its latency in seconds
+def timed_request(url, body):
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=120) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def main():
+    history = synthetic_history()
+    install_stub_database(history)
+
+    import main as dashboard
+    from waitress import create_server
+
+    web_server = create_server(dashboard.server, host='127.0.0.1', port=PORT, threads=THREADS)
+    threading.Thread(target=web_server.run, daemon=True).start()
+
+    business_days = sorted(history['ProcessingDate'].unique())[-DATES:]
+    random.seed(1)
+    # Each simulated date change sends every date callback's request, as the browser does
+    bodies = [json.dumps(payload).encode()
+              for _ in range(REQUESTS)
+              for payload in date_change_payloads(dashboard.app, random.choice(business_days))]
+    url = f"http://127.0.0.1:{PORT}/_dash-update-component"
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        latencies = sorted(executor.map(lambda body: timed_request(url, body), bodies))
+    elapsed = time.perf_counter() - start
+    web_server.close()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{REQUESTS} date changes ({len(bodies)} requests), concurrency {CONCURRENCY}, {THREADS} server threads, {elapsed:.1f}s total ({len(bodies) / elapsed:.1f} req/s)")
+    print(f"p50 {percentiles[49] * 1000:.0f} ms   p95 {percentiles[94] * 1000:.0f} ms   p99 {percentiles[98] * 1000:.0f} ms   max {latencies[-1] * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
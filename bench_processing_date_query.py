@@ -0,0 +1,99 @@
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fetch_engine import processing_date_range
+
+# Benchmark: CASE-on-StartTime predicate (full scan) versus the StartTime
+# range predicate (index seek) against a synthetic JobStreamTaskHistory.
+# Usage: python bench_processing_date_query.py [rows]
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+REPEATS = 5
+SELECTED_DATE = '2024-06-12'
+
+query_case = """
+SELECT JobStreamTaskOid, StartTime, EndTime, Status
+FROM JobStreamTaskHistory
+WHERE
+    CASE
+        WHEN CAST(strftime('%H', StartTime) AS INTEGER) < 14 THEN date(StartTime, '-1 day')
+        ELSE date(StartTime)
+    END = ?
+"""
+
+query_range = """
+SELECT JobStreamTaskOid, StartTime, EndTime, Status
+FROM JobStreamTaskHistory
+WHERE StartTime >= ? AND StartTime < ?
+"""
+
+
+# Function to fill the table with runs spread evenly over the years before SELECTED_DATE
+def build_table(conn, rows):
+    conn.execute("""
+        CREATE TABLE JobStreamTaskHistory (
+            JobStreamTaskOid INTEGER,
+            StartTime TEXT,
+            EndTime TEXT,
+            Status TEXT
+        )
+    """)
+    end = datetime.strptime(SELECTED_DATE, '%Y-%m-%d') + timedelta(days=2)
+    start = end - timedelta(days=max(30, rows // 400))  # ~400 runs per night
+    span = (end - start).total_seconds()
+    random.seed(42)
+    batch = []
+    for _ in range(rows):
+        started = start + timedelta(seconds=random.random() * span)
+        ended = started + timedelta(minutes=random.randint(1, 180))
+        batch.append((random.randint(1, 60), started.strftime('%Y-%m-%d %H:%M:%S'), ended.strftime('%Y-%m-%d %H:%M:%S'),
+                      'Failed' if random.random() < 0.02 else 'Succeeded'))
+        if len(batch) == 50_000:
+            conn.executemany("INSERT INTO JobStreamTaskHistory VALUES (?, ?, ?, ?)", batch)
+            batch = []
+    conn.executemany("INSERT INTO JobStreamTaskHistory VALUES (?, ?, ?, ?)", batch)
+    conn.execute("CREATE INDEX IX_JobStreamTaskHistory_StartTime ON JobStreamTaskHistory (StartTime)")
+    conn.commit()
+
+
+# Function to run a query a few times and return (best seconds, row count, plan)
+def time_query(conn, query, params):
+    plan = ' / '.join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params))
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        rows = conn.execute(query, params).fetchall()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(rows), plan
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    conn = sqlite3.connect(path)
+    print(f"Building {ROWS:,} synthetic rows...")
+    build_table(conn, ROWS)
+
+    range_start, range_end = processing_date_range(SELECTED_DATE)
+    range_params = [range_start.strftime('%Y-%m-%d %H:%M:%S'), range_end.strftime('%Y-%m-%d %H:%M:%S')]
+
+    case_time, case_rows, case_plan = time_query(conn, query_case, [SELECTED_DATE])
+    range_time, range_rows, range_plan = time_query(conn, query_range, range_params)
+
+    print(f"CASE predicate : {case_time * 1000:9.2f} ms  rows={case_rows:<6} plan: {case_plan}")
+    print(f"Range predicate: {range_time * 1000:9.2f} ms  rows={range_rows:<6} plan: {range_plan}")
+    print(f"Speed-up: {case_time / range_time:.1f}x")
+    if case_rows != range_rows:
+        print("WARNING: the two predicates returned different row counts")
+
+    conn.close()
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
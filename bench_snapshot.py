@@ -0,0 +1,73 @@
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import snapshot_store
+
+# Benchmark: write synthetic days of raw runs to the snapshot store, then time
+# assembling 30-day and 180-day windows from the day files. For comparison it
+# also builds the same frame from row tuples, which is what pd.read_sql does with
+# pyodbc rows once they have arrived (the query and transfer are not included),
+# and reports the memory each frame takes.
+# Usage: python bench_snapshot.py [days] [jobs]
+
+DAYS = int(sys.argv[1]) if len(sys.argv) > 1 else 180
+JOBS = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+RUNS = 10  # timings per measurement
+
+
+# Function to build one day of runs per day, dated by the day they started
+def synthetic_days(days=DAYS, jobs=JOBS, seed=3):
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 1, 21)
+    frames = {}
+    for day in range(days):
+        starts = [start + timedelta(days=day, minutes=3 * job) for job in range(jobs)]
+        durations = rng.gamma(2.0, 10.0, jobs)
+        frames[(start + timedelta(days=day)).strftime('%Y-%m-%d')] = pd.DataFrame({
+            'ProcessingDate': (start + timedelta(days=day)).strftime('%Y-%m-%d'),
+            'Status': np.where(rng.random(jobs) < 0.03, 'Failed', 'Succeeded'),
+            'JobName': [f"{job + 1}. Job {job + 1}" for job in range(jobs)],
+            'StartTime': starts,
+            'EndTime': [started + timedelta(minutes=float(minutes)) for started, minutes in zip(starts, durations)],
+            'DurationMinutes': durations,
+        })
+    return frames
+
+
+def median_ms(function):
+    seconds = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds) * 1000
+
+
+def main():
+    frames = synthetic_days()
+    days = sorted(frames)
+    directory = tempfile.mkdtemp(prefix='aspire_snapshots_')
+    for day in days:
+        snapshot_store.save_snapshot('runs', day, frames[day], directory)
+
+    print(f"{DAYS} days x {JOBS} jobs, {'Arrow IPC' if snapshot_store._arrow() else 'pickle (pyarrow not installed)'} day files")
+    for window in (30, DAYS):
+        window_frames = [frames[day] for day in days[-window:]]
+        columns = list(window_frames[0].columns)
+        rows = [row for frame in window_frames for row in frame.itertuples(index=False, name=None)]
+        tuples_ms = median_ms(lambda: pd.DataFrame.from_records(rows, columns=columns))
+        files_ms = median_ms(lambda: snapshot_store.load_days('runs', days[-window:], directory))
+        tuples_memory = pd.DataFrame.from_records(rows, columns=columns).memory_usage(deep=True).sum()
+        files_memory = snapshot_store.load_days('runs', days[-window:], directory).memory_usage(deep=True).sum()
+        print(f"{window:4d} days ({len(rows)} rows): day files {files_ms:6.1f} ms, {files_memory / 1024:7.0f} KiB | "
+              f"row tuples (conversion only) {tuples_ms:6.1f} ms, {tuples_memory / 1024:7.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Benchmark: how long a fresh Python process takes to import main.py and
+# have `app` ready, as a WSGI worker would. Prefetching is switched off so
+# the numbers do not depend on the database.
+# Usage: python bench_startup.py [runs]
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Startup is measured inside the child so interpreter launch is reported separately
+child_code = """
+import time
+start = time.perf_counter()
+import main
+main.app
+print(time.perf_counter() - start)
+"""
+
+
+# Function to time one cold start; returns (process seconds, import seconds)
+def run_once(env):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', child_code], cwd=HERE, env=env, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, float(result.stdout.strip().splitlines()[-1])
+
+
+# Function to list the slowest modules reported by -X importtime
+def slowest_imports(env, count=10):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'], cwd=HERE, env=env, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    env = dict(os.environ, ASPIRE_PREFETCH='0')
+    run_once(env)  # warm the OS file cache and __pycache__
+
+    process_times, import_times = zip(*(run_once(env) for _ in range(RUNS)))
+    print(f"import main (median of {RUNS}): {statistics.median(import_times) * 1000:.0f} ms")
+    print(f"whole process  (median of {RUNS}): {statistics.median(process_times) * 1000:.0f} ms")
+    print("Slowest imports (cumulative):")
+    for microseconds, name in slowest_imports(env):
+        print(f"  {microseconds / 1000:8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
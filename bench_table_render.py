@@ -0,0 +1,74 @@
+import json
+import sys
+import time
+
+import dash_bootstrap_components as dbc
+import numpy as np
+import pandas as pd
+import plotly
+from dash import html
+
+from table_render import render_data_table, render_table
+
+# Micro-benchmark: job table rendering the old way (one iloc per cell),
+# from column arrays in one pass, and as a DataTable fed with records.
+# Reports build time and the JSON payload Dash would send to the browser.
+# Usage: python bench_table_render.py [rows ...]
+
+SIZES = [int(arg) for arg in sys.argv[1:]] or [5_000, 50_000, 200_000]
+COLUMNS = ['JobName', 'StartDate', 'StartTime', 'EndDate', 'EndTime', 'Status']
+LEGACY_MAX_ROWS = 50_000  # the iloc version takes minutes beyond this
+
+
+# Function to build a formatted job frame like the one update_dashboard renders
+def job_frame(rows, seed=3):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2024-06-12 21:00') + pd.to_timedelta(rng.integers(0, 17 * 3600, rows), unit='s')
+    end = start + pd.to_timedelta(rng.integers(60, 3 * 3600, rows), unit='s')
+    return pd.DataFrame({
+        'JobName': [f"{i % 60 + 1}. Job {i % 60 + 1}" for i in range(rows)],
+        'StartDate': start.strftime('%Y-%m-%d'),
+        'StartTime': start.strftime('%I:%M:%S %p'),
+        'EndDate': end.strftime('%Y-%m-%d'),
+        'EndTime': end.strftime('%I:%M:%S %p'),
+        'Status': rng.choice(['Succeeded', 'Failed', 'Succeeded with Exceptions'], rows, p=[0.9, 0.05, 0.05]),
+    })
+
+
+def legacy_table(filtered_df):
+    job_table_header = [html.Thead(html.Tr([html.Th(col) for col in COLUMNS], className='bg-primary text-white'))]
+    job_table_body = [html.Tbody([html.Tr([html.Td(filtered_df.iloc[i][col]) for col in COLUMNS]) for i in range(len(filtered_df))])]
+    return dbc.Table(job_table_header + job_table_body, striped=True, bordered=True, hover=True)
+
+
+def column_table(filtered_df):
+    return render_table(filtered_df, COLUMNS, striped=True, bordered=True, hover=True)
+
+
+def data_table(filtered_df):
+    return render_data_table(filtered_df[COLUMNS].to_dict('records'), COLUMNS)
+
+
+# Function to time building and serializing one table; returns (build s, serialize s, bytes)
+def measure(render, frame):
+    start = time.perf_counter()
+    component = render(frame)
+    built = time.perf_counter()
+    payload = json.dumps(component, cls=plotly.utils.PlotlyJSONEncoder)
+    return built - start, time.perf_counter() - built, len(payload)
+
+
+def main():
+    print(f"{'rows':>8}  {'renderer':<14}{'build':>10}{'to JSON':>10}{'payload':>12}")
+    for rows in SIZES:
+        frame = job_frame(rows)
+        for name, render in [('iloc per cell', legacy_table), ('column arrays', column_table), ('DataTable', data_table)]:
+            if render is legacy_table and rows > LEGACY_MAX_ROWS:
+                print(f"{rows:>8}  {name:<14}{'skipped':>10}")
+                continue
+            build, serialize, size = measure(render, frame)
+            print(f"{rows:>8}  {name:<14}{build * 1000:>8.0f}ms{serialize * 1000:>8.0f}ms{size / 1e6:>10.2f}MB")
+
+
+if __name__ == '__main__':
+    main()
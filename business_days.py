@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+
+# Function to get the last business day
+def get_last_business_day():
+    today = datetime.today()
+    if today.weekday() == 0:  # Monday
+        last_business_day = today - timedelta(days=3)
+    elif today.weekday() == 6:  # Sunday
+        last_business_day = today - timedelta(days=2)
+    else:  # Any other day (Tuesday to Saturday)
+        last_business_day = today - timedelta(days=1)
+    
+    # Ensure the date is within the current month
+    if last_business_day.month != today.month:
+        last_business_day = today.replace(day=1) - timedelta(days=1)
+        while last_business_day.weekday() >= 5:  # Skip weekends
+            last_business_day -= timedelta(days=1)
+    
+    return last_business_day
+
+# Function to get the last 5 business days
+def get_last_5_business_days(selected_date):
+    selected_date_obj = datetime.strptime(selected_date, '%Y-%m-%d')
+    business_days = []
+    current_day = selected_date_obj
+    while len(business_days) < 5:
+        if current_day.weekday() < 5:  # Monday to Friday are business days
+            business_days.append(current_day.strftime('%Y-%m-%d'))
+        current_day -= timedelta(days=1)
+    return business_days
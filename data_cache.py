@@ -0,0 +1,334 @@
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from business_days import get_last_business_day
+from duration_store import fetch_job_duration
+from fetch_engine import QUERY_NAMES, build_queries, query_runs_since, run_concurrently
+from snapshot_store import (concat_frames, drop_snapshot, load_days, load_snapshot, prune_snapshots, save_snapshot, split_window,
+                            to_columnar, window_days)
+
+# How long results for a batch that is still running stay fresh, in seconds
+IN_FLIGHT_TTL = 120
+
+# Cache limits
+MAX_ENTRIES = 256
+MAX_BYTES = 512 * 1024 * 1024
+
+# Seconds a shared-cache entry's last-use time may lag behind. A hit only writes the
+# new time once the stored one is this old, so hits are reads, not write transactions.
+LAST_USED_RESOLUTION = 60
+
+# Query kinds (and frames derived from them) whose rows belong to a single processing date.
+# Everything else (the 30-day rows and aggregates) is a rolling window ending now.
+DATE_KINDS = ('jobs', 'unlock_online', 'job_table')
+
+
+# Function to estimate how much memory a cached value holds
+def sizeof(value):
+    if hasattr(value, 'memory_usage'):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+# Thread-safe LRU cache bounded by entry count and estimated memory,
+# with an optional TTL per entry (ttl=None keeps the entry until evicted)
+class ResultCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[2] is not None and entry[2] <= time.monotonic()):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        size = sizeof(value)
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    # Drop every entry whose key matches the predicate (or everything)
+    def invalidate(self, predicate=None):
+        with self._lock:
+            keys = [key for key in self._entries if predicate is None or predicate(key)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self.hits, 'misses': self.misses}
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+# LRU cache in a SQLite file, so every worker process of a multi-process
+# server (gunicorn -w N) shares one set of results. Same interface as ResultCache;
+# values are pickled and TTLs use wall-clock time because processes share them.
+class SqliteResultCache:
+    def __init__(self, path, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS result_cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL,
+                    last_used REAL NOT NULL
+                )
+            """)
+
+    # One connection per thread; WAL lets readers in other processes run during writes
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None):
+        conn = self._conn()
+        encoded = json.dumps(key)
+        row = conn.execute("SELECT value, expires_at, last_used FROM result_cache WHERE key = ?", (encoded,)).fetchone()
+        now = time.time()
+        if row is None or (row[1] is not None and row[1] <= now):
+            if row is not None:
+                with conn:
+                    conn.execute("DELETE FROM result_cache WHERE key = ?", (encoded,))
+            self.misses += 1
+            return default
+        if now - row[2] >= LAST_USED_RESOLUTION:
+            with conn:
+                conn.execute("UPDATE result_cache SET last_used = ? WHERE key = ?", (now, encoded))
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, value, size, expires_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (json.dumps(key), blob, len(blob), None if ttl is None else now + ttl, now)
+            )
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM result_cache").fetchone()
+            for old_key, size in conn.execute("SELECT key, size FROM result_cache ORDER BY last_used").fetchall():
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM result_cache WHERE key = ?", (old_key,))
+                count -= 1
+                total -= size
+
+    def invalidate(self, predicate=None):
+        conn = self._conn()
+        with conn:
+            keys = [key for (key,) in conn.execute("SELECT key FROM result_cache").fetchall()
+                    if predicate is None or predicate(tuple(json.loads(key)))]
+            conn.executemany("DELETE FROM result_cache WHERE key = ?", [(key,) for key in keys])
+        return len(keys)
+
+    def stats(self):
+        count, total = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM result_cache").fetchone()
+        return {'entries': count, 'bytes': total, 'hits': self.hits, 'misses': self.misses}
+
+
+# Function to pick the cache backend: a shared SQLite file when ASPIRE_CACHE_PATH is set, otherwise in-process
+def make_cache():
+    path = os.environ.get('ASPIRE_CACHE_PATH')
+    return SqliteResultCache(path) if path else ResultCache()
+
+
+# Shared cache for query results
+result_cache = make_cache()
+
+# One lock per cache key so concurrent misses for a query hit SQL Server once,
+# while callers that need different queries do not wait on each other
+_fetch_locks = {}
+_fetch_locks_guard = threading.Lock()
+
+
+def _fetch_lock(key):
+    with _fetch_locks_guard:
+        return _fetch_locks.setdefault(key, threading.Lock())
+
+
+# Threads that load the missing kinds of one fetch side by side (each then runs
+# its query on fetch_engine's executor); room for several fetches at once
+_load_executor = ThreadPoolExecutor(max_workers=len(QUERY_NAMES) * 4, thread_name_prefix='fetch-kind')
+
+
+# Function to check whether the batch for a processing date is finished.
+# A processing date D covers 2 PM on D to 2 PM on D+1 (the same cut-over the
+# queries use), so anything before the last business day is always closed.
+def is_batch_closed(selected_date, now=None):
+    now = now or datetime.now()
+    selected_date_obj = datetime.strptime(selected_date, '%Y-%m-%d')
+    if selected_date_obj.date() < get_last_business_day().date():
+        return True
+    return now >= selected_date_obj + timedelta(days=1, hours=14)
+
+
+# Function to pick the TTL for one processing date: closed dates never expire
+def ttl_for_date(selected_date, now=None):
+    return None if is_batch_closed(selected_date, now) else IN_FLIGHT_TTL
+
+
+# Function to pick the TTL for the rolling 30-day window. It only changes while
+# a batch is running (9 PM to 2 PM), otherwise it is good until 9 PM today.
+def ttl_for_window(now=None):
+    now = now or datetime.now()
+    if now.hour >= 21 or now.hour < 14:
+        return IN_FLIGHT_TTL
+    return (now.replace(hour=21, minute=0, second=0, microsecond=0) - now).total_seconds()
+
+
+# Function to build the cache key of one query kind for a processing date
+def cache_key(kind, selected_date, now=None):
+    if kind in DATE_KINDS:
+        return (kind, selected_date)
+    return (kind, (now or datetime.now()).strftime('%Y-%m-%d'))
+
+
+# Function to split the rolling window's runs into the closed days already on disk
+# and the query for the rest. Returns (stored frame or None, (SQL, params) or None).
+def _window_parts(now):
+    days = window_days(now)
+    stored, first_missing = split_window('runs', days)
+    stored_frame = load_days('runs', stored) if stored else None
+    return stored_frame, None if first_missing is None else (query_runs_since, [first_missing])
+
+
+# Function to write the closed days of freshly queried runs to the snapshot store,
+# days without runs included. The query starts at a whole day, so every day in it
+# is complete once its batch closes. Files of days that left the window are removed.
+def _store_window_days(runs, since, now):
+    by_day = dict(tuple(runs.groupby('ProcessingDate', sort=False)))
+    days = window_days(now)
+    for day in days:
+        if day >= since and is_batch_closed(day, now):
+            save_snapshot('runs', day, by_day.get(day, runs.iloc[:0]))
+    prune_snapshots('runs', days[0])
+
+
+# Function to get one kind of frame for a processing date: from the cache, the
+# snapshot store, or SQL Server. Only this kind's lock is held, and only while this
+# kind is loaded, so callers that need a cheap frame never wait on a slow one.
+def _load_kind(kind, query, selected_date, now, cache):
+    key = cache_key(kind, selected_date, now)
+    with _fetch_lock(key):
+        frame = cache.get(key)
+        if frame is not None:
+            return frame
+
+        closed = is_batch_closed(selected_date, now)
+        if kind == 'jobs' and closed:
+            frame = load_snapshot('jobs', selected_date)
+            if frame is not None:
+                cache.set(key, frame, None)
+                return frame
+
+        stored_runs = None
+        if kind == 'last_30_days':
+            stored_runs, query = _window_parts(now)
+            if query is None:
+                cache.set(key, stored_runs, ttl_for_window(now))
+                return stored_runs
+
+        frame = run_concurrently({kind: query})[0][kind]
+        if kind == 'jobs' and closed:
+            frame = to_columnar(frame)
+            save_snapshot('jobs', selected_date, frame)
+        if kind == 'last_30_days':
+            _store_window_days(frame, query[1][0], now)
+            frame = concat_frames([part for part in (stored_runs, frame) if part is not None])
+        cache.set(key, frame, ttl_for_date(selected_date, now) if kind in DATE_KINDS else ttl_for_window(now))
+        return frame
+
+
+# Function to fetch the dashboard frames for a processing date, querying
+# SQL Server only for kinds that are missing or expired in the cache.
+# `kinds` limits the fetch to the frames a caller needs (default: all of them).
+# Missing kinds load side by side, each under its own lock. Job durations come
+# from the incremental local store. Closed processing dates and the closed days
+# of the rolling window are read from snapshot_store's columnar files; anything
+# queried for them is written there for next time.
+def fetch_cached(selected_date, kinds=None, cache=result_cache):
+    kinds = QUERY_NAMES if kinds is None else kinds
+    now = datetime.now()
+    queries = build_queries(selected_date)
+    wanted = [kind for kind in QUERY_NAMES if kind in kinds and kind in queries]
+
+    # Cache hits need no lock
+    frames = {}
+    for kind in wanted:
+        frame = cache.get(cache_key(kind, selected_date, now))
+        if frame is not None:
+            frames[kind] = frame
+
+    missing = [kind for kind in wanted if kind not in frames]
+    if len(missing) == 1:
+        frames[missing[0]] = _load_kind(missing[0], queries[missing[0]], selected_date, now, cache)
+    elif missing:
+        futures = {kind: _load_executor.submit(_load_kind, kind, queries[kind], selected_date, now, cache) for kind in missing}
+        frames.update({kind: future.result() for kind, future in futures.items()})
+
+    if 'job_duration' in kinds:
+        frames['job_duration'] = fetch_job_duration()
+    return {kind: frames[kind] for kind in QUERY_NAMES if kind in frames}
+
+
+# Function to forget cached results for one processing date (e.g. after a rerun),
+# including its snapshot files. When the date's runs were stored for the rolling
+# window, the cached window holds them too and is forgotten as well.
+def invalidate_date(selected_date, cache=result_cache):
+    drop_snapshot('jobs', selected_date)
+    if drop_snapshot('runs', selected_date):
+        invalidate_window(cache)
+    return cache.invalidate(lambda key: key[0] in DATE_KINDS and key[1] == selected_date)
+
+
+# Function to forget the cached rolling-window results (e.g. once a batch completes)
+def invalidate_window(cache=result_cache):
+    return cache.invalidate(lambda key: key[0] in QUERY_NAMES and key[0] not in DATE_KINDS)
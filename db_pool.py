@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Connection string for the production ASPIRE database
+conn_str = (
+    r'DRIVER={SQL Server};'
+    r'SERVER=SDC01ASRSQPD01S\PSQLINST01;'
+    r'DATABASE=ASPIRE;'
+    r'Trusted_Connection=yes;'
+)
+
+
+# Bounded pool of DB-API connections shared by every query site.
+# `connect` is any zero-argument callable returning a DB-API connection,
+# so the pool works the same against pyodbc, sqlite3 or a fake driver.
+class ConnectionPool:
+    def __init__(self, connect, max_size=5, max_idle_seconds=300, checkout_timeout=30, health_check_query='SELECT 1'):
+        self.connect = connect
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.checkout_timeout = checkout_timeout
+        self.health_check_query = health_check_query
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (connection, last_used) pairs, most recently used on the right
+        self._size = 0  # idle + checked out connections
+
+        self.counters = {
+            'checkouts': 0,
+            'created': 0,
+            'discarded': 0,
+            'evicted': 0,
+            'timeouts': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0,
+        }
+
+    # Take a connection out of the pool, waiting up to `timeout` seconds for one to free up
+    def checkout(self, timeout=None):
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        while True:
+            conn = None
+            with self._cond:
+                stale = self._pop_stale(time.monotonic())
+                while True:
+                    if self._idle:
+                        conn, _ = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters['timeouts'] += 1
+                        self._close_all_quietly(stale)
+                        raise TimeoutError(f"No database connection available after {timeout} seconds")
+                    self._cond.wait(remaining)
+            self._close_all_quietly(stale)
+
+            if conn is None:
+                conn = self._create()
+                break
+            if self._is_healthy(conn):
+                break
+            # Broken idle connection: drop it and try again
+            self._discard(conn)
+
+        wait = time.monotonic() - start
+        with self._cond:
+            self.counters['checkouts'] += 1
+            self.counters['wait_total'] += wait
+            self.counters['wait_max'] = max(self.counters['wait_max'], wait)
+        return conn
+
+    # Give a connection back; broken connections are closed instead of reused. Any
+    # open transaction is rolled back first, so the next user does not inherit its
+    # locks or uncommitted work; a connection that cannot roll back is closed.
+    def checkin(self, conn, discard=False):
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        if discard:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    # Context manager wrapper around checkout/checkin
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.checkout(timeout)
+        try:
+            yield conn
+        except Exception:
+            self.checkin(conn, discard=not self._is_healthy(conn))
+            raise
+        else:
+            self.checkin(conn)
+
+    # Close connections that have sat idle longer than max_idle_seconds
+    def evict_idle(self):
+        with self._cond:
+            stale = self._pop_stale(time.monotonic())
+        self._close_all_quietly(stale)
+        return len(stale)
+
+    # Close every idle connection (checked-out ones are closed on checkin with discard=True)
+    def close_all(self):
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        self._close_all_quietly(idle)
+
+    # Snapshot of the pool counters, including the average checkout wait
+    def stats(self):
+        with self._cond:
+            stats = dict(self.counters)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+        stats['wait_avg'] = stats['wait_total'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        return stats
+
+    def _create(self):
+        try:
+            conn = self.connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.counters['created'] += 1
+        return conn
+
+    def _discard(self, conn):
+        self._close_all_quietly([conn])
+        with self._cond:
+            self._size -= 1
+            self.counters['discarded'] += 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.health_check_query)
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    # Must be called with the lock held; the caller closes the returned connections
+    def _pop_stale(self, now):
+        stale = []
+        while self._idle and now - self._idle[0][1] > self.max_idle_seconds:
+            conn, _ = self._idle.popleft()
+            stale.append(conn)
+        self._size -= len(stale)
+        self.counters['evicted'] += len(stale)
+        if stale:
+            self._cond.notify_all()
+        return stale
+
+    @staticmethod
+    def _close_all_quietly(conns):
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+# One pool per connection string, created on first use
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connection_string=conn_str, **pool_options):
+    with _pools_lock:
+        pool = _pools.get(connection_string)
+        if pool is None:
+            def connect():
+                import pyodbc
+                return pyodbc.connect(connection_string)
+            pool = ConnectionPool(connect, **pool_options)
+            _pools[connection_string] = pool
+        return pool
@@ -0,0 +1,167 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from db_pool import get_pool
+
+# Local SQLite file holding per-day, per-job duration aggregates
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_duration_history.db')
+
+# How much history the "Average Job Duration Over Time" figure shows
+HISTORY_MONTHS = 6
+
+# Minimum seconds between two syncs against SQL Server, across all processes
+SYNC_INTERVAL = 60
+
+# Seconds a sync waits for one running in another process to commit
+SYNC_WAIT = 120
+
+# Runs that finished after the high-water mark, already aggregated per day and job
+query_new_durations = """
+SELECT
+    CONVERT(varchar, JSH.StartTime, 23) as ProcessingDate,
+    JSJ.Name as JobName,
+    COUNT(*) as RunCount,
+    SUM(DATEDIFF(SECOND, JSH.StartTime, JSH.EndTime) / 60.0) as TotalMinutes,
+    MAX(JSH.EndTime) as LastEndTime
+FROM JobStreamTaskHistory JSH
+LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid
+JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
+WHERE JSH.EndTime > ?
+AND JSH.StartTime >= DATEADD(month, -6, GETDATE())
+GROUP BY CONVERT(varchar, JSH.StartTime, 23), JSJ.Name
+"""
+
+_sync_lock = threading.Lock()
+_last_sync = 0.0
+
+
+# Function to open the local store, creating its tables on first use.
+# `timeout` is how long a write waits for another connection's write lock.
+def _open_store(path=STORE_PATH, timeout=5.0):
+    conn = sqlite3.connect(path, timeout=timeout)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_duration_daily (
+            ProcessingDate TEXT NOT NULL,
+            JobName TEXT NOT NULL,
+            RunCount INTEGER NOT NULL,
+            TotalMinutes REAL NOT NULL,
+            PRIMARY KEY (ProcessingDate, JobName)
+        )
+    """)
+    conn.execute("CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+
+# Function to read one sync_state value through an open store connection
+def _read_state(conn, name):
+    row = conn.execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+    return datetime.fromisoformat(row[0]) if row else None
+
+
+# Function to write one sync_state value through an open store connection
+def _write_state(conn, name, value):
+    conn.execute("INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)", (name, value.isoformat()))
+
+
+# Function to read the EndTime of the newest run already in the store
+def get_high_water_mark(path=STORE_PATH):
+    conn = _open_store(path)
+    try:
+        return _read_state(conn, 'high_water_mark') or datetime(1900, 1, 1)
+    finally:
+        conn.close()
+
+
+# Function to merge newly finished runs and move the mark, inside the caller's transaction
+def _merge(conn, new_rows, now):
+    cutoff = (now - timedelta(days=HISTORY_MONTHS * 31)).strftime('%Y-%m-%d')
+    if not new_rows.empty:
+        conn.executemany(
+            """
+            INSERT INTO job_duration_daily (ProcessingDate, JobName, RunCount, TotalMinutes)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (ProcessingDate, JobName) DO UPDATE SET
+                RunCount = RunCount + excluded.RunCount,
+                TotalMinutes = TotalMinutes + excluded.TotalMinutes
+            """,
+            [
+                (str(date), job, int(count), float(total))
+                for date, job, count, total in new_rows[['ProcessingDate', 'JobName', 'RunCount', 'TotalMinutes']].itertuples(index=False)
+            ]
+        )
+        high_water_mark = max(_read_state(conn, 'high_water_mark') or datetime(1900, 1, 1),
+                              pd.to_datetime(new_rows['LastEndTime']).max().to_pydatetime())
+        _write_state(conn, 'high_water_mark', high_water_mark)
+    conn.execute("DELETE FROM job_duration_daily WHERE ProcessingDate < ?", (cutoff,))
+
+
+# Function to merge newly finished runs into the store.
+# `new_rows` has ProcessingDate, JobName, RunCount, TotalMinutes and LastEndTime.
+def merge_durations(new_rows, path=STORE_PATH, now=None):
+    conn = _open_store(path)
+    try:
+        with conn:
+            _merge(conn, new_rows, now or datetime.now())
+    finally:
+        conn.close()
+
+
+# Function to pull only runs newer than the high-water mark from SQL Server.
+# Calls within SYNC_INTERVAL of the last sync (by this or any other process sharing
+# the store) are skipped unless force=True. Reading the mark, merging and writing the
+# new mark are one SQLite write transaction (BEGIN IMMEDIATE), so a sync in another
+# process waits for this one and then starts from its mark instead of adding the
+# same runs a second time.
+def sync(pool=None, path=STORE_PATH, force=False):
+    global _last_sync
+    with _sync_lock:
+        if not force and time.monotonic() - _last_sync < SYNC_INTERVAL:
+            return False
+        conn = _open_store(path, timeout=SYNC_WAIT)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            with conn:
+                synced_at = _read_state(conn, 'synced_at')
+                if not force and synced_at and datetime.now() - synced_at < timedelta(seconds=SYNC_INTERVAL):
+                    _last_sync = time.monotonic()
+                    return False
+                with (pool or get_pool()).connection() as source:
+                    new_rows = pd.read_sql(query_new_durations, source, params=[_read_state(conn, 'high_water_mark') or datetime(1900, 1, 1)])
+                now = datetime.now()
+                _merge(conn, new_rows, now)
+                _write_state(conn, 'synced_at', now)
+        finally:
+            conn.close()
+        _last_sync = time.monotonic()
+        return True
+
+
+# Function to load average job duration per processing date and job for the last six months
+def load_job_duration(path=STORE_PATH, now=None):
+    now = now or datetime.now()
+    cutoff = (now - timedelta(days=HISTORY_MONTHS * 31)).strftime('%Y-%m-%d')
+    conn = _open_store(path)
+    try:
+        return pd.read_sql(
+            """
+            SELECT ProcessingDate, JobName, TotalMinutes / RunCount AS DurationMinutes
+            FROM job_duration_daily
+            WHERE ProcessingDate >= ?
+            ORDER BY ProcessingDate, JobName
+            """,
+            conn,
+            params=[cutoff]
+        )
+    finally:
+        conn.close()
+
+
+# Function to sync (at most once per SYNC_INTERVAL) and return the six-month aggregates
+def fetch_job_duration(pool=None, path=STORE_PATH):
+    sync(pool, path)
+    return load_job_duration(path)
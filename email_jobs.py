@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding job status, shared by every process serving the app
+JOBS_PATH = os.environ.get('ASPIRE_EMAIL_JOBS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'email_jobs.db'))
+
+# Seconds a job's status stays available for the progress indicator after its last update
+JOB_RETENTION = 3600
+
+# Seconds between heartbeats of the queued and running jobs of a process, and how
+# long a queued or running job may go without one before it counts as dead
+# (its process stopped: a restart, a recycled worker or a crash)
+HEARTBEAT_INTERVAL = 15
+JOB_LEASE = 60
+
+# The process that runs the jobs it queues: host and pid
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+# Job states, in order; 'done' and 'failed' are final
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+# Job status rows in a SQLite table. Every process serving the app reads and writes
+# the same file, so any of them can answer a progress poll. Rows are only dropped
+# once JOB_RETENTION has passed since their last update, never to make room.
+# A queued or running row whose owner stopped sending heartbeats for JOB_LEASE
+# seconds is reported as failed and no longer blocks a new job for its date.
+class JobStore:
+    def __init__(self, path=JOBS_PATH, retention=JOB_RETENTION, lease=JOB_LEASE):
+        self.path = path
+        self.retention = retention
+        self.lease = lease
+        self._local = threading.local()
+
+    # One connection per thread; the table is created on first use
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS email_jobs (
+                    id TEXT PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    job TEXT NOT NULL,
+                    owner TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._local.conn = conn
+        return conn
+
+    # Function to read a job's status dict (None when unknown or expired)
+    def get(self, job_id):
+        now = time.time()
+        row = self._conn().execute("SELECT job, updated_at FROM email_jobs WHERE id = ? AND updated_at > ?",
+                                   (job_id, now - self.retention)).fetchone()
+        if row is None:
+            return None
+        job = json.loads(row[0])
+        if job['status'] in (QUEUED, RUNNING) and row[1] <= now - self.lease:
+            job.update(status=FAILED, message="Failed: the server stopped before the email was sent")
+        return job
+
+    # Function to write a job's status and drop the expired ones
+    def save(self, job):
+        conn = self._conn()
+        now = time.time()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO email_jobs (id, date, status, job, owner, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                         (job['id'], job['date'], job['status'], json.dumps(job), job.get('owner'), now))
+            conn.execute("DELETE FROM email_jobs WHERE updated_at <= ?", (now - self.retention,))
+
+    # Function to add a job unless one for the same date is still queued or running
+    # (and its owner is alive). The check and the insert are one write transaction,
+    # so two processes cannot both add one. Returns the id of the job that will send
+    # the date's report.
+    def add_unless_active(self, job):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            row = conn.execute("SELECT id FROM email_jobs WHERE date = ? AND status IN (?, ?) AND updated_at > ? "
+                               "ORDER BY updated_at DESC LIMIT 1",
+                               (job['date'], QUEUED, RUNNING, time.time() - self.lease)).fetchone()
+            if row:
+                return row[0]
+            conn.execute("INSERT INTO email_jobs (id, date, status, job, owner, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                         (job['id'], job['date'], job['status'], json.dumps(job), job.get('owner'), time.time()))
+            return job['id']
+
+    # Function to renew the lease of an owner's queued and running jobs
+    def heartbeat(self, owner):
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE email_jobs SET updated_at = ? WHERE owner = ? AND status IN (?, ?)",
+                         (time.time(), owner, QUEUED, RUNNING))
+
+    # Function to mark an owner's queued and running jobs failed, e.g. ones left by
+    # an earlier process with the same host and pid. Returns how many there were.
+    def fail_leftovers(self, owner):
+        rows = self._conn().execute("SELECT job FROM email_jobs WHERE owner = ? AND status IN (?, ?)",
+                                    (owner, QUEUED, RUNNING)).fetchall()
+        for (encoded,) in rows:
+            job = json.loads(encoded)
+            job.update(status=FAILED, message="Failed: the server restarted before the email was sent")
+            self.save(job)
+        return len(rows)
+
+
+# Queue of email report jobs run one at a time by a background worker thread.
+# `handler(selected_date, report_progress)` does the work and calls
+# report_progress(percent, message) as it goes. A job runs in the process that
+# queued it; its status is kept in a JobStore, so any process can report it. While
+# the queue runs, a heartbeat thread renews the lease of its queued and running jobs.
+class EmailJobQueue:
+    def __init__(self, handler, store=None, owner=OWNER):
+        self.handler = handler
+        self.store = store or JobStore()
+        self.owner = owner
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._started = False
+
+    # Function to start the worker and heartbeat threads. The first start marks the
+    # jobs an earlier process with this owner left queued or running as failed.
+    def _start(self):
+        with self._lock:
+            if not self._started:
+                left = self.store.fail_leftovers(self.owner)
+                if left:
+                    logger.warning("Marked %d email jobs left by an earlier process as failed", left)
+                threading.Thread(target=self._heartbeat, name='email-jobs-heartbeat', daemon=True).start()
+                self._started = True
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='email-jobs', daemon=True)
+                self._thread.start()
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            try:
+                self.store.heartbeat(self.owner)
+            except Exception:
+                logger.exception("Email job heartbeat failed")
+
+    # Queue a report for a processing date and return its job id. A job for the same
+    # date that is still queued or running (in any process) is reused instead of sending twice.
+    def submit(self, selected_date):
+        self._start()
+        job = {'id': uuid.uuid4().hex, 'date': selected_date, 'status': QUEUED, 'progress': 0,
+               'message': "Queued", 'submitted': time.time(), 'seconds': None, 'owner': self.owner}
+        job_id = self.store.add_unless_active(job)
+        if job_id != job['id']:
+            return job_id
+        self._queue.put(job_id)
+        return job_id
+
+    # Function to read a job's status dict (None when unknown or expired)
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def _save(self, job):
+        self.store.save(dict(job))
+
+    def _run(self):
+        while True:
+            job = self.get(self._queue.get())
+            if job is not None:
+                self._process(job)
+
+    def _process(self, job):
+        def report_progress(progress, message):
+            job.update(progress=progress, message=message)
+            self._save(job)
+
+        start = time.perf_counter()
+        job['status'] = RUNNING
+        report_progress(5, "Starting")
+        try:
+            self.handler(job['date'], report_progress)
+        except Exception as error:
+            logger.exception("Email job %s for %s failed", job['id'], job['date'])
+            job.update(status=FAILED, message=f"Failed: {error}")
+        else:
+            job.update(status=DONE, progress=100, message="Email sent")
+        job['seconds'] = time.perf_counter() - start
+        self._save(job)
+        logger.info("Email job %s for %s %s in %.2fs", job['id'], job['date'], job['status'], job['seconds'])
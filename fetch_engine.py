@@ -0,0 +1,221 @@
+import logging
+import math
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pandas as pd
+
+from db_pool import get_pool
+from snapshot_store import window_days
+
+logger = logging.getLogger(__name__)
+
+# Order of the frames returned by fetch_cached. job_duration is served from
+# the local duration_store rather than queried here.
+QUERY_NAMES = ('jobs', 'last_30_days', 'job_duration', 'unlock_online', 'failure_trend', 'job_metrics')
+
+# Default per-query timeout in seconds
+QUERY_TIMEOUT = 60
+
+# Shared worker threads; two refreshes can run side by side before queueing
+_executor = ThreadPoolExecutor(max_workers=len(QUERY_NAMES) * 2, thread_name_prefix='fetch')
+
+
+# Function to turn a processing date into its StartTime range.
+# Processing date D covers runs started from 2 PM on D up to (not including)
+# 2 PM on D+1, which is what the CASE on DATEPART(hour, StartTime) < 14 meant.
+def processing_date_range(selected_date):
+    start = datetime.strptime(selected_date, '%Y-%m-%d') + timedelta(hours=14)
+    return start, start + timedelta(days=1)
+
+
+# Raw rows of every run started on or after a day, for the figures that need
+# individual runs (time difference, anomaly detection, time to recovery). The
+# 30-day window is these rows from its first day; closed days come from
+# snapshot_store and only the days after them are queried.
+query_runs_since = """
+SELECT 
+    CONVERT(varchar, JSH.StartTime, 23) as ProcessingDate, 
+    JSH.JobStreamTaskHistoryOid as TaskHistoryOid,
+    JSH.Status,
+    JSJ.Name as JobName,
+    CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime],
+    CONVERT(datetime, JSH.EndTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [EndTime],
+    DATEDIFF(SECOND, JSH.StartTime, JSH.EndTime) / 60.0 as DurationMinutes
+FROM JobStreamTaskHistory JSH
+LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
+JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
+WHERE JSH.StartTime >= ?
+"""
+
+
+# Function to build the dashboard queries for a processing date.
+# Each entry is either plain SQL or a (SQL, params) pair.
+def build_queries(selected_date):
+    range_start, range_end = processing_date_range(selected_date)
+
+    # The range predicate on StartTime lets SQL Server seek an index instead
+    # of evaluating the CASE expression on every row of JobStreamTaskHistory
+    query = """
+    SELECT 
+        CASE 
+            WHEN DATEPART(hour, JSH.StartTime) < 14 THEN CONVERT(varchar, DATEADD(day, -1, JSH.StartTime), 23) 
+            ELSE CONVERT(varchar, JSH.StartTime, 23) 
+        END as ProcessingDate, 
+        JSJ.JobStreamJoboid as Joboid, 
+        JSH.JobStreamTaskHistoryOid as TaskHistoryOid, 
+        JSJ.Name as JobName,
+        CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime], 
+        CONVERT(datetime, JSH.EndTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [EndTime], 
+        JSH.Status, 
+        JSH.Message 
+    FROM JobStreamTaskHistory JSH
+    LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
+    JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
+    WHERE JSH.StartTime >= ?
+    AND JSH.StartTime < ?
+    ORDER BY StartTime ASC
+    """
+
+    # Failures per day and job over 30 days ("Benchmark Update" excluded)
+    query_failure_trend = """
+    SELECT 
+        CONVERT(varchar, JSH.StartTime, 23) as ProcessingDate, 
+        JSJ.Name as JobName,
+        CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime],
+        JSH.Message,
+        COUNT(*) as Count
+    FROM JobStreamTaskHistory JSH
+    LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
+    JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
+    WHERE JSH.StartTime >= DATEADD(day, -30, GETDATE())
+    AND JSH.Status = 'Failed'
+    AND JSJ.Name <> '20. Benchmark Update'
+    GROUP BY CONVERT(varchar, JSH.StartTime, 23), JSJ.Name, JSH.StartTime, JSH.Message
+    """
+
+    # Mean duration, success rate and run count per job over 30 days
+    query_job_metrics = """
+    SELECT 
+        JSJ.Name as JobName,
+        AVG(DATEDIFF(SECOND, JSH.StartTime, JSH.EndTime) / 60.0) as AvgDuration,
+        100.0 * SUM(CASE WHEN JSH.Status = 'Failed' THEN 0 ELSE 1 END) / COUNT(*) as SuccessRate,
+        COUNT(*) as Frequency
+    FROM JobStreamTaskHistory JSH
+    LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
+    JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
+    WHERE JSH.StartTime >= DATEADD(day, -30, GETDATE())
+    GROUP BY JSJ.Name
+    """
+
+    query_unlock_online = """
+    SELECT JobName, CONVERT(datetime, EndTime) AS CompletionTime, Status 
+    FROM Job_StatsVW 
+    WHERE JobName = 'UnLock Online' 
+    AND ProcessingDate = ?
+    """
+
+    return {
+        'jobs': (query, [range_start, range_end]),
+        'last_30_days': (query_runs_since, [window_days()[0]]),
+        'unlock_online': (query_unlock_online, [selected_date]),
+        'failure_trend': query_failure_trend,
+        'job_metrics': query_job_metrics,
+    }
+
+
+# Job rows for a processing date that started or finished after the given marks,
+# plus the ones still running. The raw (untranslated) times come back as well so
+# the caller can move its marks forward.
+query_job_delta = """
+SELECT 
+    CASE 
+        WHEN DATEPART(hour, JSH.StartTime) < 14 THEN CONVERT(varchar, DATEADD(day, -1, JSH.StartTime), 23) 
+        ELSE CONVERT(varchar, JSH.StartTime, 23) 
+    END as ProcessingDate, 
+    JSJ.JobStreamJoboid as Joboid, 
+    JSH.JobStreamTaskHistoryOid as TaskHistoryOid, 
+    JSJ.Name as JobName,
+    CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime], 
+    CONVERT(datetime, JSH.EndTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [EndTime], 
+    JSH.Status, 
+    JSH.Message,
+    JSH.StartTime as RawStartTime,
+    JSH.EndTime as RawEndTime
+FROM JobStreamTaskHistory JSH
+LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
+JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
+WHERE JSH.StartTime >= ?
+AND JSH.StartTime < ?
+AND (JSH.StartTime > ? OR JSH.EndTime > ? OR JSH.EndTime IS NULL)
+ORDER BY StartTime ASC
+"""
+
+
+# Function to build the delta query for a processing date: rows newer than the
+# last seen raw StartTime/EndTime. Returns a (SQL, params) pair.
+def build_delta_query(selected_date, last_start, last_end):
+    range_start, range_end = processing_date_range(selected_date)
+    return query_job_delta, [range_start, range_end, last_start, last_end]
+
+
+# Function to set the driver's query timeout on a connection (pyodbc: whole seconds,
+# 0 for none). SQL Server is then told to abort a statement that runs past it, so a
+# timed-out query does not keep running and holding its pooled connection.
+# Connections without the setting are left alone.
+def _set_query_timeout(conn, seconds):
+    try:
+        conn.timeout = seconds
+    except AttributeError:
+        pass
+
+
+# Function to run one query on its own pooled connection and time it. The driver
+# timeout is whatever is left until `deadline` (time.monotonic()) once the query
+# gets its connection, and is cleared before the connection goes back to the pool.
+def _run_query(pool, name, query, timings, deadline):
+    query, params = query if isinstance(query, tuple) else (query, None)
+    start = time.perf_counter()
+    with pool.connection() as conn:
+        _set_query_timeout(conn, max(1, math.ceil(deadline - time.monotonic())))
+        try:
+            frame = pd.read_sql(query, conn, params=params)
+        finally:
+            _set_query_timeout(conn, 0)
+    timings[name] = time.perf_counter() - start
+    return frame
+
+
+# Function to run independent queries in parallel.
+# `queries` maps a name to SQL or a (SQL, params) pair; `timeout` is seconds per query, either one
+# number for all of them or a dict keyed by query name. A query past its timeout is
+# aborted on the server by the driver's query timeout, not only abandoned here.
+# Returns (frames, timings), both dicts keyed by query name.
+def run_concurrently(queries, pool=None, timeout=QUERY_TIMEOUT):
+    pool = pool or get_pool()
+    timings = {}
+    submitted = time.monotonic()
+    limits = {name: timeout.get(name, QUERY_TIMEOUT) if isinstance(timeout, dict) else timeout for name in queries}
+    futures = {name: _executor.submit(_run_query, pool, name, query, timings, submitted + limits[name])
+               for name, query in queries.items()}
+
+    frames = {}
+    for name, future in futures.items():
+        limit = limits[name]
+        remaining = max(0.0, submitted + limit - time.monotonic())
+        try:
+            frames[name] = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Query '{name}' did not finish within {limit} seconds")
+
+    logger.info("Fetched %s in %.3fs (%s)", ', '.join(frames), time.monotonic() - submitted,
+                ', '.join(f"{name}={seconds:.3f}s" for name, seconds in timings.items()))
+    return frames, timings
+
+
+# Function to fetch the SQL Server frames for a processing date concurrently
+def fetch_all(selected_date, pool=None, timeout=QUERY_TIMEOUT):
+    return run_concurrently(build_queries(selected_date), pool=pool, timeout=timeout)
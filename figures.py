@@ -0,0 +1,325 @@
+import json
+import logging
+import threading
+import time
+
+import dash_bootstrap_components as dbc
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from dash import html
+from plotly.subplots import make_subplots
+from plotly.utils import PlotlyJSONEncoder
+
+from anomaly_engine import anomaly_engine
+from business_days import get_last_5_business_days
+from data_cache import ResultCache, ttl_for_date, ttl_for_window
+from recovery import recovery_analysis
+from timeline import ALL_JOBS_STEPS, MAIN_MILESTONES, TIME_DIFFERENCE_MILESTONES, job_edges, milestone_hours, stream_summary
+from table_render import render_table
+
+logger = logging.getLogger(__name__)
+
+# Memory budget for cached figure JSON
+FIGURE_CACHE_BYTES = 128 * 1024 * 1024
+
+
+# Function to apply the dashboard's common figure styling; extra axis settings are merged in
+def style_figure(fig, xaxis=None, yaxis=None, **layout):
+    axis_style = dict(
+        showgrid=True,
+        showline=False,
+        linewidth=1,
+        linecolor='black',
+        mirror=True,
+        gridcolor='lightgrey'
+    )
+    fig.update_layout(
+        template='plotly_white',
+        plot_bgcolor='rgba(229,236,246,1)',
+        title_font=dict(size=21, family='Arial, bold', color='rgba(42, 63, 95, 1)'),
+        xaxis=dict(axis_style, **(xaxis or {})),
+        yaxis=dict(axis_style, **(yaxis or {})),
+        font=dict(size=14),
+        **layout
+    )
+    return fig
+
+
+# Legend used by the time difference figures
+TIME_DIFFERENCE_LEGEND = dict(title="Metrics", orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+
+
+def build_unlock_online_table(frames, selected_date):
+    df_unlock_online = frames['unlock_online'].assign(
+        CompletionTime=pd.to_datetime(frames['unlock_online']['CompletionTime']).dt.strftime('%I:%M:%S %p')
+    )
+    return render_table(df_unlock_online, ['JobName', 'CompletionTime', 'Status'], striped=True, bordered=True, hover=True, className='table-dark')
+
+
+def build_status_options(frames, selected_date):
+    return [{'label': status, 'value': status} for status in frames['jobs']['Status'].unique()]
+
+
+def build_status_figure(frames, selected_date):
+    status_counts = frames['jobs']['Status'].value_counts().reset_index()
+    status_counts.columns = ['Status', 'Count']
+
+    # Customize the bar graph for Job Status Counts
+    fig_status = go.Figure(data=[
+        go.Bar(
+            x=status_counts['Count'],
+            y=status_counts['Status'],
+            orientation='h',
+            marker=dict(
+                color=status_counts['Status'].apply(lambda x: 'green' if x == 'Succeeded' else 'orange' if x == 'Succeeded with Exceptions' else 'red'),
+                line=dict(color='black', width=1)  # Keep the border
+            )
+        )
+    ])
+    return style_figure(
+        fig_status,
+        title='Job Status Counts',
+        xaxis_title='Count',
+        yaxis_title='Status',
+        bargap=0.4  # Adjust this value to reduce the height of the bars
+    )
+
+
+def build_failure_trend_figure(frames, selected_date):
+    # Failure counts are grouped in SQL; "Benchmark Update" is excluded there too
+    fig_trend = px.bar(frames['failure_trend'], x='ProcessingDate', y='Count', color='JobName', title='Failure Trend Over the Last 30 Days',
+                       hover_data={'StartTime': True, 'JobName': True, 'Message': True})
+    return style_figure(
+        fig_trend,
+        xaxis=dict(tickformat='%Y-%m-%d'),
+        yaxis=dict(rangemode='tozero'),
+        bargap=0.4,
+        hovermode='x unified'
+    )
+
+
+# Function to pair TRIAD and Benchmark Update runs per processing date
+def _milestone_frame(df_30_days, milestones):
+    hours = milestone_hours(job_edges(df_30_days), milestones)
+    hours = hours.dropna(how='all', subset=[milestone.label for milestone in milestones])
+    return hours.sort_values('ProcessingDate', ascending=False)  # Ensure the dates are sorted in descending order
+
+
+def build_time_difference_figure(frames, selected_date):
+    hours = _milestone_frame(frames['last_30_days'], TIME_DIFFERENCE_MILESTONES)
+    if hours.empty:
+        return px.line(title='No data available for the time difference milestones.')
+
+    # Line graph for the Time Difference tab, one line per milestone
+    long_hours = hours.melt(id_vars='ProcessingDate', var_name='Milestone', value_name='TimeDifference').sort_values('ProcessingDate')
+    labels = ', '.join(milestone.label for milestone in TIME_DIFFERENCE_MILESTONES)
+    fig_time_diff = px.line(long_hours, x='ProcessingDate', y='TimeDifference', color='Milestone',
+                            title=f'Time Difference ({labels}) Over the Last 30 Days', markers=True)
+    return style_figure(
+        fig_time_diff,
+        xaxis_title='Processing Date',
+        yaxis_title='Time Difference (hours)',
+        hovermode='x unified',
+        legend=TIME_DIFFERENCE_LEGEND
+    )
+
+
+def build_time_difference_table(frames, selected_date):
+    labels = [milestone.label for milestone in TIME_DIFFERENCE_MILESTONES]
+    hours = _milestone_frame(frames['last_30_days'], TIME_DIFFERENCE_MILESTONES)
+    if hours.empty:
+        return dbc.Table([
+            html.Thead(html.Tr([html.Th("Processing Date")] + [html.Th(f"{label} (hours)") for label in labels]), className='bg-primary text-white'),
+            html.Tbody([
+                html.Tr([html.Td("No Data") for _ in range(len(labels) + 1)])
+            ])
+        ], bordered=True, striped=True, hover=True)
+
+    # Create the table for the last 5 business days, including the selected date
+    last_5_business_days_df = hours[hours['ProcessingDate'].isin(get_last_5_business_days(selected_date))]
+    time_difference_rows = last_5_business_days_df.assign(**{
+        label: last_5_business_days_df[label].map(lambda value: 'No Data' if pd.isna(value) else f'{value:.2f} hours') for label in labels
+    })
+    row_classes = ['table-success' if date == selected_date else '' for date in time_difference_rows['ProcessingDate']]
+    return render_table(time_difference_rows, ['ProcessingDate'] + labels, headers=["Processing Date"] + [f"{label} (hours)" for label in labels],
+                        row_classes=row_classes, bordered=True, striped=True, hover=True)
+
+
+def build_time_difference_main_figure(frames, selected_date):
+    edges = job_edges(frames['last_30_days'])
+    dates = get_last_5_business_days(selected_date)
+
+    # 'All Jobs' plus the main milestones for the last 5 business days, from one pass over the edges
+    hours = milestone_hours(edges, MAIN_MILESTONES).merge(
+        stream_summary(edges, ALL_JOBS_STEPS)[['ProcessingDate', 'DurationHours']].rename(columns={'DurationHours': 'All Jobs'}),
+        on='ProcessingDate', how='outer'
+    )
+    hours = hours[hours['ProcessingDate'].isin(dates)]
+    main_time_diff_df = hours.melt(id_vars='ProcessingDate', value_vars=['All Jobs'] + [milestone.label for milestone in MAIN_MILESTONES],
+                                   var_name='Type', value_name='Time')
+    main_time_diff_df = main_time_diff_df[main_time_diff_df['Time'] > 0]  # Filter out rows with no time difference
+
+    if main_time_diff_df.empty:
+        job_types = ['All Jobs'] + [milestone.label for milestone in MAIN_MILESTONES]
+        fig_time_diff_main = go.Figure()
+        fig_time_diff_main.add_trace(go.Bar(
+            x=job_types,
+            y=[0] * len(job_types),
+            text=['No Data'] * len(job_types),
+            textposition='auto'
+        ))
+        return style_figure(
+            fig_time_diff_main,
+            title='Time Difference Analysis',
+            xaxis_title='Job Type',
+            yaxis_title='Time (hours)',
+            hovermode='x unified',
+            legend=TIME_DIFFERENCE_LEGEND
+        )
+
+    fig_time_diff_main = px.bar(main_time_diff_df.sort_values('ProcessingDate'), x='ProcessingDate', y='Time', color='Type',
+                                title='Time Difference Analysis for Last 5 Business Days', barmode='group')
+    return style_figure(
+        fig_time_diff_main,
+        xaxis_title='Processing Date',
+        yaxis_title='Time (hours)',
+        hovermode='x unified',
+        legend=TIME_DIFFERENCE_LEGEND
+    )
+
+
+def build_timeline_figure(frames, selected_date):
+    # Gantt view of the selected date's job stream, critical path highlighted
+    edges = job_edges(frames['jobs'])
+    edges = edges.assign(
+        End=edges['End'].fillna(pd.Timestamp.now()),  # still running
+        Path=edges['Critical'].map({True: 'Critical path', False: 'Other jobs'}),
+    )
+    summary = stream_summary(edges)
+    title = 'Batch Timeline'
+    if not summary.empty:
+        title += f" ({summary['DurationHours'].iloc[0]:.2f} hours)"
+    fig = px.timeline(edges, x_start='Start', x_end='End', y='JobName', color='Path', hover_data=['Step', 'SlackHours'],
+                      color_discrete_map={'Critical path': '#d62728', 'Other jobs': '#1f77b4'}, title=title)
+    fig.update_yaxes(autorange='reversed', categoryorder='array', categoryarray=edges['JobName'].tolist())
+    return style_figure(fig, xaxis_title='Time', yaxis_title='Job', height=max(400, 22 * len(edges) + 150))
+
+
+def build_job_duration_figure(frames, selected_date):
+    # Average job duration per job, already aggregated per day by duration_store
+    return px.line(frames['job_duration'], x='ProcessingDate', y='DurationMinutes', color='JobName', title='Average Job Duration Over Time')
+
+
+def build_performance_metrics_figure(frames, selected_date):
+    # Performance metrics comparison (AvgDuration, SuccessRate and Frequency are computed in SQL)
+    return px.box(frames['job_metrics'].melt(id_vars='JobName'), x='JobName', y='value', color='variable', title='Performance Metrics Comparison')
+
+
+def build_anomaly_figure(frames, selected_date):
+    # Anomaly detection against each job's own rolling duration statistics
+    df_30_days = frames['last_30_days']
+    anomaly_engine.update(df_30_days.assign(StartTime=pd.to_datetime(df_30_days['StartTime'])))
+    anomalies = anomaly_engine.recent_anomalies(pd.to_datetime(df_30_days['StartTime']).min())
+    return px.scatter(anomalies, x='StartTime', y='DurationMinutes', color='JobName', hover_data=['ExpectedMinutes', 'ZScore'],
+                      title='Anomaly Detection in Job Durations')
+
+
+def build_recovery_figure(frames, selected_date):
+    # Mean time from each failure to the job's next successful run, per day and per job
+    analysis = recovery_analysis(selected_date, frames['last_30_days'])
+    fig = make_subplots(rows=1, cols=2, column_widths=[0.6, 0.4], subplot_titles=('MTTR per Day', 'MTTR per Job'))
+    for col, (summary, column) in enumerate(((analysis['by_day'], 'ProcessingDate'), (analysis['by_job'], 'JobName')), start=1):
+        fig.add_trace(go.Bar(
+            x=summary[column], y=summary['MTTRHours'], customdata=summary[['Failures', 'Recovered']],
+            hovertemplate='%{x}<br>MTTR %{y:.2f} h<br>%{customdata[0]} failures, %{customdata[1]} recovered<extra></extra>',
+            showlegend=False
+        ), row=1, col=col)
+    fig.update_yaxes(title_text='Hours', row=1, col=1)
+    return fig.update_layout(title='Time to Recovery from Job Failures')
+
+
+# Every cacheable dashboard output: component id -> (property, builder, frames it reads)
+BUILDERS = {
+    'unlock-online-table': ('children', build_unlock_online_table, ('unlock_online',)),
+    'status-dropdown': ('options', build_status_options, ('jobs',)),
+    'status-bar-graph': ('figure', build_status_figure, ('jobs',)),
+    'failure-trend-graph': ('figure', build_failure_trend_figure, ('failure_trend',)),
+    'time-difference-graph': ('figure', build_time_difference_figure, ('last_30_days',)),
+    'time-difference-table': ('children', build_time_difference_table, ('last_30_days',)),
+    'job-duration-graph': ('figure', build_job_duration_figure, ('job_duration',)),
+    'performance-metrics-graph': ('figure', build_performance_metrics_figure, ('job_metrics',)),
+    'anomaly-detection-graph': ('figure', build_anomaly_figure, ('last_30_days',)),
+    'time-to-recovery-graph': ('figure', build_recovery_figure, ('last_30_days',)),
+    'time-difference-graph-main': ('figure', build_time_difference_main_figure, ('last_30_days',)),
+    'timeline-graph': ('figure', build_timeline_figure, ('jobs',)),
+}
+
+
+# Function to list the frames needed to build some outputs
+def frames_for(output_ids):
+    return {kind for output_id in output_ids for kind in BUILDERS[output_id][2]}
+
+
+# Serialized outputs, keyed by ('figure', output id, processing date, filter)
+figure_cache = ResultCache(max_bytes=FIGURE_CACHE_BYTES)
+
+# Build-time metrics per output id
+_build_stats = {}
+_build_stats_lock = threading.Lock()
+
+
+# Function to pick how long a built output stays valid: it depends on both the
+# processing date's rows and the rolling 30-day window
+def figure_ttl(selected_date):
+    ttls = [ttl for ttl in (ttl_for_date(selected_date), ttl_for_window()) if ttl is not None]
+    return min(ttls) if ttls else None
+
+
+# Function to look up already-built outputs; returns {output id: JSON-ready value}
+def get_cached_outputs(selected_date, output_ids, filter_key=None):
+    found = {}
+    for output_id in output_ids:
+        cached = figure_cache.get(('figure', output_id, selected_date, filter_key))
+        if cached is not None:
+            found[output_id] = json.loads(cached)
+    return found
+
+
+# Function to build outputs from the fetched frames, caching their JSON and timing each one
+def build_outputs(selected_date, frames, output_ids, filter_key=None):
+    ttl = figure_ttl(selected_date)
+    built = {}
+    timings = {}
+    for output_id in output_ids:
+        start = time.perf_counter()
+        value = BUILDERS[output_id][1](frames, selected_date)
+        serialized = json.dumps(value, cls=PlotlyJSONEncoder)
+        timings[output_id] = time.perf_counter() - start
+        figure_cache.set(('figure', output_id, selected_date, filter_key), serialized, ttl)
+        built[output_id] = value
+    _record_timings(timings)
+    logger.info("Built outputs for %s: %s", selected_date, ', '.join(f"{output_id}={seconds:.3f}s" for output_id, seconds in timings.items()))
+    return built
+
+
+def _record_timings(timings):
+    with _build_stats_lock:
+        for output_id, seconds in timings.items():
+            stats = _build_stats.setdefault(output_id, {'builds': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'last_seconds': 0.0})
+            stats['builds'] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['last_seconds'] = seconds
+
+
+# Function to report build-time metrics per output, slowest on average first
+def figure_stats():
+    with _build_stats_lock:
+        stats = {output_id: dict(values, avg_seconds=values['total_seconds'] / values['builds']) for output_id, values in _build_stats.items()}
+    return dict(sorted(stats.items(), key=lambda item: item[1]['avg_seconds'], reverse=True))
+
+
+# Function to drop cached outputs (all of them, or one processing date's)
+def invalidate_figures(selected_date=None):
+    return figure_cache.invalidate(lambda key: selected_date is None or key[2] == selected_date)
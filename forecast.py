@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from data_cache import ResultCache, ttl_for_window
+from timeline import job_edges
+
+# The job whose end marks Aspire being back online
+UNLOCK_JOB = 'UnLock Online'
+
+# Quantiles of the forecast: the band's low end, the estimate and the band's high end
+BAND_QUANTILES = (0.1, 0.5, 0.9)
+
+# Completed batches a job (or edge) needs in history before it is used as a basis
+MIN_SAMPLES = 5
+
+# Hour of day a processing date starts at (2 PM, the same cut-over the queries use)
+BATCH_START_HOUR = 14
+
+# Remaining-time profiles, one per 30-day window
+forecast_cache = ResultCache(max_entries=4)
+
+
+# Function to label runs with the processing date of their batch (2 PM on D to 2 PM on D+1)
+def batch_dates(start_times):
+    return (pd.to_datetime(start_times) - timedelta(hours=BATCH_START_HOUR)).dt.strftime('%Y-%m-%d')
+
+
+# Function to build the profile of a window without a finished UnLock Online: no basis at all
+def empty_profile():
+    return {'jobs': pd.DataFrame(columns=['JobName', 'Edge', *BAND_QUANTILES, 'Samples']), 'baseline': None}
+
+
+# Function to precompute how long UnLock Online took to finish after each job's
+# start and end, over every completed batch in the runs. Returns a dict with:
+#   'jobs': JobName, Edge ('Start' / 'End'), Samples and one column per band quantile
+#           (hours from that edge to UnLock Online's end)
+#   'baseline': the same quantiles measured from 2 PM on the processing date,
+#               for nights where nothing useful has run yet
+def remaining_profile(runs):
+    edges = job_edges(runs.assign(ProcessingDate=batch_dates(runs['StartTime'])))
+    unlock = edges[edges['JobName'] == UNLOCK_JOB].set_index('ProcessingDate')['End'].dropna()
+    if unlock.empty:
+        return empty_profile()
+    edges = edges[edges['ProcessingDate'].isin(unlock.index) & (edges['JobName'] != UNLOCK_JOB)]
+
+    marks = edges.melt(id_vars=['ProcessingDate', 'JobName'], value_vars=['Start', 'End'], var_name='Edge', value_name='Time').dropna(subset=['Time'])
+    marks['RemainingHours'] = (marks['ProcessingDate'].map(unlock) - marks['Time']).dt.total_seconds() / 3600
+    # A job that ran after UnLock Online says nothing about when it will finish
+    marks = marks[marks['RemainingHours'] >= 0]
+
+    grouped = marks.groupby(['JobName', 'Edge'], observed=True)['RemainingHours']
+    jobs = grouped.quantile(list(BAND_QUANTILES)).unstack()
+    jobs['Samples'] = grouped.size()
+    jobs = jobs[jobs['Samples'] >= MIN_SAMPLES].reset_index()
+
+    batch_start = pd.to_datetime(unlock.index) + timedelta(hours=BATCH_START_HOUR)
+    baseline = ((unlock.to_numpy() - batch_start) / pd.Timedelta(hours=1)).to_series().quantile(list(BAND_QUANTILES))
+    return {'jobs': jobs, 'baseline': baseline if len(unlock) >= MIN_SAMPLES else None}
+
+
+# Function to get the profile for the 30-day rows, built once per window like the figures
+def cached_profile(df_30_days, cache=forecast_cache):
+    profile = cache.get('profile')
+    if profile is None:
+        profile = remaining_profile(df_30_days)
+        cache.set('profile', profile, ttl_for_window(datetime.now()))
+    return profile
+
+
+# Function to drop the cached profile (e.g. once a batch completes and joins the history)
+def invalidate_forecast(cache=forecast_cache):
+    return cache.invalidate()
+
+
+# Function to forecast when UnLock Online finishes for a processing date from its
+# job rows so far. Every start and end seen tonight is looked up in the profile and
+# the one with the shortest expected remaining time wins: the further the batch has
+# got, the narrower the band. Only a lookup per job, so it is cheap on every poll.
+# Returns a dict with Low, Estimate and High times and the Basis they were measured
+# from ('Done' when UnLock Online already finished), or None without enough history
+# (no job in the profile was seen tonight and there is no baseline).
+def forecast_unlock(selected_date, jobs, profile, now=None):
+    now = now or datetime.now()
+    unlock_end = pd.to_datetime(jobs.loc[jobs['JobName'] == UNLOCK_JOB, 'EndTime']).dropna()
+    if not unlock_end.empty:
+        finished = unlock_end.max()
+        return {'Low': finished, 'Estimate': finished, 'High': finished, 'Basis': 'Done', 'BasisTime': finished}
+
+    low, middle, high = BAND_QUANTILES
+    if profile['jobs'].empty and profile['baseline'] is None:
+        return None
+    seen = job_edges(jobs).melt(id_vars=['JobName'], value_vars=['Start', 'End'], var_name='Edge', value_name='Time').dropna(subset=['Time'])
+    candidates = seen.merge(profile['jobs'], on=['JobName', 'Edge'])
+    if not candidates.empty:
+        basis = candidates.loc[candidates[middle].idxmin()]
+        basis_time, label = basis['Time'], f"{basis['JobName']} {basis['Edge'].lower()}"
+        hours = basis[list(BAND_QUANTILES)]
+    elif profile['baseline'] is not None:
+        basis_time = datetime.strptime(selected_date, '%Y-%m-%d') + timedelta(hours=BATCH_START_HOUR)
+        label, hours = 'Batch start', profile['baseline']
+    else:
+        return None
+
+    # UnLock Online has not finished, so it cannot finish before now
+    forecast = {name: max(pd.Timestamp(basis_time) + timedelta(hours=float(hours[quantile])), pd.Timestamp(now))
+                for name, quantile in (('Low', low), ('Estimate', middle), ('High', high))}
+    forecast.update(Basis=label, BasisTime=pd.Timestamp(basis_time))
+    return forecast
@@ -0,0 +1,111 @@
+import math
+import re
+
+import pandas as pd
+
+from data_cache import fetch_cached, result_cache, ttl_for_date
+
+# Columns shown in the job table
+JOB_TABLE_COLUMNS = ['JobName', 'StartDate', 'StartTime', 'EndDate', 'EndTime', 'Status']
+
+# Rows per page sent to the browser
+PAGE_SIZE = 50
+
+# Time columns are shown as text but sorted on the underlying datetime
+SORT_KEYS = {
+    'StartDate': '_StartTime',
+    'StartTime': '_StartTime',
+    'EndDate': '_EndTime',
+    'EndTime': '_EndTime',
+}
+
+# DataTable filter operators and their symbol forms, by the name apply_filter_query uses
+FILTER_OPERATORS = {
+    'ge': 'ge', '>=': 'ge',
+    'le': 'le', '<=': 'le',
+    'lt': 'lt', '<': 'lt',
+    'gt': 'gt', '>': 'gt',
+    'ne': 'ne', '!=': 'ne',
+    'eq': 'eq', '=': 'eq',
+    'contains': 'contains',
+    'datestartswith': 'datestartswith',
+}
+
+# One filter clause: '{column}', the operator right after it, then the value
+FILTER_CLAUSE = re.compile(r'^\s*\{(.+?)\}\s*([<>!]?=|[<>]|[a-z]+)\s*(.*?)\s*$')
+
+
+# Function to turn the raw job rows into display strings, keeping the datetimes for sorting
+def format_jobs(df):
+    start_time = pd.to_datetime(df['StartTime'])
+    end_time = pd.to_datetime(df['EndTime'])
+    return pd.DataFrame({
+        'JobName': df['JobName'].to_numpy(dtype=object),
+        'StartDate': start_time.dt.strftime('%Y-%m-%d').values,
+        'StartTime': start_time.dt.strftime('%I:%M:%S %p').values,
+        'EndDate': end_time.dt.strftime('%Y-%m-%d').values,
+        'EndTime': end_time.dt.strftime('%I:%M:%S %p').values,
+        'Status': df['Status'].to_numpy(dtype=object),
+        '_StartTime': start_time.values,
+        '_EndTime': end_time.values,
+    })
+
+
+# Function to get the formatted job frame for a processing date, formatted once and cached
+def job_table_frame(selected_date, cache=result_cache):
+    key = ('job_table', selected_date)
+    frame = cache.get(key)
+    if frame is None:
+        frame = format_jobs(fetch_cached(selected_date, kinds=('jobs',))['jobs'])
+        cache.set(key, frame, ttl_for_date(selected_date))
+    return frame
+
+
+# Function to split one DataTable filter clause like '{Status} contains Fail'
+# into (column, operator, value). The operator is the token right after the
+# column, so operator words inside the value are left alone.
+def split_filter_part(filter_part):
+    match = FILTER_CLAUSE.match(filter_part)
+    if match is None or match.group(2) not in FILTER_OPERATORS:
+        return None, None, None
+    name, operator, value = match.groups()
+    if value and value[0] == value[-1] and value[0] in ("'", '"', '`') and len(value) > 1:
+        value = value[1:-1].replace('\\' + value[0], value[0])
+    return name, FILTER_OPERATORS[operator], value
+
+
+# Function to apply a DataTable filter_query to the frame
+def apply_filter_query(frame, filter_query):
+    for filter_part in (filter_query or '').split(' && '):
+        column, operator, value = split_filter_part(filter_part)
+        if column not in JOB_TABLE_COLUMNS:
+            continue
+        values = frame[column]
+        if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+            frame = frame.loc[getattr(values, operator)(value)]
+        elif operator == 'contains':
+            frame = frame.loc[values.str.contains(value, case=False, regex=False)]
+        elif operator == 'datestartswith':
+            frame = frame.loc[values.str.startswith(value)]
+    return frame
+
+
+# Function to filter, sort and slice the job rows for one table page.
+# Returns (records for the page, page count, matching row count).
+def query_job_page(frame, selected_status=None, page_current=0, page_size=PAGE_SIZE, sort_by=None, filter_query=None):
+    if selected_status:
+        frame = frame.loc[frame['Status'] == selected_status]
+    frame = apply_filter_query(frame, filter_query)
+
+    if sort_by:
+        frame = frame.sort_values(
+            [SORT_KEYS.get(sort['column_id'], sort['column_id']) for sort in sort_by],
+            ascending=[sort['direction'] == 'asc' for sort in sort_by],
+            kind='mergesort'
+        )
+
+    total_rows = len(frame)
+    page_count = max(1, math.ceil(total_rows / page_size))
+    page_current = min(page_current or 0, page_count - 1)
+    page = frame.iloc[page_current * page_size:(page_current + 1) * page_size]
+    return page[JOB_TABLE_COLUMNS].to_dict('records'), page_count, total_rows
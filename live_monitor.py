@@ -0,0 +1,345 @@
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from itertools import count
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from data_cache import is_batch_closed, result_cache, ttl_for_date
+from db_pool import get_pool
+from fetch_engine import build_delta_query
+from figures import invalidate_figures
+from job_table import JOB_TABLE_COLUMNS, format_jobs
+
+logger = logging.getLogger(__name__)
+
+# Seconds between delta queries for a date, however many browsers are watching it
+LIVE_INTERVAL = 30
+
+# How many rounds of changed rows are kept for clients that fall behind
+CHANGE_LOG_LENGTH = 100
+
+# A run is identified by its JobStreamTaskHistory row (two tasks of one job can start
+# together); its end time and status fill in later
+ROW_KEY = ['TaskHistoryOid']
+
+# Marks before any real run, so the first delta returns the whole date
+NO_MARK = datetime(1900, 1, 1)
+
+# Events a slow subscriber may have waiting before the oldest is dropped
+SUBSCRIBER_QUEUE_SIZE = 20
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_INTERVAL = 15
+
+# Rows of the latest round carried by each event for the live panel
+LIVE_CHANGED_ROWS = 10
+
+# Seconds an event stream stays open before it ends and the browser reconnects,
+# so a request thread is never held by one viewer for good
+STREAM_SECONDS = 300
+
+# Milliseconds the browser waits before reconnecting an ended stream
+RECONNECT_MS = 3000
+
+# Event streams one process keeps open at once. Each holds a request thread, so this
+# stays well under the server's threads (ASPIRE_THREADS); viewers above it poll instead.
+MAX_STREAMS = int(os.environ.get('ASPIRE_LIVE_STREAMS', '8'))
+
+
+# Live state of one processing date: the merged job rows, the raw StartTime/EndTime
+# marks the next delta starts from, and a log of which rows changed in each round
+class LiveJobs:
+    def __init__(self, selected_date):
+        self.selected_date = selected_date
+        self.frame = None
+        self.last_start = NO_MARK
+        self.last_end = NO_MARK
+        self.version = 0
+        self.changes = deque(maxlen=CHANGE_LOG_LENGTH)
+        self.checked = None  # time.monotonic() of the last delta query
+        self.final = False  # set once a delta ran after the batch closed
+        self.lock = threading.Lock()
+
+
+_states = {}
+_states_guard = threading.Lock()
+
+
+def _state(selected_date):
+    with _states_guard:
+        return _states.setdefault(selected_date, LiveJobs(selected_date))
+
+
+# Columns whose change makes a known run count as changed
+CHANGE_COLUMNS = ['EndTime', 'Status']
+
+# Time columns of a delta, translated and raw
+DELTA_TIME_COLUMNS = ('StartTime', 'EndTime', 'RawStartTime', 'RawEndTime')
+
+
+# Function to give delta rows fixed dtypes. pd.read_sql infers them from the values,
+# so an empty delta, or one whose runs are all still going (EndTime all NULL), comes
+# back with object time columns that would not compare with the datetime64 ones
+# of the next delta.
+def normalise_delta(delta):
+    return delta.assign(
+        **{column: pd.to_datetime(delta[column]) for column in DELTA_TIME_COLUMNS if column in delta},
+        TaskHistoryOid=delta['TaskHistoryOid'].astype('int64'),
+    )
+
+
+# Function to merge delta rows into the frame. A delta row is changed when its run
+# is new or its end time or status moved on. Returns (merged frame, rows that are new or changed).
+def merge_delta(frame, delta):
+    if frame is None:
+        return delta.reset_index(drop=True), delta
+    before = frame[ROW_KEY + CHANGE_COLUMNS].drop_duplicates(ROW_KEY, keep='last')
+    compared = delta[ROW_KEY + CHANGE_COLUMNS].merge(before, how='left', on=ROW_KEY, suffixes=('', 'Before'), indicator=True)
+    same_end = (compared['EndTime'] == compared['EndTimeBefore']) | (compared['EndTime'].isna() & compared['EndTimeBefore'].isna())
+    differs = (compared['_merge'] == 'left_only') | ~same_end | (compared['Status'] != compared['StatusBefore'])
+    changed = delta.loc[differs.to_numpy()]
+    merged = pd.concat([frame, changed]).drop_duplicates(ROW_KEY, keep='last') if not changed.empty else frame
+    return merged.sort_values('StartTime', kind='mergesort').reset_index(drop=True), changed
+
+
+# Function to read job rows newer than the marks from JobStreamTaskHistory
+def fetch_delta(selected_date, last_start, last_end, pool=None):
+    query, params = build_delta_query(selected_date, last_start, last_end)
+    with (pool or get_pool()).connection() as conn:
+        return pd.read_sql(query, conn, params=params)
+
+
+# Where delta rows come from: SQL Server, or a fake source set with use_event_source
+delta_source = fetch_delta
+
+
+# Function to replace the delta source, e.g. with a FakeEventSource for local testing
+def use_event_source(source):
+    global delta_source
+    delta_source = source
+
+
+# Function to run one delta query and fold it into the state and the shared cache.
+# The marks only move once the rows are merged, so a failed round is fetched again.
+def _poll(state, pool, cache):
+    delta = normalise_delta(delta_source(state.selected_date, state.last_start, state.last_end, pool=pool))
+    state.checked = time.monotonic()
+
+    last_start, last_end = state.last_start, state.last_end
+    if not delta.empty:
+        last_start = max(last_start, delta['RawStartTime'].max().to_pydatetime())
+        end_times = delta['RawEndTime'].dropna()
+        if not end_times.empty:
+            last_end = max(last_end, end_times.max().to_pydatetime())
+    delta = delta.drop(columns=['RawStartTime', 'RawEndTime'])
+
+    changed = None
+    if state.frame is None or not delta.empty:
+        state.frame, changed = merge_delta(state.frame, delta)
+    state.last_start, state.last_end = last_start, last_end
+
+    # The merged rows stand in for the date's cached jobs, kept fresh while anyone watches
+    cache.set(('jobs', state.selected_date), state.frame, ttl_for_date(state.selected_date))
+    if state.version == 0 or (changed is not None and not changed.empty):
+        state.version += 1
+        state.changes.append((state.version, changed))
+        # Anything built from the old rows is stale
+        cache.invalidate(lambda key: key == ('job_table', state.selected_date))
+        invalidate_figures(state.selected_date)
+        logger.info("Live %s: %d changed rows, version %d", state.selected_date, len(changed), state.version)
+
+
+# Function to bring a date's live rows up to date. At most one delta query runs per
+# LIVE_INTERVAL for a date; every other caller gets the current version.
+# Returns the version number, which changes whenever rows change.
+def refresh(selected_date, pool=None, cache=result_cache):
+    state = _state(selected_date)
+    with state.lock:
+        due = state.checked is None or time.monotonic() - state.checked >= LIVE_INTERVAL
+        if due and not state.final:
+            # A fake source keeps playing, even on dates whose real batch is over
+            closed = is_batch_closed(selected_date) and delta_source is fetch_delta
+            _poll(state, pool, cache)
+            state.final = closed
+        return state.version
+
+
+# Function to get the rows that changed after `version` (all rows when version is None
+# or older than the change log), plus the status counts and the current version
+def changes_since(selected_date, version=None):
+    state = _state(selected_date)
+    with state.lock:
+        if state.frame is None:
+            return pd.DataFrame(), {}, state.version
+        counts = state.frame['Status'].value_counts().to_dict()
+        if version is None or not state.changes or state.changes[0][0] > version + 1:
+            return state.frame, counts, state.version
+        rows = [changed for logged_version, changed in state.changes if logged_version > version]
+        if not rows:
+            return state.frame.iloc[:0], counts, state.version
+        return pd.concat(rows).drop_duplicates(ROW_KEY, keep='last'), counts, state.version
+
+
+# Function to describe a date's live rows as a feed event: the status counts and the
+# newest rows changed in the latest round, formatted for the live panel. The event
+# carries everything the panel shows, so any worker process can render it.
+def snapshot(selected_date):
+    _, counts, version = changes_since(selected_date, version=-1)
+    changed, _, _ = changes_since(selected_date, version - 1)
+    latest = changed.sort_values('StartTime', ascending=False).head(LIVE_CHANGED_ROWS) if not changed.empty else changed
+    records = format_jobs(latest)[JOB_TABLE_COLUMNS].fillna('').to_dict('records') if not latest.empty else []
+    return {'date': selected_date, 'version': version, 'rows': sum(counts.values()), 'counts': counts, 'changed': records}
+
+
+# One background poller per process that refreshes the dates someone is watching
+# and pushes an event to every subscriber of a date whose rows changed. The
+# database sees one delta query per watched date and interval, however many
+# browsers are connected.
+class LiveFeed:
+    def __init__(self, interval=LIVE_INTERVAL, max_streams=MAX_STREAMS):
+        self.interval = interval
+        self.max_streams = max_streams
+        self._streams = 0  # streams open now
+        self._subscribers = {}  # subscriber queue -> processing date
+        self._published = {}  # processing date -> last version pushed
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, selected_date):
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[subscriber] = selected_date
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='live-feed', daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.pop(subscriber, None)
+
+    def stop(self):
+        self._stop.set()
+
+    # Function to take one of the max_streams stream slots; False when all are taken
+    def open_stream(self):
+        with self._lock:
+            if self._streams >= self.max_streams:
+                return False
+            self._streams += 1
+            return True
+
+    def close_stream(self):
+        with self._lock:
+            self._streams -= 1
+
+    def watched_dates(self):
+        with self._lock:
+            return sorted(set(self._subscribers.values()))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll_once()
+
+    # Refresh every watched date once and publish the ones that changed
+    def poll_once(self):
+        for selected_date in self.watched_dates():
+            try:
+                version = refresh(selected_date)
+            except Exception:
+                logger.exception("Live refresh failed for %s", selected_date)
+                continue
+            if version != self._published.get(selected_date):
+                self._published[selected_date] = version
+                self.publish(selected_date, snapshot(selected_date))
+
+    def publish(self, selected_date, event):
+        with self._lock:
+            subscribers = [subscriber for subscriber, watched in self._subscribers.items() if watched == selected_date]
+        for subscriber in subscribers:
+            # A subscriber that stopped reading loses its oldest event, not the newest
+            while True:
+                try:
+                    subscriber.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    # Generator of Server-Sent Events for one browser: the current state, then one
+    # event per change, with keep-alive comments in between. It ends after `seconds`;
+    # the browser's EventSource reconnects after RECONNECT_MS and gets the current
+    # state again, which frees the request thread in the meantime.
+    def stream(self, selected_date, seconds=STREAM_SECONDS):
+        subscriber = self.subscribe(selected_date)
+        deadline = time.monotonic() + seconds
+        try:
+            refresh(selected_date)
+            yield f"retry: {RECONNECT_MS}\ndata: {json.dumps(snapshot(selected_date))}\n\n"
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    event = subscriber.get(timeout=min(KEEPALIVE_INTERVAL, remaining))
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+
+# Shared feed, used by the /live-events route
+live_feed = LiveFeed()
+
+
+# Stand-in for JobStreamTaskHistory that plays a batch one transition per call:
+# either the running job finishes or the next one starts. Lets live mode and the
+# event stream run without SQL Server (ASPIRE_FAKE_EVENTS=1).
+class FakeEventSource:
+    def __init__(self, job_names=None, failure_rate=0.05, seed=None):
+        self.job_names = job_names or [f"{number}. Job {number}" for number in range(1, 20)] + ['UnLock Online']
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._rows = {}  # processing date -> list of row dicts
+        self._oids = count(1)
+        self._lock = threading.Lock()
+
+    def __call__(self, selected_date, last_start, last_end, pool=None):
+        with self._lock:
+            rows = self._rows.setdefault(selected_date, [])
+            self._advance(selected_date, rows)
+            delta = pd.DataFrame(rows, columns=['ProcessingDate', 'Joboid', 'TaskHistoryOid', 'JobName', 'StartTime', 'EndTime', 'Status', 'Message', 'RawStartTime', 'RawEndTime'])
+        for column in ('StartTime', 'EndTime', 'RawStartTime', 'RawEndTime'):
+            delta[column] = pd.to_datetime(delta[column])
+        # Same filter as query_job_delta
+        selected = (delta['RawStartTime'] > last_start) | (delta['RawEndTime'] > last_end) | delta['RawEndTime'].isna()
+        return delta.loc[selected].reset_index(drop=True)
+
+    def _advance(self, selected_date, rows):
+        if rows and rows[-1]['Status'] == 'Running':
+            row = rows[-1]
+            end_time = row['StartTime'] + timedelta(minutes=self._random.uniform(2, 30))
+            failed = self._random.random() < self.failure_rate
+            row.update(EndTime=end_time, RawEndTime=end_time, Status='Failed' if failed else 'Succeeded',
+                       Message='Simulated failure' if failed else 'Completed')
+        elif len(rows) < len(self.job_names):
+            start_time = rows[-1]['EndTime'] + timedelta(minutes=1) if rows else datetime.strptime(selected_date, '%Y-%m-%d') + timedelta(hours=21)
+            rows.append({
+                'ProcessingDate': selected_date, 'Joboid': len(rows) + 1, 'TaskHistoryOid': next(self._oids),
+                'JobName': self.job_names[len(rows)],
+                'StartTime': start_time, 'EndTime': None, 'Status': 'Running', 'Message': None,
+                'RawStartTime': start_time, 'RawEndTime': None,
+            })
@@ -1,696 +1,630 @@
-import pyodbc
-import pandas as pd
 import dash
 import dash_bootstrap_components as dbc
+import flask
 from dash import dcc, html
 from dash.dependencies import Input, Output, State
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache, wraps
+import logging
 import os
-from PIL import Image
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options
-from io import BytesIO
 import time
-import win32com.client as win32
-from multiprocessing import Process, Queue
+import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 import base64
+from business_days import get_last_business_day
+from data_cache import fetch_cached, is_batch_closed
+from prefetch import ensure_prefetcher
+from forecast import BAND_QUANTILES, cached_profile, forecast_unlock
+from figures import BUILDERS, build_outputs, frames_for, get_cached_outputs
+from job_table import JOB_TABLE_COLUMNS, PAGE_SIZE, job_table_frame, query_job_page
+from live_monitor import FakeEventSource, LIVE_INTERVAL, live_feed, refresh, snapshot, use_event_source
+from email_jobs import DONE as EMAIL_DONE, FAILED as EMAIL_FAILED, EmailJobQueue
+from report_render import render_report
+from table_render import render_data_table, render_table
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls of a queued email's progress
+EMAIL_POLL_INTERVAL = 1
 
 # Path to your logo image
 logo_path = 'C:\\Aspire_Dashboard\\Aspire.png'
 
-# Encode the image to base64
-with open(logo_path, 'rb') as f:
-    logo_base64 = base64.b64encode(f.read()).decode('ascii')
-
-# Function to get the last business day
-def get_last_business_day():
-    today = datetime.today()
-    if today.weekday() == 0:  # Monday
-        last_business_day = today - timedelta(days=3)
-    elif today.weekday() == 6:  # Sunday
-        last_business_day = today - timedelta(days=2)
-    else:  # Any other day (Tuesday to Saturday)
-        last_business_day = today - timedelta(days=1)
-    
-    # Ensure the date is within the current month
-    if last_business_day.month != today.month:
-        last_business_day = today.replace(day=1) - timedelta(days=1)
-        while last_business_day.weekday() >= 5:  # Skip weekends
-            last_business_day -= timedelta(days=1)
-    
-    return last_business_day
-
-# Function to get the last 5 business days
-def get_last_5_business_days(selected_date):
-    selected_date_obj = datetime.strptime(selected_date, '%Y-%m-%d')
-    business_days = []
-    current_day = selected_date_obj
-    while len(business_days) < 5:
-        if current_day.weekday() < 5:  # Monday to Friday are business days
-            business_days.append(current_day.strftime('%Y-%m-%d'))
-        current_day -= timedelta(days=1)
-    return business_days
-
-# Get the default date
-default_date = get_last_business_day().strftime('%Y-%m-%d')
-
-# Function to fetch data
-def fetch_data(selected_date):
-    conn_str = (
-        r'DRIVER={SQL Server};'
-        r'SERVER=SDC01ASRSQPD01S\PSQLINST01;'
-        r'DATABASE=ASPIRE;'
-        r'Trusted_Connection=yes;'
-    )
-    conn = pyodbc.connect(conn_str)
-
-    query = f"""
-    SELECT 
-        CASE 
-            WHEN DATEPART(hour, JSH.StartTime) < 14 THEN CONVERT(varchar, DATEADD(day, -1, JSH.StartTime), 23) 
-            ELSE CONVERT(varchar, JSH.StartTime, 23) 
-        END as ProcessingDate, 
-        JSJ.JobStreamJoboid as Joboid, 
-        JSJ.Name as JobName,
-        CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime], 
-        CONVERT(datetime, JSH.EndTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [EndTime], 
-        JSH.Status, 
-        JSH.Message 
-    FROM JobStreamTaskHistory JSH
-    LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
-    JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
-    WHERE 
-        CASE 
-            WHEN DATEPART(hour, JSH.StartTime) < 14 THEN CONVERT(varchar, DATEADD(day, -1, JSH.StartTime), 23) 
-            ELSE CONVERT(varchar, JSH.StartTime, 23) 
-        END = '{selected_date}'
-    ORDER BY StartTime ASC
-    """
-    df = pd.read_sql(query, conn)
-
-    query_30_days = """
-    SELECT 
-        CONVERT(varchar, JSH.StartTime, 23) as ProcessingDate, 
-        JSH.Status,
-        JSJ.Name as JobName,
-        CONVERT(datetime, JSH.StartTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [StartTime],
-        CONVERT(datetime, JSH.EndTime AT TIME ZONE 'UTC' AT TIME ZONE 'Eastern Standard Time') AS [EndTime],
-        JSH.Message
-    FROM JobStreamTaskHistory JSH
-    LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
-    JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
-    WHERE JSH.StartTime >= DATEADD(day, -30, GETDATE())
-    """
-    df_30_days = pd.read_sql(query_30_days, conn)
-
-    query_job_duration = f"""
-    SELECT 
-        CONVERT(varchar, JSH.StartTime, 23) as ProcessingDate, 
-        JSJ.Name as JobName,
-        DATEDIFF(SECOND, JSH.StartTime, JSH.EndTime) / 60.0 as DurationMinutes
-    FROM JobStreamTaskHistory JSH
-    LEFT JOIN JobStreamTask JST ON JSH.JobStreamTaskOid = JST.JobStreamTaskoid 
-    JOIN JobStreamJob JSJ ON JSJ.JobStreamJoboid = JST.JobStreamJoboid
-    WHERE CONVERT(varchar, JSH.StartTime, 23) = '{selected_date}'
-    """
-    df_job_duration = pd.read_sql(query_job_duration, conn)
-
-    query_unlock_online = f"""
-    SELECT JobName, CONVERT(datetime, EndTime) AS CompletionTime, Status 
-    FROM Job_StatsVW 
-    WHERE JobName = 'UnLock Online' 
-    AND ProcessingDate = '{selected_date}'
-    """
-    df_unlock_online = pd.read_sql(query_unlock_online, conn)
-
-    conn.close()
-
-    return df, df_30_days, df_job_duration, df_unlock_online
+# Function to encode the logo to base64; read on the first page load, not at import
+@lru_cache(maxsize=1)
+def get_logo_base64():
+    try:
+        with open(logo_path, 'rb') as f:
+            return base64.b64encode(f.read()).decode('ascii')
+    except OSError:
+        return ''
 
-# Fetch initial data
-df, df_30_days, df_job_duration, df_unlock_online = fetch_data(default_date)
+# ASPIRE_FAKE_EVENTS=1 plays a simulated batch in live mode instead of querying SQL Server
+if os.environ.get('ASPIRE_FAKE_EVENTS') == '1':
+    use_event_source(FakeEventSource())
 
 # Initialize the Dash app with Bootstrap CSS and suppress callback exceptions
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], assets_folder='assets', suppress_callback_exceptions=True)
 
-# Layout of the dashboard
-app.layout = dbc.Container([
-    dbc.Row([
-        dbc.Col(html.Img(src='data:image/png;base64,{}'.format(logo_base64), height='60px', id='logo'), width='auto'),
-        dbc.Col(html.H1("ASPIRE DASHBOARD", className='text-center mb-4 fade-in', style={'font-weight': 'bold', 'color': '#2A3F5F', 'border-bottom': '1px solid #2A3F5F'}), width=True, className='d-flex justify-content-center align-items-center'),
-        dbc.Col([
-            html.Div("Pick a date 📆", className='text-center mb-2 fade-in', style={'font-weight': 'bold'}),
-            dcc.DatePickerSingle(
-                id='date-picker-table',
-                display_format='YYYY-MM-DD',
-                date=default_date,  # Default date
-                className='form-control',
-                style={'font-weight': 'bold'}
-            ),
-            html.I(className="fa fa-calendar", id="calendar-icon", style={"margin-left": "10px"}),
-        ], width='auto', className='d-flex justify-content-end align-items-center fade-in'),
-        dbc.Tooltip("Select a date", target="calendar-icon"),
-        dbc.Tooltip("Company Logo", target="logo")
-    ], className='border mb-3 align-items-center justify-content-center slide-in'),
-    dbc.Tabs([
-        dbc.Tab(label='Main Dashboard', tab_id='main-dashboard', children=[
-            dbc.Row([
-                dbc.Col([
-                    dbc.Card(
-                        dbc.CardBody([
-                            html.H4("Aspire Unlock Online", className='card-title'),
-                            dcc.Loading(
-                                id="loading-unlock-online",
-                                type="default",
-                                children=html.Div(id='unlock-online-table', style={'width': '50%'}, className='slide-in')
+# Flask server for WSGI servers (see serve.py)
+server = app.server
+
+# Warm the cache for recent business days in the background (ASPIRE_PREFETCH=0 turns it off).
+# Nothing starts at import: the first request starts the prefetcher, in one worker
+# process only (see prefetch.ensure_prefetcher).
+if os.environ.get('ASPIRE_PREFETCH', '1') != '0':
+    @server.before_request
+    def start_prefetch():
+        ensure_prefetcher()
+
+# Layout of the dashboard, built on each page load so the default date stays current
+def serve_layout():
+    default_date = get_last_business_day().strftime('%Y-%m-%d')
+
+    return dbc.Container([
+        dbc.Row([
+            dbc.Col(html.Img(src='data:image/png;base64,{}'.format(get_logo_base64()), height='60px', id='logo'), width='auto'),
+            dbc.Col(html.H1("ASPIRE DASHBOARD", className='text-center mb-4 fade-in', style={'font-weight': 'bold', 'color': '#2A3F5F', 'border-bottom': '1px solid #2A3F5F'}), width=True, className='d-flex justify-content-center align-items-center'),
+            dbc.Col([
+                html.Div("Pick a date 📆", className='text-center mb-2 fade-in', style={'font-weight': 'bold'}),
+                dcc.DatePickerSingle(
+                    id='date-picker-table',
+                    display_format='YYYY-MM-DD',
+                    date=default_date,  # Default date
+                    className='form-control',
+                    style={'font-weight': 'bold'}
+                ),
+                html.I(className="fa fa-calendar", id="calendar-icon", style={"margin-left": "10px"}),
+                dbc.Switch(id='live-mode-switch', label='Live', value=False, className='ms-3 mb-0'),
+                dcc.Store(id='live-data-store'),
+            ], width='auto', className='d-flex justify-content-end align-items-center fade-in'),
+            dbc.Tooltip("Select a date", target="calendar-icon"),
+            dbc.Tooltip("Follow the running batch; new job rows are pushed every {} seconds".format(LIVE_INTERVAL), target="live-mode-switch"),
+            dbc.Tooltip("Company Logo", target="logo")
+        ], className='border mb-3 align-items-center justify-content-center slide-in'),
+        dbc.Tabs(id='dashboard-tabs', active_tab='main-dashboard', children=[
+            dbc.Tab(label='Main Dashboard', tab_id='main-dashboard', children=[
+                dbc.Row([
+                    dbc.Col([
+                        dbc.Card(
+                            dbc.CardBody([
+                                html.H4("Aspire Unlock Online", className='card-title'),
+                                dcc.Loading(
+                                    id="loading-unlock-online",
+                                    type="default",
+                                    children=html.Div(id='unlock-online-table', style={'width': '50%'}, className='slide-in')
+                                ),
+                                html.Div(id='unlock-eta', className='mt-2')
+                            ]),
+                            className='mb-4 border animated-card'
+                        )
+                    ], width=12)
+                ], className='border mb-3'),
+                dbc.Row([
+                    dbc.Col([
+                        html.Div([
+                            dcc.Dropdown(
+                                id='status-dropdown',
+                                placeholder="Select Status",
+                                className='mb-4'
                             )
                         ]),
-                        className='mb-4 border animated-card'
-                    )
-                ], width=12)
-            ], className='border mb-3'),
-            dbc.Row([
-                dbc.Col([
-                    html.Div([
-                        dcc.Dropdown(
-                            id='status-dropdown',
-                            placeholder="Select Status",
-                            className='mb-4'
+                    ], width=6),
+                    dbc.Col([
+                        dcc.Store(id='job-data-store'),
+                        html.Div(id='live-status', className='mb-2'),
+                        dcc.Loading(
+                            id="loading-job-table",
+                            type="default",
+                            children=html.Div([
+                                html.Div(id='job-table-message'),
+                                html.Div(
+                                    render_data_table(
+                                        [], JOB_TABLE_COLUMNS, id='job-table',
+                                        page_action='custom', page_current=0, page_size=PAGE_SIZE, page_count=1,
+                                        sort_action='custom', sort_mode='multi', sort_by=[],
+                                        filter_action='custom', filter_query=''
+                                    ),
+                                    id='job-table-wrapper'
+                                )
+                            ], id='job-table-container', className='slide-in')
                         )
-                    ]),
-                ], width=6),
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-job-table",
-                        type="default",
-                        children=html.Div(id='job-table-container', className='slide-in')
-                    )
-                ], width=12)
-            ], className='border'),
-            dbc.Row([
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-status-bar-graph",
-                        type="default",
-                        children=dcc.Graph(id='status-bar-graph', className='fade-in')
-                    )
-                ], width=12)
-            ], className='border'),
-            dbc.Row([
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-failure-trend-graph",
-                        type="default",
-                        children=dcc.Graph(id='failure-trend-graph', className='fade-in')
-                    )
-                ], width=12)
-            ], className='border'),
-            dbc.Row([
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-time-difference-graph-main",
-                        type="default",
-                        children=dcc.Graph(id='time-difference-graph-main', className='fade-in')
-                    )
-                ], width=12)
-            ], className='border'),
-            dbc.Row([
-                dbc.Col([
-                    html.Button("Send Email", id="send-email-button", className="btn btn-primary mt-3 pulse", style={'width': '200px'}),
-                    dbc.Tooltip("Send Dashboard via Email", target="send-email-button")
-                ], width=12, className='d-flex justify-content-center')
-            ], className='border mt-3')
-        ]),
-        dbc.Tab(label='Job Duration Analysis', tab_id='job-duration', children=[
-            dbc.Row([
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-job-duration-graph",
-                        type="default",
-                        children=dcc.Graph(id='job-duration-graph', className='fade-in')
-                    )
-                ], width=12)
-            ], className='border mt-3')
-        ]),
-        dbc.Tab(label='Performance Metrics', tab_id='performance-metrics', children=[
-            dbc.Row([
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-performance-metrics-graph",
-                        type="default",
-                        children=dcc.Graph(id='performance-metrics-graph', className='fade-in')
-                    )
-                ], width=12)
-            ], className='border mt-3')
-        ]),
-        dbc.Tab(label='Anomaly Detection', tab_id='anomaly-detection', children=[
-            dbc.Row([
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-anomaly-detection-graph",
-                        type="default",
-                        children=dcc.Graph(id='anomaly-detection-graph', className='fade-in')
-                    )
-                ], width=12)
-            ], className='border mt-3')
-        ]),
-        dbc.Tab(label='Time to Recovery', tab_id='time-to-recovery', children=[
-            dbc.Row([
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-time-to-recovery-graph",
-                        type="default",
-                        children=dcc.Graph(id='time-to-recovery-graph', className='fade-in')
-                    )
-                ], width=12)
-            ], className='border mt-3')
+                    ], width=12)
+                ], className='border'),
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-status-bar-graph",
+                            type="default",
+                            children=dcc.Graph(id='status-bar-graph', className='fade-in')
+                        )
+                    ], width=12)
+                ], className='border'),
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-failure-trend-graph",
+                            type="default",
+                            children=dcc.Graph(id='failure-trend-graph', className='fade-in')
+                        )
+                    ], width=12)
+                ], className='border'),
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-time-difference-graph-main",
+                            type="default",
+                            children=dcc.Graph(id='time-difference-graph-main', className='fade-in')
+                        )
+                    ], width=12)
+                ], className='border'),
+                dbc.Row([
+                    dbc.Col([
+                        html.Button("Send Email", id="send-email-button", className="btn btn-primary mt-3 pulse", style={'width': '200px'}),
+                        dbc.Tooltip("Send Dashboard via Email", target="send-email-button"),
+                        dcc.Store(id='email-job-store'),
+                        dcc.Interval(id='email-progress-interval', interval=EMAIL_POLL_INTERVAL * 1000, disabled=True),
+                        html.Div(id='email-status', className='mt-2', style={'width': '400px'})
+                    ], width=12, className='d-flex flex-column align-items-center')
+                ], className='border mt-3')
+            ]),
+            dbc.Tab(label='Job Duration Analysis', tab_id='job-duration', children=[
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-job-duration-graph",
+                            type="default",
+                            children=dcc.Graph(id='job-duration-graph', className='fade-in')
+                        )
+                    ], width=12)
+                ], className='border mt-3')
+            ]),
+            dbc.Tab(label='Performance Metrics', tab_id='performance-metrics', children=[
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-performance-metrics-graph",
+                            type="default",
+                            children=dcc.Graph(id='performance-metrics-graph', className='fade-in')
+                        )
+                    ], width=12)
+                ], className='border mt-3')
+            ]),
+            dbc.Tab(label='Anomaly Detection', tab_id='anomaly-detection', children=[
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-anomaly-detection-graph",
+                            type="default",
+                            children=dcc.Graph(id='anomaly-detection-graph', className='fade-in')
+                        )
+                    ], width=12)
+                ], className='border mt-3')
+            ]),
+            dbc.Tab(label='Time to Recovery', tab_id='time-to-recovery', children=[
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-time-to-recovery-graph",
+                            type="default",
+                            children=dcc.Graph(id='time-to-recovery-graph', className='fade-in')
+                        )
+                    ], width=12)
+                ], className='border mt-3')
+            ]),
+            dbc.Tab(label='Time Difference', tab_id='time-difference', children=[
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-time-difference-graph",
+                            type="default",
+                            children=dcc.Graph(id='time-difference-graph', className='fade-in')
+                        )
+                    ], width=9),
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-time-difference-table",
+                            type="default",
+                            children=html.Div(id='time-difference-table', style={'font-size': '14px'}, className='fade-in')
+                        )
+                    ], width=3)
+                ], className='border mt-3')
+            ]),
+            dbc.Tab(label='Batch Timeline', tab_id='timeline', children=[
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Loading(
+                            id="loading-timeline-graph",
+                            type="default",
+                            children=dcc.Graph(id='timeline-graph', className='fade-in')
+                        )
+                    ], width=12)
+                ], className='border mt-3')
+            ])
         ]),
-        dbc.Tab(label='Time Difference', tab_id='time-difference', children=[
-            dbc.Row([
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-time-difference-graph",
-                        type="default",
-                        children=dcc.Graph(id='time-difference-graph', className='fade-in')
-                    )
-                ], width=9),
-                dbc.Col([
-                    dcc.Loading(
-                        id="loading-time-difference-table",
-                        type="default",
-                        children=html.Div(id='time-difference-table', style={'font-size': '14px'}, className='fade-in')
-                    )
-                ], width=3)
-            ], className='border mt-3')
-        ])
-    ]),
-    dcc.ConfirmDialog(
-        id='confirm-dialog',
-        message='Email sent successfully!',
-    ),
-], fluid=True, className='p-4 bg-light rounded-3 shadow')
-
-# Callback to update the tables and dropdowns based on the selected date
-@app.callback(
-    [Output('unlock-online-table', 'children'),
-     Output('job-table-container', 'children'),
-     Output('status-dropdown', 'options'),
-     Output('status-bar-graph', 'figure'),
-     Output('failure-trend-graph', 'figure'),
-     Output('time-difference-graph', 'figure'),
-     Output('time-difference-table', 'children'),
-     Output('job-duration-graph', 'figure'),
-     Output('performance-metrics-graph', 'figure'),
-     Output('anomaly-detection-graph', 'figure'),
-     Output('time-to-recovery-graph', 'figure'),
-     Output('time-difference-graph-main', 'figure')],
-    [Input('date-picker-table', 'date'),
-     Input('status-dropdown', 'value')]
-)
-def update_dashboard(selected_date, selected_status):
+        dcc.ConfirmDialog(
+            id='confirm-dialog',
+            message='Email sent successfully!',
+        ),
+    ], fluid=True, className='p-4 bg-light rounded-3 shadow')
+
+app.layout = serve_layout
+
+# Function to build the red status message shown instead of data
+def status_message(text):
+    return html.Div(
+        [
+            html.H4(text, className='text-center text-danger slide-in')
+        ]
+    )
+
+# Outputs computed for each tab; the analytics tabs are only computed once opened
+TAB_OUTPUTS = {
+    'main-dashboard': [
+        'unlock-online-table',
+        'status-dropdown',
+        'status-bar-graph',
+        'failure-trend-graph',
+        'time-difference-graph-main',
+    ],
+    'job-duration': ['job-duration-graph'],
+    'performance-metrics': ['performance-metrics-graph'],
+    'anomaly-detection': ['anomaly-detection-graph'],
+    'time-to-recovery': ['time-to-recovery-graph'],
+    'time-difference': ['time-difference-graph', 'time-difference-table'],
+    'timeline': ['timeline-graph'],
+}
+
+# Outputs of update_tab, in callback order
+ANALYTICS_OUTPUTS = [output_id for tab_id, output_ids in TAB_OUTPUTS.items() if tab_id != 'main-dashboard' for output_id in output_ids]
+
+# Order in which the main tab's date callbacks are registered, which is the order the
+# browser requests them in. 'job-table-container' is the job table (via job-data-store).
+# ASPIRE_CALLBACK_ORDER (comma-separated ids) moves the listed ones to the front.
+CALLBACK_ORDER = ['unlock-online-table', 'job-table-container'] + TAB_OUTPUTS['main-dashboard'][1:]
+
+# Function to read the configured callback order; unknown ids are ignored
+def callback_order():
+    configured = [callback_id.strip() for callback_id in os.environ.get('ASPIRE_CALLBACK_ORDER', '').split(',')]
+    configured = [callback_id for callback_id in dict.fromkeys(configured) if callback_id in CALLBACK_ORDER]
+    return configured + [callback_id for callback_id in CALLBACK_ORDER if callback_id not in configured]
+
+# Decorator to log how long a callback takes
+def log_latency(name):
+    def decorator(callback):
+        @wraps(callback)
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return callback(*args)
+            finally:
+                logger.info("Callback %s took %.3fs", name, time.perf_counter() - start)
+        return timed
+    return decorator
+
+# Function to check whether a date can have data; returns the message to show instead, or None
+def unavailable_message(selected_date):
     now = datetime.now()
     selected_date_obj = datetime.strptime(selected_date, '%Y-%m-%d')
-    
+
     # Check if the selected date is a weekend, future date, or before 9 PM today
-    if selected_date_obj.weekday() >= 5 or selected_date_obj > now or (selected_date == now.strftime('%Y-%m-%d') and now.hour < 21):
-        if selected_date_obj.weekday() >= 5:
-            message = html.Div(
-                [
-                    html.H4("No data available due to holidays or weekends", className='text-center text-danger slide-in')
-                ]
-            )
-        elif selected_date_obj > now:
-            message = html.Div(
-                [
-                    html.H4("Batch yet to start", className='text-center text-danger slide-in')
-                ]
-            )
-        else:
-            message = html.Div(
-                [
-                    html.H4("Batch yet to start", className='text-center text-danger slide-in')
-                ]
-            )
-
-        empty_fig = px.bar()
-        return message, message, [], empty_fig, empty_fig, empty_fig, html.Div(), empty_fig, empty_fig, empty_fig, empty_fig, empty_fig
-
-    df, df_30_days, df_job_duration, df_unlock_online = fetch_data(selected_date)
-
-    if df.empty:
-        message = html.Div(
-            [
-                html.H4("No Data Available", className='text-center text-danger slide-in')
-            ]
-        )
-        empty_fig = px.bar()
-        return message, message, [], empty_fig, empty_fig, empty_fig, html.Div(), empty_fig, empty_fig, empty_fig, empty_fig, empty_fig
-
-    df['StartDate'] = pd.to_datetime(df['StartTime']).dt.strftime('%Y-%m-%d')
-    df['StartTime'] = pd.to_datetime(df['StartTime']).dt.strftime('%I:%M:%S %p')
-    df['EndDate'] = pd.to_datetime(df['EndTime']).dt.strftime('%Y-%m-%d')
-    df['EndTime'] = pd.to_datetime(df['EndTime']).dt.strftime('%I:%M:%S %p')
-
-    df_unlock_online['CompletionTime'] = pd.to_datetime(df_unlock_online['CompletionTime']).dt.strftime('%I:%M:%S %p')
-
-    status_options = [{'label': status, 'value': status} for status in df['Status'].unique()]
-
-    filtered_df = df
-    if selected_status:
-        filtered_df = filtered_df[filtered_df['Status'] == selected_status]
-
-    job_table_header = [html.Thead(html.Tr([html.Th(col) for col in ['JobName', 'StartDate', 'StartTime', 'EndDate', 'EndTime', 'Status']], className='bg-primary text-white'))]
-    job_table_body = [html.Tbody([html.Tr([html.Td(filtered_df.iloc[i][col]) for col in ['JobName', 'StartDate', 'StartTime', 'EndDate', 'EndTime', 'Status']]) for i in range(len(filtered_df))])]
-
-    job_table = dbc.Table(job_table_header + job_table_body, striped=True, bordered=True, hover=True)
-
-    unlock_online_table_header = [html.Thead(html.Tr([html.Th(col) for col in ['JobName', 'CompletionTime', 'Status']], className='bg-primary text-white'))]
-    unlock_online_table_body = [html.Tbody([html.Tr([html.Td(df_unlock_online.iloc[i][col]) for col in ['JobName', 'CompletionTime', 'Status']]) for i in range(len(df_unlock_online))])]
-
-    unlock_online_table = dbc.Table(unlock_online_table_header + unlock_online_table_body, striped=True, bordered=True, hover=True, className='table-dark')
-
-    status_counts = df['Status'].value_counts().reset_index()
-    status_counts.columns = ['Status', 'Count']
-
-    # Customize the bar graph for Job Status Counts
-    fig_status = go.Figure(data=[
-        go.Bar(
-            x=status_counts['Count'],
-            y=status_counts['Status'],
-            orientation='h',
-            marker=dict(
-                color=status_counts['Status'].apply(lambda x: 'green' if x == 'Succeeded' else 'orange' if x == 'Succeeded with Exceptions' else 'red'),
-                line=dict(color='black', width=1)  # Keep the border
-            )
-        )
-    ])
-    fig_status.update_layout(
-        title='Job Status Counts',
-        xaxis_title='Count',
-        yaxis_title='Status',
-        template='plotly_white',
-        plot_bgcolor='rgba(229,236,246,1)',
-        title_font=dict(size=21, family='Arial, bold', color='rgba(42, 63, 95, 1)'),
-        xaxis=dict(
-            showgrid=True,
-            showline=False,
-            linewidth=1,
-            linecolor='black',
-            mirror=True,
-            gridcolor='lightgrey'
-        ),
-        yaxis=dict(
-            showgrid=True,
-            showline=False,
-            linewidth=1,
-            linecolor='black',
-            mirror=True,
-            gridcolor='lightgrey',
-        ),
-        font=dict(size=14),
-        bargap=0.4  # Adjust this value to reduce the height of the bars
+    if selected_date_obj.weekday() >= 5:
+        return "No data available due to holidays or weekends"
+    if selected_date_obj > now or (selected_date == now.strftime('%Y-%m-%d') and now.hour < 21):
+        return "Batch yet to start"
+    return None
+
+# Function to get built outputs for a date, from the figure cache where possible.
+# Only the frames the missing outputs read are fetched, plus the date's job rows,
+# which decide for every output alike whether the date has data (as update_job_data
+# does): None when it has no job rows. Each kind loads on its own, so an output
+# waits for its own queries and the job rows, not for the slowest query of the date.
+def load_outputs(selected_date, output_ids):
+    outputs = get_cached_outputs(selected_date, output_ids)
+    missing = [output_id for output_id in output_ids if output_id not in outputs]
+    if missing:
+        frames = fetch_cached(selected_date, kinds=frames_for(missing) | {'jobs'})
+        if frames['jobs'].empty:
+            return None
+        outputs.update(build_outputs(selected_date, frames, missing))
+    return outputs
+
+# Function to get the placeholder shown in an output when there is no data
+def empty_output(output_id, message_text):
+    if output_id == 'unlock-online-table':
+        return status_message(message_text)
+    if output_id == 'status-dropdown':
+        return []
+    if BUILDERS[output_id][0] == 'figure':
+        return px.bar()
+    return html.Div()
+
+# Callback body for job-data-store, which tells update_job_table which date (or message) to show
+def update_job_data(selected_date):
+    message_text = unavailable_message(selected_date)
+    if message_text is None and job_table_frame(selected_date).empty:
+        message_text = "No Data Available"
+    return {'date': selected_date, 'message': message_text} if message_text else {'date': selected_date}
+
+# Function to register the date callback of one main-tab output. Each output has its own
+# callback, so a slow chart does not hold back the ones whose data is already there.
+def register_output_callback(output_id):
+    @app.callback(
+        Output(output_id, BUILDERS[output_id][0]),
+        [Input('date-picker-table', 'date')]
     )
+    @log_latency(output_id)
+    def update_output(selected_date):
+        message_text = unavailable_message(selected_date)
+        outputs = None if message_text else load_outputs(selected_date, [output_id])
+        if outputs is None:
+            return empty_output(output_id, message_text or "No Data Available")
+        return outputs[output_id]
+
+    return update_output
+
+# Callbacks to update the main tab based on the selected date, in the configured order.
+# Built outputs are cached per date, so a repeat view skips pandas and Plotly.
+for callback_id in callback_order():
+    if callback_id == 'job-table-container':
+        app.callback(
+            Output('job-data-store', 'data'),
+            [Input('date-picker-table', 'date')]
+        )(log_latency(callback_id)(update_job_data))
+    else:
+        register_output_callback(callback_id)
 
-    df_30_days['ProcessingDate'] = pd.to_datetime(df_30_days['ProcessingDate']).dt.strftime('%Y-%m-%d')
-    df_30_days['DurationMinutes'] = (df_30_days['EndTime'] - df_30_days['StartTime']).dt.total_seconds() / 60.0
-
-    # Exclude "Benchmark Update" from failure trend
-    df_failed = df_30_days[(df_30_days['Status'] == 'Failed') & (df_30_days['JobName'] != '20. Benchmark Update')]
-    failure_trend = df_failed.groupby(['ProcessingDate', 'JobName', 'StartTime', 'Message']).size().reset_index(name='Count')
-    fig_trend = px.bar(failure_trend, x='ProcessingDate', y='Count', color='JobName', title='Failure Trend Over the Last 30 Days', 
-                       hover_data={'StartTime': True, 'JobName': True, 'Message': True})
-    fig_trend.update_layout(
-        bargap=0.4,
-        template='plotly_white',
-        plot_bgcolor='rgba(229,236,246,1)',
-        title_font=dict(size=21, family='Arial, bold', color='rgba(42, 63, 95, 1)'),
-        xaxis=dict(
-            showgrid=True,
-            showline=False,
-            linewidth=1,
-            linecolor='black',
-            mirror=True,
-            gridcolor='lightgrey',
-            tickformat='%Y-%m-%d'
-        ),
-        yaxis=dict(
-            showgrid=True,
-            showline=False,
-            linewidth=1,
-            linecolor='black',
-            mirror=True,
-            gridcolor='lightgrey',
-            rangemode='tozero'
-        ),
-        font=dict(size=14),
-        hovermode='x unified'
+# Callback to update the analytics tabs. Only the active tab is computed;
+# the others keep what they showed and are brought up to date when opened.
+@app.callback(
+    [Output(output_id, BUILDERS[output_id][0]) for output_id in ANALYTICS_OUTPUTS],
+    [Input('dashboard-tabs', 'active_tab'),
+     Input('date-picker-table', 'date')]
+)
+@log_latency('analytics-tab')
+def update_tab(active_tab, selected_date):
+    if active_tab == 'main-dashboard' or active_tab not in TAB_OUTPUTS:
+        raise dash.exceptions.PreventUpdate
+
+    output_ids = TAB_OUTPUTS[active_tab]
+    message_text = unavailable_message(selected_date)
+    outputs = None if message_text else load_outputs(selected_date, output_ids)
+    if outputs is None:
+        outputs = {output_id: empty_output(output_id, message_text) for output_id in output_ids}
+
+    return [outputs.get(output_id, dash.no_update) for output_id in ANALYTICS_OUTPUTS]
+
+# Callback to page, sort and filter the job table on the server. Only the
+# visible page is sent; rows come from the cached frame for the stored date,
+# so changing the status filter never re-runs the date callback.
+# In live mode a new live version re-reads the current page.
+@app.callback(
+    [Output('job-table', 'data'),
+     Output('job-table', 'page_count'),
+     Output('job-table', 'page_current'),
+     Output('job-table-message', 'children'),
+     Output('job-table-wrapper', 'style')],
+    [Input('job-data-store', 'data'),
+     Input('status-dropdown', 'value'),
+     Input('job-table', 'page_current'),
+     Input('job-table', 'page_size'),
+     Input('job-table', 'sort_by'),
+     Input('job-table', 'filter_query'),
+     Input('live-data-store', 'data')]
+)
+@log_latency('job-table')
+def update_job_table(job_data, selected_status, page_current, page_size, sort_by, filter_query, live_data):
+    # Live rows for a date that still shows "Batch yet to start" replace the message
+    live = bool(job_data and live_data and live_data['date'] == job_data['date'] and live_data['rows'])
+    if not job_data or ('message' in job_data and not live):
+        message = status_message(job_data['message']) if job_data else html.Div()
+        return [], 1, 0, message, {'display': 'none'}
+
+    # A new date, status or filter starts again from the first page
+    triggered = [trigger['prop_id'] for trigger in dash.callback_context.triggered]
+    if any(prop_id not in ('job-table.page_current', 'job-table.sort_by', 'live-data-store.data') for prop_id in triggered):
+        page_current = 0
+
+    records, page_count, total_rows = query_job_page(job_table_frame(job_data['date']), selected_status, page_current, page_size or PAGE_SIZE, sort_by, filter_query)
+    page_current = min(page_current or 0, page_count - 1)
+    return records, page_count, page_current, html.Div(), {}
+
+# Function to build the live panel: status counts and the rows that just changed
+# (already formatted records, newest first, as the live event carries them)
+def live_status(changed, counts):
+    colors = {'Succeeded': 'success', 'Failed': 'danger'}
+    summary = html.Div(
+        [dbc.Badge(f"{status}: {count}", color=colors.get(status, 'secondary'), className='me-2') for status, count in sorted(counts.items())] +
+        [html.Small(f"Updated {datetime.now().strftime('%I:%M:%S %p')}", className='text-muted')]
     )
+    if not changed:
+        return summary
+    latest = pd.DataFrame(changed, columns=JOB_TABLE_COLUMNS)
+    return html.Div([
+        summary,
+        html.H6("Latest changes", className='mt-2'),
+        render_table(latest, JOB_TABLE_COLUMNS, bordered=True, size='sm', className='mb-0')
+    ])
 
-    triad_df = df_30_days[df_30_days['JobName'] == '18. TRIAD']
-    benchmark_update_df = df_30_days[df_30_days['JobName'] == '20. Benchmark Update']
-
-    fig_time_diff = go.Figure()
-
-    if not triad_df.empty and not benchmark_update_df.empty:
-        merged_df = pd.merge(triad_df, benchmark_update_df, on='ProcessingDate', suffixes=('_TRIAD', '_Benchmark'))
-        merged_df['TimeDifference'] = (merged_df['EndTime_Benchmark'] - merged_df['EndTime_TRIAD']).dt.total_seconds() / 3600
-
-        merged_df = merged_df.sort_values('ProcessingDate', ascending=False)  # Ensure the dates are sorted in descending order
-
-        # Create the table for the last 5 business days, including the selected date
-        last_5_business_days = get_last_5_business_days(selected_date)
-        last_5_business_days_df = merged_df[merged_df['ProcessingDate'].isin(last_5_business_days)]
-
-        table_rows = []
-        for index, row in last_5_business_days_df.iterrows():
-            row_class = 'table-success' if row['ProcessingDate'] == selected_date else ''
-            table_rows.append(html.Tr([
-                html.Td(row['ProcessingDate']),
-                html.Td(f"{row['TimeDifference']:.2f} hours")
-            ], className=row_class))
-
-        time_difference_table = dbc.Table([
-            html.Thead(html.Tr([html.Th("Processing Date"), html.Th("Time Difference (hours)")]), className='bg-primary text-white'),
-            html.Tbody(table_rows)
-        ], bordered=True, striped=True, hover=True)
-
-        # Time difference for main dashboard bar graph for last 5 business days
-        main_time_diff_data = []
-        for date in last_5_business_days:
-            triad_time = triad_df[triad_df['ProcessingDate'] == date]['EndTime'].max()
-            benchmark_start_time = benchmark_update_df[benchmark_update_df['ProcessingDate'] == date]['StartTime'].min()
-            sourcing_time_difference = (benchmark_start_time - triad_time).total_seconds() / 3600
-
-            all_jobs_df = df_30_days[(df_30_days['ProcessingDate'] == date) & (df_30_days['JobName'].str.match(r'^[1-9]\.'))]
-            if not all_jobs_df.empty:
-                all_jobs_time = (all_jobs_df['EndTime'].max() - all_jobs_df['StartTime'].min()).total_seconds() / 3600
-                main_time_diff_data.append({'ProcessingDate': date, 'Type': 'All Jobs', 'Time': all_jobs_time})
-                main_time_diff_data.append({'ProcessingDate': date, 'Type': 'Sourcing Job', 'Time': sourcing_time_difference})
-
-        main_time_diff_df = pd.DataFrame(main_time_diff_data)
-        main_time_diff_df = main_time_diff_df[main_time_diff_df['Time'] > 0]  # Filter out rows with no time difference
-
-        fig_time_diff_main = px.bar(main_time_diff_df, x='ProcessingDate', y='Time', color='Type', title='Time Difference Analysis for Last 5 Business Days', barmode='group')
-        fig_time_diff_main.update_layout(
-            xaxis_title='Processing Date',
-            yaxis_title='Time (hours)',
-            hovermode='x unified',
-            legend=dict(title="Metrics", orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            template='plotly_white',
-            plot_bgcolor='rgba(229,236,246,1)',
-            title_font=dict(size=21, family='Arial, bold', color='rgba(42, 63, 95, 1)'),
-            xaxis=dict(
-                showgrid=True,
-                showline=False,
-                linewidth=1,
-                linecolor='black',
-                mirror=True,
-                gridcolor='lightgrey'
-            ),
-            yaxis=dict(
-                showgrid=True,
-                showline=False,
-                linewidth=1,
-                linecolor='black',
-                mirror=True,
-                gridcolor='lightgrey',
-            ),
-            font=dict(size=14)
-        )
-
-        # Line graph for the Time Difference tab
-        fig_time_diff = px.line(merged_df, x='ProcessingDate', y='TimeDifference', title='Time Difference between TRIAD and Benchmark Update Jobs Over the Last 30 Days', markers=True)
-        fig_time_diff.update_layout(
-            xaxis_title='Processing Date',
-            yaxis_title='Time Difference (hours)',
-            hovermode='x unified',
-            legend=dict(title="Metrics", orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            template='plotly_white',
-            plot_bgcolor='rgba(229,236,246,1)',
-            title_font=dict(size=21, family='Arial, bold', color='rgba(42, 63, 95, 1)'),
-            xaxis=dict(
-                showgrid=True,
-                showline=False,
-                linewidth=1,
-                linecolor='black',
-                mirror=True,
-                gridcolor='lightgrey'
-            ),
-            yaxis=dict(
-                showgrid=True,
-                showline=False,
-                linewidth=1,
-                linecolor='black',
-                mirror=True,
-                gridcolor='lightgrey',
-            ),
-            font=dict(size=14)
-        )
+# Function to read and check the date argument of the live routes
+def live_date_argument():
+    selected_date = flask.request.args.get('date', '')
+    try:
+        datetime.strptime(selected_date, '%Y-%m-%d')
+    except ValueError:
+        flask.abort(400)
+    return selected_date
+
+# Server-Sent Events feed of live changes for one processing date. Every browser in
+# live mode keeps one of these open; live_feed's single poller does the database work.
+# Each stream holds a request thread, so past live_feed.max_streams open streams the
+# process answers 503 and the browser polls /live-state instead.
+@server.route('/live-events')
+def live_events():
+    selected_date = live_date_argument()
+    if not live_feed.open_stream():
+        return flask.Response(status=503, headers={'Retry-After': str(LIVE_INTERVAL)})
+    response = flask.Response(
+        live_feed.stream(selected_date),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    response.call_on_close(live_feed.close_stream)
+    return response
+
+# Current live event for one processing date, for browsers the stream limit turned
+# away. A short request; at most one delta query per LIVE_INTERVAL and date.
+@server.route('/live-state')
+def live_state():
+    selected_date = live_date_argument()
+    refresh(selected_date)
+    return flask.jsonify(snapshot(selected_date))
+
+# Clientside callback that opens the event stream for the selected date while live mode
+# is on. Each event is written to live-data-store; switching off or changing the date
+# closes the stream (or stops the polling) and clears the store. When the server ends
+# a stream after its time, EventSource reconnects on its own; when it refuses one
+# (503, too many streams) EventSource gives up, and the latest state is polled every
+# LIVE_INTERVAL instead.
+app.clientside_callback(
+    """
+    function(liveMode, selectedDate) {
+        if (window.aspireLiveEvents) {
+            window.aspireLiveEvents.close();
+            window.aspireLiveEvents = null;
+        }
+        if (window.aspireLivePoll) {
+            clearInterval(window.aspireLivePoll);
+            window.aspireLivePoll = null;
+        }
+        if (liveMode && selectedDate) {
+            const query = '?date=' + encodeURIComponent(selectedDate);
+            const publish = function(data) {
+                window.dash_clientside.set_props('live-data-store', {data: data});
+            };
+            const poll = function() {
+                fetch('live-state' + query)
+                    .then(function(response) { return response.ok ? response.json() : null; })
+                    .then(function(data) { if (data) { publish(data); } })
+                    .catch(function() {});
+            };
+            const events = new EventSource('live-events' + query);
+            events.onmessage = function(message) {
+                publish(JSON.parse(message.data));
+            };
+            events.onerror = function() {
+                if (events.readyState === EventSource.CLOSED && window.aspireLiveEvents === events) {
+                    window.aspireLiveEvents = null;
+                    poll();
+                    window.aspireLivePoll = setInterval(poll, %d);
+                }
+            };
+            window.aspireLiveEvents = events;
+        }
+        return null;
+    }
+    """ % (LIVE_INTERVAL * 1000),
+    Output('live-data-store', 'data'),
+    [Input('live-mode-switch', 'value'),
+     Input('date-picker-table', 'date')]
+)
 
-    else:
-        fig_time_diff = px.line(title='No data available for TRIAD or Benchmark Update jobs.')
-        time_difference_table = dbc.Table([
-            html.Thead(html.Tr([html.Th("Processing Date"), html.Th("Time Difference (hours)")]), className='bg-primary text-white'),
-            html.Tbody([
-                html.Tr([html.Td("No Data"), html.Td("No Data")])
-            ])
-        ], bordered=True, striped=True, hover=True)
-
-        fig_time_diff_main = go.Figure()
-        fig_time_diff_main.add_trace(go.Bar(
-            x=['All Jobs', 'Sourcing Job', 'Benchmark Update'],
-            y=[0, 0, 0],
-            marker=dict(color=['#1f77b4', '#ff7f0e', '#2ca02c']),
-            text=['No Data', 'No Data', 'No Data'],
-            textposition='auto'
-        ))
-        fig_time_diff_main.update_layout(
-            title='Time Difference Analysis',
-            xaxis_title='Job Type',
-            yaxis_title='Time (hours)',
-            hovermode='x unified',
-            legend=dict(title="Metrics", orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            template='plotly_white',
-            plot_bgcolor='rgba(229,236,246,1)',
-            title_font=dict(size=21, family='Arial, bold', color='rgba(42, 63, 95, 1)'),
-            xaxis=dict(
-                showgrid=True,
-                showline=False,
-                linewidth=1,
-                linecolor='black',
-                mirror=True,
-                gridcolor='lightgrey'
-            ),
-            yaxis=dict(
-                showgrid=True,
-                showline=False,
-                linewidth=1,
-                linecolor='black',
-                mirror=True,
-                gridcolor='lightgrey',
-            ),
-            font=dict(size=14)
-        )
-
-    # Calculate average job duration per job
-    df_job_duration['ProcessingDate'] = pd.to_datetime(df_job_duration['ProcessingDate']).dt.strftime('%Y-%m-%d')
-    avg_duration = df_job_duration.groupby(['ProcessingDate', 'JobName'])['DurationMinutes'].mean().reset_index()
-    fig_job_duration = px.line(avg_duration, x='ProcessingDate', y='DurationMinutes', color='JobName', title='Average Job Duration Over Time')
-
-    # Performance metrics comparison
-    performance_metrics = df_30_days.groupby('JobName').agg(
-        AvgDuration=('DurationMinutes', 'mean'),
-        SuccessRate=('Status', lambda x: (x != 'Failed').mean() * 100),
-        Frequency=('JobName', 'count')
-    ).reset_index()
-    fig_performance_metrics = px.box(performance_metrics.melt(id_vars='JobName'), x='JobName', y='value', color='variable', title='Performance Metrics Comparison')
-
-    # Anomaly detection (using z-score)
-    df_30_days['DurationZScore'] = (df_30_days['DurationMinutes'] - df_30_days['DurationMinutes'].mean()) / df_30_days['DurationMinutes'].std()
-    anomalies = df_30_days[df_30_days['DurationZScore'].abs() > 2]
-    fig_anomaly_detection = px.scatter(anomalies, x='StartTime', y='DurationMinutes', color='JobName', title='Anomaly Detection in Job Durations')
-
-    # Time to recovery from failures
-    df_30_days['RecoveryTime'] = df_30_days.groupby('JobName')['EndTime'].diff().dt.total_seconds() / 3600
-    recovery_data = df_30_days[df_30_days['Status'] == 'Failed'].groupby('ProcessingDate')['RecoveryTime'].mean().reset_index()
-    fig_recovery = px.bar(recovery_data, x='ProcessingDate', y='RecoveryTime', title='Time to Recovery from Job Failures')
-
-    return unlock_online_table, job_table, status_options, fig_status, fig_trend, fig_time_diff, time_difference_table, fig_job_duration, fig_performance_metrics, fig_anomaly_detection, fig_recovery, fig_time_diff_main
+# Callback to redraw the live panel when an event arrives. The event carries the
+# counts and the rows changed in that round, so whichever worker process answers
+# renders the same panel without touching the database or the live state.
+@app.callback(
+    Output('live-status', 'children'),
+    [Input('live-data-store', 'data')]
+)
+@log_latency('live')
+def update_live_status(live_data):
+    if not live_data:
+        return html.Div()
+    return live_status(live_data.get('changed', []), live_data['counts'])
+
+# Callback to forecast when UnLock Online finishes while the selected date's batch is
+# open, and only for dates that can have data (as the other date callbacks decide).
+# In live mode it is redone on every new live version, from the cached job rows
+# and the precomputed remaining-time profile, so it never rescans history.
+@app.callback(
+    Output('unlock-eta', 'children'),
+    [Input('date-picker-table', 'date'),
+     Input('live-data-store', 'data')]
+)
+@log_latency('unlock-eta')
+def update_unlock_eta(selected_date, live_data):
+    if unavailable_message(selected_date) or is_batch_closed(selected_date):
+        return html.Div()
+    frames = fetch_cached(selected_date, kinds=('jobs', 'last_30_days'))
+    forecast = forecast_unlock(selected_date, frames['jobs'], cached_profile(frames['last_30_days']))
+    if forecast is None or forecast['Basis'] == 'Done':
+        return html.Div()
+    band = round((BAND_QUANTILES[-1] - BAND_QUANTILES[0]) * 100)
+    return dbc.Alert([
+        html.Strong(f"Expected online at {forecast['Estimate'].strftime('%I:%M %p')}"),
+        f" ({band}% band {forecast['Low'].strftime('%I:%M %p')} - {forecast['High'].strftime('%I:%M %p')}), "
+        f"based on {forecast['Basis']} at {forecast['BasisTime'].strftime('%I:%M %p')}"
+    ], color='info', className='mb-0 py-2')
+
+# Health check for run_dashboard (and load balancers): answers once the app is serving
+@server.route('/health')
+def health():
+    return flask.jsonify(status='ok')
+
+# Address of the Dash app started by run_dashboard
+DASHBOARD_URL = "http://127.0.0.1:8050/"
+
+# Seconds to wait for the server to answer /health
+SERVER_START_TIMEOUT = 60
+
+# Function to poll a URL until it answers 200. `alive` (optional) is checked between
+# attempts so a server process that died fails fast instead of waiting out the timeout.
+def wait_for_server(url, timeout=SERVER_START_TIMEOUT, interval=0.1, alive=None):
+    import urllib.request
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        if alive is not None and not alive():
+            raise RuntimeError(f"Server for {url} exited before it was ready")
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"{url} did not respond within {timeout} seconds")
+        time.sleep(interval)
+
+# Function to log how long each startup step took
+def log_step_timings(name, timings):
+    logger.info("%s took %.2fs (%s)", name, sum(timings.values()), ', '.join(f"{step}={seconds:.2f}s" for step, seconds in timings.items()))
 
 def run_dash_app(queue):
     app.run_server(debug=True, port=8050, use_reloader=False)
     queue.put("Dash app stopped")
 
 def run_dashboard():
+    # Imported here so that importing main.py (e.g. in a WSGI worker) stays fast
+    from multiprocessing import Process, Queue
+
+    timings = {}
+    step_start = time.perf_counter()
+
     queue = Queue()
     dash_process = Process(target=run_dash_app, args=(queue,))
     dash_process.start()
 
-    # Give the server some time to start
-    time.sleep(10)  # Increased wait time to ensure the server starts
-
-    # Set up Selenium WebDriver for Chrome (ensure you have a compatible Chrome WebDriver in PATH)
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")  # Increase window size for full capture
-
-    chrome_driver_path = "C:\\chromedriver_win64\\chromedriver.exe"
+    # Wait for the server to answer its health check
+    wait_for_server(DASHBOARD_URL + 'health', alive=dash_process.is_alive)
+    timings['server'] = time.perf_counter() - step_start
 
-    webdriver_service = ChromeService(executable_path=chrome_driver_path)
-    try:
-        driver = webdriver.Chrome(service=webdriver_service, options=chrome_options)
-    except Exception as e:
-        raise
-
-    # Open the Dash app in the browser
-    driver.get("http://127.0.0.1:8050/")
-    time.sleep(5)  # Give some time to ensure the page loads
-
-    return driver, dash_process, queue
-
-def capture_full_page_screenshot(driver, file_path):
-    # Get the dimensions of the page
-    total_width = driver.execute_script("return document.body.scrollWidth")
-    total_height = driver.execute_script("return document.body.scrollHeight")
-    viewport_height = driver.execute_script("return window.innerHeight")
-
-    # Set the browser window to the total page width
-    driver.set_window_size(total_width, viewport_height)
-    time.sleep(2)  # Allow time for the window resize to take effect
-
-    # List to hold individual screenshots
-    screenshots = []
-
-    # Scroll and capture screenshots
-    for i in range(0, total_height, viewport_height):
-        if i + viewport_height > total_height:
-            viewport_height = total_height - i
-            driver.execute_script(f"window.scrollTo(0, {i});")
-            time.sleep(1)
-            driver.set_window_size(total_width, viewport_height)
-        else:
-            driver.execute_script(f"window.scrollTo(0, {i});")
-            time.sleep(1)
-        
-        screenshot = driver.get_screenshot_as_png()
-        screenshots.append(Image.open(BytesIO(screenshot)))
-
-    # Stitch screenshots together
-    stitched_image = Image.new('RGB', (total_width, total_height))
-    y_offset = 0
-    for screenshot in screenshots:
-        stitched_image.paste(screenshot, (0, y_offset))
-        y_offset += screenshot.size[1]
-
-    stitched_image.save(file_path)
+    log_step_timings("Dashboard start", timings)
+    return dash_process, queue
 
 def send_email_with_screenshot(image_path, processing_date, benchmark_end_time):
+    import win32com.client as win32
+
     # Send an email with the screenshot embedded
     outlook = win32.Dispatch('outlook.application')
     mail = outlook.CreateItem(0)
@@ -726,37 +660,61 @@ def send_email_with_screenshot(image_path, processing_date, benchmark_end_time):
 
     mail.Send()
 
-@app.callback(
-    [Output('send-email-button', 'n_clicks'), Output('confirm-dialog', 'displayed')],
-    [Input('send-email-button', 'n_clicks')],
-    [State('date-picker-table', 'date')]
-)
-def handle_send_email(n_clicks, selected_date):
-    if n_clicks is not None:
-        driver, dash_process, queue = run_dashboard()
+# Function run by the email worker: render the report from this process's cached data
+# and send it. `report_progress(percent, message)` feeds the progress indicator.
+def send_report_email(selected_date, report_progress):
+    image_path = r"C:\Aspire_Dashboard\dashboard.png"
+    os.makedirs(os.path.dirname(image_path), exist_ok=True)
 
-        # Capture the full page screenshot
-        image_path = r"C:\Aspire_Dashboard\dashboard.png"
-        os.makedirs(os.path.dirname(image_path), exist_ok=True)
-        capture_full_page_screenshot(driver, image_path)
+    report_progress(10, "Rendering report")
+    render_report(selected_date, image_path, logo_path=logo_path)
 
-        # Get the last business day and benchmark end time
-        processing_date = selected_date
-        benchmark_end_time = df[df['JobName'] == '20. Benchmark Update']['EndTime'].max()
+    # Get the benchmark end time
+    report_progress(70, "Sending email")
+    df = fetch_cached(selected_date, kinds=('jobs',))['jobs']
+    benchmark_end_time = df[df['JobName'] == '20. Benchmark Update']['EndTime'].max()
 
-        # Send the email with the screenshot
-        send_email_with_screenshot(image_path, processing_date, benchmark_end_time)
+    # Send the email with the report image
+    send_email_with_screenshot(image_path, selected_date, benchmark_end_time)
 
-        # Close the browser and stop the Dash app
-        driver.quit()
-        dash_process.terminate()
+# Background queue for email reports, so the button's callback returns at once
+email_queue = EmailJobQueue(send_report_email)
 
-        return None, True  # Trigger the confirm dialog
+# Callback to queue an email report for the selected date; returns the job id immediately
+@app.callback(
+    [Output('send-email-button', 'n_clicks'), Output('email-job-store', 'data')],
+    [Input('send-email-button', 'n_clicks')],
+    [State('date-picker-table', 'date')]
+)
+def handle_send_email(n_clicks, selected_date):
+    if n_clicks is None:
+        raise dash.exceptions.PreventUpdate
+    return None, {'job_id': email_queue.submit(selected_date)}
 
-    return None, False
+# Callback to show the queued email's progress, polling its job id until it finishes
+@app.callback(
+    [Output('email-progress-interval', 'disabled'),
+     Output('email-status', 'children'),
+     Output('confirm-dialog', 'displayed')],
+    [Input('email-job-store', 'data'),
+     Input('email-progress-interval', 'n_intervals')]
+)
+def update_email_progress(job_data, n_intervals):
+    if not job_data:
+        return True, html.Div(), False
+    job = email_queue.get(job_data['job_id'])
+    if job is None:
+        return True, html.Small("Email status is no longer available", className='text-muted'), False
+
+    finished = job['status'] in (EMAIL_DONE, EMAIL_FAILED)
+    if job['status'] == EMAIL_FAILED:
+        return True, html.Small(job['message'], className='text-danger'), False
+    progress = dbc.Progress(value=job['progress'], label=job['message'], striped=not finished, animated=not finished,
+                            color='success' if finished else 'primary', style={'height': '20px'})
+    return finished, progress, job['status'] == EMAIL_DONE
 
 def main():
-    driver, dash_process, queue = run_dashboard()
+    dash_process, queue = run_dashboard()
 
     print("Dashboard is running. Press Ctrl+C to stop.")
     try:
@@ -0,0 +1,152 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import duration_store
+from business_days import get_last_business_day, get_last_5_business_days
+from data_cache import fetch_cached, invalidate_date, invalidate_window
+from db_pool import get_pool
+from fetch_engine import build_queries
+from figures import invalidate_figures
+from forecast import invalidate_forecast
+from recovery import invalidate_recovery
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for a finished batch, during and outside batch hours (9 PM to 2 PM)
+BATCH_POLL_INTERVAL = 300
+IDLE_POLL_INTERVAL = 1800
+
+# File locked by the one process that runs the prefetcher, however many workers serve the app
+PREFETCH_LOCK_PATH = os.environ.get('ASPIRE_PREFETCH_LOCK', os.path.join(tempfile.gettempdir(), 'aspire_prefetch.lock'))
+
+# Seconds between tries for the lock by a process that did not get it
+LOCK_RETRY_INTERVAL = 60
+
+
+# Function to list the processing dates worth having in the cache:
+# the last business day and the five business days before it
+def dates_to_warm():
+    last_business_day = get_last_business_day()
+    previous_day = (last_business_day - timedelta(days=1)).strftime('%Y-%m-%d')
+    return [last_business_day.strftime('%Y-%m-%d')] + get_last_5_business_days(previous_day)
+
+
+# Function to load each date into the cache; one bad date does not stop the rest
+def warm(dates):
+    for selected_date in dates:
+        try:
+            fetch_cached(selected_date)
+        except Exception:
+            logger.exception("Prefetch failed for %s", selected_date)
+
+
+# Function to check Job_StatsVW for a finished "UnLock Online" row, which marks the end of the batch
+def unlock_online_completed(selected_date, pool=None):
+    query, params = build_queries(selected_date)['unlock_online']
+    with (pool or get_pool()).connection() as conn:
+        df_unlock_online = pd.read_sql(query, conn, params=params)
+    return not df_unlock_online.empty and df_unlock_online['CompletionTime'].notna().any()
+
+
+# Background thread that warms the cache on startup and again when a batch completes
+class PrefetchScheduler:
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+        self._completed = set()  # processing dates whose batch completion was already handled
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='prefetch', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        warm(dates_to_warm())
+        while not self._stop.wait(self._poll_interval()):
+            try:
+                self._check_batch()
+            except Exception:
+                logger.exception("Prefetch batch check failed")
+
+    def _poll_interval(self):
+        hour = datetime.now().hour
+        return BATCH_POLL_INTERVAL if hour >= 21 or hour < 14 else IDLE_POLL_INTERVAL
+
+    # Re-warm once the last business day's batch is done; a new day is warmed as soon as it appears
+    def _check_batch(self):
+        dates = dates_to_warm()
+        last_business_day = dates[0]
+        if last_business_day in self._completed:
+            return
+        if unlock_online_completed(last_business_day):
+            logger.info("Batch for %s completed, re-warming cache", last_business_day)
+            invalidate_date(last_business_day)
+            invalidate_window()
+            invalidate_figures()
+            invalidate_recovery()
+            invalidate_forecast()
+            duration_store.sync(force=True)
+            self._completed.add(last_business_day)
+        warm(dates)
+
+
+# Shared scheduler, started by the app
+prefetcher = PrefetchScheduler()
+
+
+def start_prefetcher():
+    return prefetcher.start()
+
+
+_lock_file = None  # open lock file while this process runs the prefetcher
+_lock_tried = None  # time.monotonic() of the last try for the lock
+_lock_guard = threading.Lock()
+
+
+# Function to take an exclusive lock on a file without waiting. The lock is held
+# until the file is closed or the process exits (the OS drops it then, even after
+# a crash). Returns the open file, or None when another process holds the lock.
+def _try_lock(path):
+    handle = open(path, 'a+')
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+# Function to start the prefetcher in one process only. Called on every request: the
+# first process to get the lock file runs the prefetcher; the others try again every
+# LOCK_RETRY_INTERVAL, so another worker takes over if that process exits. Being
+# called from a request (not at import) also works with a server that imports the
+# app before forking its workers. Returns True when this process runs the prefetcher.
+def ensure_prefetcher(lock_path=PREFETCH_LOCK_PATH):
+    global _lock_file, _lock_tried
+    if _lock_file is not None:
+        return True
+    with _lock_guard:
+        if _lock_file is None and (_lock_tried is None or time.monotonic() - _lock_tried >= LOCK_RETRY_INTERVAL):
+            _lock_tried = time.monotonic()
+            _lock_file = _try_lock(lock_path)
+            if _lock_file is not None:
+                logger.info("Prefetcher runs in process %d", os.getpid())
+                start_prefetcher()
+        return _lock_file is not None
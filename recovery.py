@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pandas as pd
+
+from data_cache import ResultCache, ttl_for_date, ttl_for_window
+
+# Recovery results per processing date
+recovery_cache = ResultCache(max_entries=64)
+
+
+# Function to pair every Failed run with the next successful run of the same job.
+# A run succeeded when it finished and its Status is not 'Failed' (the same rule as
+# the SuccessRate metric). A failure counts from its EndTime (StartTime if it never
+# ended) to the EndTime of that next success. Runs are sorted once and matched with
+# a forward merge_asof per job, O(n log n) overall.
+# Returns one row per failure: JobName, ProcessingDate, FailedAt, RecoveredAt, RecoveryHours
+# (RecoveredAt and RecoveryHours are empty while the job has not recovered).
+def pair_failures(runs):
+    runs = runs.assign(StartTime=pd.to_datetime(runs['StartTime']), EndTime=pd.to_datetime(runs['EndTime']))
+    failed = runs.loc[runs['Status'] == 'Failed', ['JobName', 'ProcessingDate', 'StartTime', 'EndTime']]
+    failed = failed.assign(FailedAt=failed['EndTime'].fillna(failed['StartTime'])).sort_values('FailedAt')
+    succeeded = runs.loc[(runs['Status'] != 'Failed') & runs['EndTime'].notna(), ['JobName', 'StartTime', 'EndTime']]
+    succeeded = succeeded.rename(columns={'StartTime': 'SuccessStart', 'EndTime': 'RecoveredAt'}).sort_values('SuccessStart')
+
+    pairs = pd.merge_asof(
+        failed[['JobName', 'ProcessingDate', 'FailedAt']], succeeded,
+        left_on='FailedAt', right_on='SuccessStart', by='JobName', direction='forward'
+    )
+    pairs['RecoveryHours'] = (pairs['RecoveredAt'] - pairs['FailedAt']).dt.total_seconds() / 3600
+    return pairs[['JobName', 'ProcessingDate', 'FailedAt', 'RecoveredAt', 'RecoveryHours']]
+
+
+# Function to summarise failure pairs by a column: failures, how many recovered, and
+# the mean time to recovery (MTTR) of the recovered ones, in hours
+def mttr_by(pairs, column):
+    grouped = pairs.groupby(column, observed=True)
+    return pd.DataFrame({
+        'Failures': grouped.size(),
+        'Recovered': grouped['RecoveredAt'].count(),
+        'MTTRHours': grouped['RecoveryHours'].mean(),
+    }).reset_index()
+
+
+# Function to get the recovery analysis for a processing date's 30-day rows, computed
+# once and cached like the figures (until the date or the window changes).
+# Returns a dict with 'pairs', 'by_job' and 'by_day' frames.
+def recovery_analysis(selected_date, df_30_days, cache=recovery_cache):
+    analysis = cache.get(selected_date)
+    if analysis is None:
+        pairs = pair_failures(df_30_days)
+        analysis = {'pairs': pairs, 'by_job': mttr_by(pairs, 'JobName'), 'by_day': mttr_by(pairs, 'ProcessingDate')}
+        now = datetime.now()
+        ttls = [ttl for ttl in (ttl_for_date(selected_date, now), ttl_for_window(now)) if ttl is not None]
+        cache.set(selected_date, analysis, min(ttls) if ttls else None)
+    return analysis
+
+
+# Function to drop cached analyses (e.g. once a batch completes)
+def invalidate_recovery(cache=recovery_cache):
+    return cache.invalidate()
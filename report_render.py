@@ -0,0 +1,145 @@
+import logging
+import os
+import tempfile
+import time
+from io import BytesIO
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from data_cache import fetch_cached
+from figures import build_outputs, frames_for, get_cached_outputs
+from job_table import JOB_TABLE_COLUMNS, format_jobs
+from table_render import HEADER_STYLE
+
+logger = logging.getLogger(__name__)
+
+# Report image size in pixels; figures are exported at this width
+REPORT_WIDTH = 1400
+FIGURE_HEIGHT = 500
+TITLE_HEIGHT = 90
+TABLE_ROW_HEIGHT = 26
+
+# Main dashboard figures in the report, in page order
+REPORT_FIGURES = ['status-bar-graph', 'failure-trend-graph', 'time-difference-graph-main']
+
+# Striped body rows, like the tables on the page
+ROW_COLOURS = ['white', '#f2f2f2']
+
+# What the server needs for the static export, shown when it fails
+EXPORT_REQUIREMENTS = ("The report needs Pillow and kaleido. kaleido 1.x drives a headless Chrome: install it with "
+                       "plotly_get_chrome (or Google Chrome), or pin kaleido<1, which ships its own Chromium.")
+
+
+# Function to draw a DataFrame as a Plotly table sized to its rows
+def table_figure(frame, columns, title):
+    fig = go.Figure(go.Table(
+        header=dict(values=[f"<b>{column}</b>" for column in columns], fill_color=HEADER_STYLE['backgroundColor'],
+                    font=dict(color='white', size=14), align='left', height=TABLE_ROW_HEIGHT),
+        cells=dict(values=[frame[column].tolist() for column in columns], align='left', height=TABLE_ROW_HEIGHT,
+                   fill_color=[[ROW_COLOURS[row % 2] for row in range(len(frame))]], line_color='#dee2e6')
+    ))
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=21, family='Arial, bold', color='rgba(42, 63, 95, 1)')),
+        margin=dict(l=20, r=20, t=60, b=10),
+        height=60 + TABLE_ROW_HEIGHT * (len(frame) + 2)
+    )
+    return fig
+
+
+# Function to draw the report title
+def title_figure(selected_date):
+    fig = go.Figure()
+    fig.add_annotation(text=f"<b>ASPIRE DASHBOARD</b> - {selected_date}", x=0.5, y=0.5, xref='paper', yref='paper',
+                       showarrow=False, font=dict(size=30, color='#2A3F5F'))
+    fig.update_layout(xaxis=dict(visible=False), yaxis=dict(visible=False), plot_bgcolor='white',
+                      margin=dict(l=0, r=0, t=0, b=0), height=TITLE_HEIGHT)
+    return fig
+
+
+# Function to build the report panels for a processing date: the title, the Unlock
+# Online and job tables, then the main figures (from the figure cache when possible)
+def report_panels(selected_date):
+    outputs = get_cached_outputs(selected_date, REPORT_FIGURES)
+    missing = [output_id for output_id in REPORT_FIGURES if output_id not in outputs]
+    frames = fetch_cached(selected_date, kinds=frames_for(missing) | {'jobs', 'unlock_online'})
+    if missing:
+        outputs.update(build_outputs(selected_date, frames, missing))
+
+    unlock_online = frames['unlock_online'].assign(
+        CompletionTime=pd.to_datetime(frames['unlock_online']['CompletionTime']).dt.strftime('%I:%M:%S %p')
+    )
+    panels = [
+        title_figure(selected_date),
+        table_figure(unlock_online, ['JobName', 'CompletionTime', 'Status'], "Aspire Unlock Online"),
+        table_figure(format_jobs(frames['jobs']), JOB_TABLE_COLUMNS, "Jobs"),
+    ]
+    for output_id in REPORT_FIGURES:
+        fig = go.Figure(outputs[output_id])
+        fig.update_layout(height=FIGURE_HEIGHT)
+        panels.append(fig)
+    return panels
+
+
+# Function to export the panels to PNG images in one go. Newer Plotly (kaleido 1.x)
+# exports a batch in a single session with write_images; older versions keep their
+# kaleido process between to_image calls anyway. Raises RuntimeError naming what is
+# missing when the export cannot run (no Pillow, no kaleido, or no Chrome for kaleido 1.x).
+def export_panels(panels, width=REPORT_WIDTH):
+    try:
+        return _export_panels(panels, width)
+    except (ImportError, ValueError, RuntimeError) as error:
+        reason = next((line.strip() for line in str(error).splitlines() if line.strip()), type(error).__name__)
+        raise RuntimeError(f"Report image export is unavailable ({reason}). {EXPORT_REQUIREMENTS}") from error
+
+
+def _export_panels(panels, width):
+    import plotly.io as pio
+    from PIL import Image
+
+    if not hasattr(pio, 'write_images'):
+        return [Image.open(BytesIO(pio.to_image(fig, format='png', width=width, height=fig.layout.height))) for fig in panels]
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"panel{number}.png") for number in range(len(panels))]
+        pio.write_images(panels, paths, format='png', width=width, height=[fig.layout.height for fig in panels])
+        images = [Image.open(path) for path in paths]
+        for image in images:
+            image.load()
+    return images
+
+
+# Function to render the dashboard report for a processing date as one PNG, straight
+# from the figures (Plotly static export through kaleido, stacked with PIL), without
+# opening the dashboard in a browser. kaleido itself still runs a headless browser:
+# Chrome for kaleido 1.x (see EXPORT_REQUIREMENTS).
+# `logo_path` is pasted in the top left corner when the file exists.
+def render_report(selected_date, image_path, logo_path=None, width=REPORT_WIDTH):
+    from PIL import Image
+
+    start = time.perf_counter()
+    panels = report_panels(selected_date)
+    built = time.perf_counter()
+
+    images = export_panels(panels, width)
+    exported = time.perf_counter()
+
+    report = Image.new('RGB', (width, sum(image.size[1] for image in images)), 'white')
+    y_offset = 0
+    for image in images:
+        report.paste(image, (0, y_offset))
+        y_offset += image.size[1]
+
+    if logo_path:
+        try:
+            logo = Image.open(logo_path)
+        except OSError:
+            logo = None
+        if logo is not None:
+            logo.thumbnail((TITLE_HEIGHT * 3, TITLE_HEIGHT - 20))
+            report.paste(logo, (10, 10), logo if logo.mode == 'RGBA' else None)
+
+    report.save(image_path)
+    logger.info("Rendered report for %s in %.2fs (panels %.2fs, export %.2fs)", selected_date,
+                time.perf_counter() - start, built - start, exported - built)
+    return image_path
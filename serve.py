@@ -0,0 +1,55 @@
+import logging
+import os
+
+from main import server
+
+# Production entry point for the dashboard.
+#
+# Single process (works on Windows):
+#     python serve.py
+# Several worker processes (Linux), sharing one result cache file:
+#     ASPIRE_CACHE_PATH=/var/tmp/aspire_cache.db gunicorn serve:server -w 4 --threads 32 -b 0.0.0.0:8050
+#
+# Settings come from the environment:
+#     ASPIRE_HOST        interface to listen on (default 0.0.0.0)
+#     ASPIRE_PORT        port (default 8050)
+#     ASPIRE_THREADS     request threads per process (default 32)
+#     ASPIRE_CACHE_PATH  SQLite file for a cache shared across processes (default: in-process cache)
+#     ASPIRE_PREFETCH    set to 0 to turn off background cache warming
+#     ASPIRE_PREFETCH_LOCK file whose lock picks the one process that warms the cache
+#                        (default: aspire_prefetch.lock in the temp directory); with
+#                        several workers, set ASPIRE_CACHE_PATH so they all see it warm
+#     ASPIRE_EMAIL_JOBS_PATH SQLite file of email job status, shared by all processes
+#                        (default: ./email_jobs.db)
+#     ASPIRE_LIVE_STREAMS live event streams per process before viewers poll instead (default 8)
+#     ASPIRE_FAKE_EVENTS set to 1 to play a simulated batch in live mode (no SQL Server)
+#     ASPIRE_SNAPSHOT_DIR directory of the columnar day files for closed dates (default: ./snapshots;
+#                        Arrow IPC when pyarrow is installed, pickled DataFrames otherwise)
+#
+# Email reports are rendered on the server with Plotly's static export: install
+# Pillow and kaleido, and with kaleido 1.x also Chrome (run plotly_get_chrome), or
+# pin kaleido<1, which ships its own Chromium.
+#
+# Every browser in live mode holds one request thread open for /live-events. A
+# request thread held by a stream serves nothing else, and once all threads are held
+# every request (every Dash callback of every user) waits for one to free up. So each
+# process keeps at most ASPIRE_LIVE_STREAMS streams open (default 8, well under
+# ASPIRE_THREADS) and answers 503 past that, and those browsers poll /live-state every
+# LIVE_INTERVAL instead. Raise both together for more live viewers; a stream also ends
+# after live_monitor.STREAM_SECONDS and the browser reconnects. Any worker can render
+# a live event: the event itself carries the counts and changed rows.
+
+HOST = os.environ.get('ASPIRE_HOST', '0.0.0.0')
+PORT = int(os.environ.get('ASPIRE_PORT', '8050'))
+THREADS = int(os.environ.get('ASPIRE_THREADS', '32'))
+
+
+def main():
+    from waitress import serve
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s %(message)s')
+    serve(server, host=HOST, port=PORT, threads=THREADS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# Local directory holding one columnar file per closed day and kind of rows
+SNAPSHOT_DIR = os.environ.get('ASPIRE_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'))
+
+# Columns stored as categoricals (dictionary-encoded on disk) and as datetime64
+CATEGORY_COLUMNS = ('JobName', 'Status')
+TIME_COLUMNS = ('StartTime', 'EndTime')
+
+# Days in the rolling window of raw runs (the 30-day figures)
+WINDOW_DAYS = 30
+
+
+# Function to get pyarrow when it is installed. Day files are then Arrow IPC
+# (Feather v2) with lz4 compression, read through a memory map; without it they
+# are pickled DataFrames, which keep the same dtypes but are read in full.
+def _arrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+    except ImportError:
+        return None
+    return pyarrow
+
+
+# Function to give a frame its stored dtypes: categorical job names and statuses
+# (sorted categories, so sorting by them matches sorting the text) and datetime64
+# start and end times
+def to_columnar(frame):
+    categorical = {column: frame[column].astype('category') for column in CATEGORY_COLUMNS if column in frame}
+    return frame.assign(
+        **{column: values.cat.reorder_categories(sorted(values.cat.categories)) for column, values in categorical.items()},
+        **{column: pd.to_datetime(frame[column]) for column in TIME_COLUMNS
+           if column in frame and not pd.api.types.is_datetime64_any_dtype(frame[column])}
+    )
+
+
+# Function to concatenate day frames into one columnar frame
+def concat_frames(frames):
+    if not frames:
+        return pd.DataFrame()
+    return to_columnar(pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0])
+
+
+# Function to build the path of one day's file
+def snapshot_path(kind, day, directory=SNAPSHOT_DIR):
+    return os.path.join(directory, kind, f"{day}.{'arrow' if _arrow() else 'pkl'}")
+
+
+# Function to check which of the days already have a file
+def stored_days(kind, days, directory=SNAPSHOT_DIR):
+    return [day for day in days if os.path.exists(snapshot_path(kind, day, directory))]
+
+
+# Function to write one closed day's rows. The file is written next to its final
+# name and moved into place, so readers never see half a file.
+def save_snapshot(kind, day, frame, directory=SNAPSHOT_DIR):
+    path = snapshot_path(kind, day, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial_path = f"{path}.{os.getpid()}.partial"
+    frame = to_columnar(frame.reset_index(drop=True))
+    pa = _arrow()
+    if pa:
+        pa.feather.write_feather(pa.Table.from_pandas(frame, preserve_index=False), partial_path, compression='lz4')
+    else:
+        frame.to_pickle(partial_path)
+    os.replace(partial_path, path)
+
+
+# Function to read one day's rows, or None when the day has no file
+def load_snapshot(kind, day, directory=SNAPSHOT_DIR):
+    if not stored_days(kind, [day], directory):
+        return None
+    return load_days(kind, [day], directory)
+
+
+# Function to read and concatenate the files of the given days (all must exist).
+# With pyarrow the memory-mapped tables are joined before a single conversion to pandas.
+def load_days(kind, days, directory=SNAPSHOT_DIR):
+    paths = [snapshot_path(kind, day, directory) for day in days]
+    pa = _arrow()
+    if not pa:
+        return concat_frames([pd.read_pickle(path) for path in paths])
+    tables = [pa.feather.read_table(path, memory_map=True) for path in paths]
+    table = pa.concat_tables(tables, promote_options='permissive') if len(tables) > 1 else tables[0]
+    return concat_frames([table.unify_dictionaries().to_pandas()])
+
+
+# Function to remove a day's file (e.g. after a rerun changed its rows)
+def drop_snapshot(kind, day, directory=SNAPSHOT_DIR):
+    try:
+        os.remove(snapshot_path(kind, day, directory))
+        return True
+    except FileNotFoundError:
+        return False
+
+
+# Function to remove the files of days before `oldest_day` (e.g. days that left the
+# rolling window). Returns the days removed.
+def prune_snapshots(kind, oldest_day, directory=SNAPSHOT_DIR):
+    try:
+        names = os.listdir(os.path.join(directory, kind))
+    except FileNotFoundError:
+        return []
+    removed = []
+    for name in sorted(names):
+        day = name.split('.', 1)[0]
+        if day >= oldest_day:
+            continue
+        try:
+            os.remove(os.path.join(directory, kind, name))
+        except FileNotFoundError:
+            continue
+        removed.append(day)
+    return removed
+
+
+# Function to list the whole days in the rolling window ending today, oldest first
+def window_days(now=None, days=WINDOW_DAYS):
+    today = (now or datetime.now()).date()
+    return [(today - timedelta(days=back)).strftime('%Y-%m-%d') for back in range(days - 1, -1, -1)]
+
+
+# Function to split a window into the leading days that have files and the first
+# day that must still be queried (None when every day has a file)
+def split_window(kind, days, directory=SNAPSHOT_DIR):
+    stored = set(stored_days(kind, days, directory))
+    for position, day in enumerate(days):
+        if day not in stored:
+            return days[:position], day
+    return days, None
@@ -0,0 +1,36 @@
+import dash_bootstrap_components as dbc
+from dash import dash_table, html
+
+# Header colours of the Bootstrap 'bg-primary text-white' header used by the other tables
+HEADER_STYLE = {'backgroundColor': '#0d6efd', 'color': 'white', 'fontWeight': 'bold', 'border': '1px solid #dee2e6'}
+CELL_STYLE = {'textAlign': 'left', 'padding': '8px', 'fontFamily': 'inherit', 'border': '1px solid #dee2e6'}
+STRIPED_ROWS = [{'if': {'row_index': 'odd'}, 'backgroundColor': 'rgba(0, 0, 0, 0.05)'}]
+
+
+# Function to build table body rows in one pass over column arrays
+# (zip of plain lists instead of one iloc lookup per cell)
+def table_rows(column_arrays, row_classes=None):
+    if row_classes is None:
+        return [html.Tr([html.Td(value) for value in row]) for row in zip(*column_arrays)]
+    return [html.Tr([html.Td(value) for value in row], className=row_class) for row, row_class in zip(zip(*column_arrays), row_classes)]
+
+
+# Function to render DataFrame columns as a dbc.Table with the dashboard's header style
+def render_table(frame, columns, headers=None, row_classes=None, **table_kwargs):
+    header = html.Thead(html.Tr([html.Th(title) for title in (headers or columns)]), className='bg-primary text-white')
+    body = html.Tbody(table_rows([frame[col].tolist() for col in columns], row_classes))
+    return dbc.Table([header, body], **table_kwargs)
+
+
+# Function to render records as a dash_table.DataTable styled like the dbc tables.
+# Rows travel as one list of dicts instead of a component per cell.
+def render_data_table(records, columns, **data_table_kwargs):
+    return dash_table.DataTable(
+        data=records,
+        columns=[{'name': col, 'id': col} for col in columns],
+        style_header=HEADER_STYLE,
+        style_cell=CELL_STYLE,
+        style_data_conditional=STRIPED_ROWS,
+        style_table={'overflowX': 'auto'},
+        **data_table_kwargs
+    )
@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep tests away from the real snapshot directory and the background prefetcher
+os.environ.setdefault('ASPIRE_SNAPSHOT_DIR', tempfile.mkdtemp(prefix='aspire_snapshots_'))
+os.environ.setdefault('ASPIRE_PREFETCH', '0')
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from anomaly_engine import AnomalyEngine
+
+# The three-hour TRIAD run, and a two-minute job that starts a minute after it
+TYPICAL_MINUTES = {'18. TRIAD': 180.0, '3. Extract': 2.0}
+
+
+# Nights of both jobs with a few percent of noise, one row per job and night
+def nights(count, first_day=0, seed=5):
+    rng = np.random.default_rng(seed + first_day)
+    rows = []
+    for day in range(first_day, first_day + count):
+        start = datetime(2026, 9, 1, 21) + timedelta(days=day)
+        for number, (job_name, minutes) in enumerate(TYPICAL_MINUTES.items()):
+            rows.append({'TaskHistoryOid': day * 10 + number, 'JobName': job_name,
+                         'StartTime': start + timedelta(minutes=number), 'DurationMinutes': minutes * rng.normal(1.0, 0.03)})
+    return pd.DataFrame(rows)
+
+
+def test_runs_are_scored_against_their_own_job():
+    engine = AnomalyEngine()
+    engine.update(nights(20))
+    tonight = nights(1, first_day=20)
+    tonight.loc[tonight['JobName'] == '3. Extract', 'DurationMinutes'] = 20.0
+    tonight.loc[tonight['JobName'] == '18. TRIAD', 'DurationMinutes'] = 185.0
+
+    scored = engine.update(tonight).set_index('JobName')
+    # Ten times its usual two minutes is far out for the short job; TRIAD's normal hours are not
+    assert scored.loc['3. Extract', 'Anomaly']
+    assert not scored.loc['18. TRIAD', 'Anomaly']
+    assert engine.recent_anomalies(datetime(2026, 9, 1))['JobName'].tolist() == ['3. Extract']
+
+
+def test_feeding_the_same_window_twice_changes_nothing():
+    engine = AnomalyEngine()
+    window = nights(30)
+    engine.update(window)
+    stats, anomalies = engine.stats(), engine.recent_anomalies(datetime(2026, 9, 1))
+
+    assert engine.update(window).empty
+    assert_frame_equal(engine.stats(), stats)
+    assert_frame_equal(engine.recent_anomalies(datetime(2026, 9, 1)), anomalies)
+
+
+def test_run_still_going_is_scored_once_it_finishes():
+    engine = AnomalyEngine()
+    engine.update(nights(20))
+    tonight = nights(1, first_day=20)
+    running = tonight.assign(DurationMinutes=tonight['DurationMinutes'].where(tonight['JobName'] != '18. TRIAD'))
+
+    assert engine.update(running)['JobName'].tolist() == ['3. Extract']
+    # TRIAD started before the Extract run already folded in. The next window holds
+    # it finished (a slow one) and the Extract run again
+    finished = tonight.assign(DurationMinutes=tonight['DurationMinutes'].where(tonight['JobName'] != '18. TRIAD', 900.0))
+    scored = engine.update(pd.concat([nights(20), finished], ignore_index=True))
+    assert scored['JobName'].tolist() == ['18. TRIAD']
+    assert scored['Anomaly'].tolist() == [True]
@@ -0,0 +1,34 @@
+import pandas as pd
+
+import data_cache
+from data_cache import ResultCache, SqliteResultCache
+from snapshot_store import save_snapshot, stored_days
+
+
+def test_shared_cache_hits_do_not_write(tmp_path, monkeypatch):
+    cache = SqliteResultCache(str(tmp_path / 'cache.db'))
+    cache.set(('jobs', '2026-10-14'), [1, 2, 3])
+    changes = cache._conn().total_changes
+    assert [cache.get(('jobs', '2026-10-14')) for _ in range(3)] == [[1, 2, 3]] * 3
+    assert cache._conn().total_changes == changes
+
+    # An entry last used longer ago than the resolution has its time moved forward
+    monkeypatch.setattr(data_cache, 'LAST_USED_RESOLUTION', 0)
+    assert cache.get(('jobs', '2026-10-14')) == [1, 2, 3]
+    assert cache._conn().total_changes == changes + 1
+    assert cache.stats()['hits'] == 4
+
+
+def test_invalidating_a_date_drops_its_day_files_and_the_window():
+    cache = ResultCache()
+    rows = pd.DataFrame({'ProcessingDate': ['2026-10-14'], 'JobName': ['1. Extract'], 'Status': ['Succeeded']})
+    for kind in ('jobs', 'runs'):
+        save_snapshot(kind, '2026-10-14', rows)
+    cache.set(('jobs', '2026-10-14'), rows)
+    cache.set(('last_30_days', '2026-10-16'), rows)
+
+    data_cache.invalidate_date('2026-10-14', cache)
+    # A rerun changed the day's runs, so the rolling window is queried from that day again
+    assert stored_days('jobs', ['2026-10-14']) == stored_days('runs', ['2026-10-14']) == []
+    assert cache.get(('jobs', '2026-10-14')) is None
+    assert cache.get(('last_30_days', '2026-10-16')) is None
@@ -0,0 +1,36 @@
+import sqlite3
+
+from db_pool import ConnectionPool
+
+
+def test_checkin_rolls_back_open_transactions(tmp_path):
+    path = str(tmp_path / 'pool.db')
+    with sqlite3.connect(path) as setup:
+        setup.execute("CREATE TABLE runs (name TEXT)")
+    pool = ConnectionPool(lambda: sqlite3.connect(path, check_same_thread=False), max_size=1)
+
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO runs VALUES ('uncommitted')")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM runs").fetchone() == (0,)
+    assert pool.stats()['created'] == 1
+
+
+# Connection whose rollback fails, like one whose server went away
+class BrokenConnection:
+    closed = False
+
+    def rollback(self):
+        raise sqlite3.OperationalError("connection lost")
+
+    def close(self):
+        self.closed = True
+
+
+def test_connection_that_cannot_roll_back_is_discarded():
+    broken = BrokenConnection()
+    pool = ConnectionPool(lambda: broken, max_size=1)
+    conn = pool.checkout()
+    pool.checkin(conn)
+    assert broken.closed
+    assert pool.stats()['discarded'] == 1 and pool.stats()['idle'] == 0
@@ -0,0 +1,48 @@
+import contextlib
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import duration_store
+
+FINISHED_RUNS = pd.DataFrame({
+    'ProcessingDate': ['2026-10-14', '2026-10-14'],
+    'JobName': ['1. Extract', '2. Load'],
+    'RunCount': [1, 2],
+    'TotalMinutes': [10.0, 30.0],
+    'LastEndTime': [datetime(2026, 10, 14, 22), datetime(2026, 10, 14, 23)],
+})
+
+
+# Pool stand-in; the rows come from the patched read_sql
+class FakePool:
+    @contextlib.contextmanager
+    def connection(self):
+        yield None
+
+
+def test_concurrent_syncs_merge_runs_once(tmp_path, monkeypatch):
+    path = str(tmp_path / 'durations.db')
+
+    # SQL Server returns the runs that ended after the mark, slowly
+    def read_sql(query, conn, params):
+        time.sleep(0.2)
+        return FINISHED_RUNS[FINISHED_RUNS['LastEndTime'] > params[0]]
+
+    monkeypatch.setattr(duration_store.pd, 'read_sql', read_sql)
+    # Two processes: nothing in-process keeps the syncs apart
+    monkeypatch.setattr(duration_store, '_sync_lock', contextlib.nullcontext())
+    syncs = [threading.Thread(target=duration_store.sync, args=(FakePool(), path, True)) for _ in range(2)]
+    for thread in syncs:
+        thread.start()
+    for thread in syncs:
+        thread.join()
+    monkeypatch.undo()
+
+    with contextlib.closing(sqlite3.connect(path)) as conn:
+        stored = conn.execute("SELECT JobName, RunCount, TotalMinutes FROM job_duration_daily ORDER BY JobName").fetchall()
+    assert stored == [('1. Extract', 1, 10.0), ('2. Load', 2, 30.0)]
+    assert duration_store.get_high_water_mark(path) == datetime(2026, 10, 14, 23)
@@ -0,0 +1,73 @@
+import threading
+import time
+
+from email_jobs import DONE, FAILED, RUNNING, EmailJobQueue, JobStore
+
+
+def test_status_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'email_jobs.db')
+    release = threading.Event()
+
+    def handler(selected_date, report_progress):
+        report_progress(40, "Rendering report")
+        release.wait(5)
+
+    # Two queues on one file stand for two worker processes
+    sender = EmailJobQueue(handler, JobStore(path), owner='host:1')
+    other = EmailJobQueue(lambda *args: None, JobStore(path), owner='host:2')
+    job_id = sender.submit('2026-10-14')
+
+    for _ in range(100):
+        job = other.get(job_id)
+        if job['status'] == RUNNING and job['progress'] == 40:
+            break
+        time.sleep(0.05)
+    assert job['message'] == "Rendering report"
+    # The date already has a running job, wherever it was queued
+    assert other.submit('2026-10-14') == job_id
+
+    release.set()
+    for _ in range(100):
+        if other.get(job_id)['status'] == DONE:
+            break
+        time.sleep(0.05)
+    assert other.get(job_id)['progress'] == 100
+    assert other.submit('2026-10-14') != job_id
+
+
+def test_expired_jobs_are_dropped(tmp_path):
+    store = JobStore(str(tmp_path / 'email_jobs.db'), retention=0)
+    store.save({'id': 'old', 'date': '2026-10-14', 'status': DONE})
+    assert store.get('old') is None
+
+
+def test_job_of_a_dead_process_does_not_block_its_date(tmp_path):
+    store = JobStore(str(tmp_path / 'email_jobs.db'), lease=0.2)
+    store.save({'id': 'dead', 'date': '2026-10-14', 'status': RUNNING, 'message': "Rendering report", 'owner': 'host:9'})
+    time.sleep(0.3)
+
+    # No heartbeat within the lease: the job reads as failed and a new one is queued
+    assert store.get('dead')['status'] == FAILED
+    queue = EmailJobQueue(lambda *args: None, store, owner='host:1')
+    assert queue.submit('2026-10-14') != 'dead'
+
+
+def test_leftover_jobs_of_this_owner_fail_on_start(tmp_path):
+    store = JobStore(str(tmp_path / 'email_jobs.db'))
+    store.save({'id': 'left', 'date': '2026-10-14', 'status': RUNNING, 'owner': 'host:1'})
+    store.save({'id': 'other', 'date': '2026-10-13', 'status': RUNNING, 'owner': 'host:2'})
+
+    # The restarted process has the same host and pid
+    queue = EmailJobQueue(lambda *args: None, store, owner='host:1')
+    assert queue.submit('2026-10-14') != 'left'
+    assert store.get('left')['status'] == FAILED
+    assert store.get('other')['status'] == RUNNING
+
+
+def test_heartbeat_keeps_a_long_job_alive(tmp_path):
+    store = JobStore(str(tmp_path / 'email_jobs.db'), lease=0.3)
+    store.save({'id': 'long', 'date': '2026-10-14', 'status': RUNNING, 'owner': 'host:1'})
+    for _ in range(3):
+        time.sleep(0.15)
+        store.heartbeat('host:1')
+    assert store.get('long')['status'] == RUNNING
@@ -0,0 +1,54 @@
+import sqlite3
+import warnings
+
+from db_pool import ConnectionPool
+from fetch_engine import run_concurrently
+
+
+# SQLite connection that records the query timeouts set on it, like pyodbc's Connection.timeout
+class TimedConnection:
+    def __init__(self):
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._timeout = 0
+        self.timeouts = []
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, seconds):
+        self._timeout = seconds
+        self.timeouts.append(seconds)
+
+    def cursor(self):
+        return self._conn.cursor()
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def test_queries_run_with_a_driver_timeout():
+    connections = []
+
+    def connect():
+        connections.append(TimedConnection())
+        return connections[-1]
+
+    pool = ConnectionPool(connect, max_size=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        frames, _ = run_concurrently({'one': 'SELECT 1 AS value', 'two': ('SELECT ? AS value', [2])}, pool=pool,
+                                     timeout={'one': 10, 'two': 2.5})
+    assert frames['one']['value'].tolist() == [1]
+    assert frames['two']['value'].tolist() == [2]
+    # Each query sets its remaining time and clears it before the connection is reused
+    timeouts = connections[0].timeouts
+    assert sorted(timeouts[::2]) == [3, 10] and timeouts[1::2] == [0, 0]
+    assert connections[0].timeout == 0
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from forecast import UNLOCK_JOB, forecast_unlock, remaining_profile
+
+JOBS = ['1. Extract', '2. Load', '18. TRIAD', UNLOCK_JOB]
+
+
+# Nights of jobs run one after another from 9 PM, 30 minutes each
+def nights(dates, jobs=JOBS):
+    rows = []
+    for selected_date in dates:
+        start = datetime.strptime(selected_date, '%Y-%m-%d') + timedelta(hours=21)
+        for job_name in jobs:
+            rows.append({'ProcessingDate': selected_date, 'JobName': job_name, 'StartTime': start,
+                         'EndTime': start + timedelta(minutes=30), 'Status': 'Succeeded'})
+            start += timedelta(minutes=31)
+    return pd.DataFrame(rows)
+
+
+HISTORY_DATES = [f"2026-09-{day:02d}" for day in range(1, 11)]
+
+
+def test_profile_without_unlock_online_has_no_basis():
+    history = nights(HISTORY_DATES, jobs=JOBS[:-1])
+    profile = remaining_profile(history)
+    assert profile['jobs'].empty
+    assert profile['baseline'] is None
+
+
+def test_forecast_without_history_returns_none():
+    profile = remaining_profile(nights(HISTORY_DATES, jobs=JOBS[:-1]))
+    tonight = nights(['2026-10-19'], jobs=JOBS[:2])
+    assert forecast_unlock('2026-10-19', tonight, profile, now=datetime(2026, 10, 19, 22)) is None
+    assert forecast_unlock('2026-10-19', tonight.iloc[:0], profile, now=datetime(2026, 10, 19, 20)) is None
+
+
+def test_forecast_from_the_latest_job_seen():
+    profile = remaining_profile(nights(HISTORY_DATES))
+    tonight = nights(['2026-10-19'], jobs=JOBS[:2])
+    forecast = forecast_unlock('2026-10-19', tonight, profile, now=datetime(2026, 10, 19, 22))
+    assert forecast['Basis'] == '2. Load end'
+    # UnLock Online ended 62 minutes after 2. Load every night
+    assert forecast['Estimate'] == pd.Timestamp('2026-10-19 22:01') + timedelta(minutes=62)
+    assert forecast['Low'] <= forecast['Estimate'] <= forecast['High']
+
+
+def test_forecast_when_unlock_online_finished():
+    profile = remaining_profile(nights(HISTORY_DATES))
+    tonight = nights(['2026-10-19'])
+    assert forecast_unlock('2026-10-19', tonight, profile)['Basis'] == 'Done'
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from job_table import apply_filter_query, format_jobs, split_filter_part
+
+
+@pytest.mark.parametrize('filter_part, expected', [
+    ('{Status} contains Fail', ('Status', 'contains', 'Fail')),
+    ('{Status} = Failed', ('Status', 'eq', 'Failed')),
+    ('{StartDate} >= 2026-10-14', ('StartDate', 'ge', '2026-10-14')),
+    ('{StartDate} datestartswith 2026-10', ('StartDate', 'datestartswith', '2026-10')),
+    # Operator words and symbols inside the value belong to the value
+    ('{JobName} contains "Exchange Rate"', ('JobName', 'contains', 'Exchange Rate')),
+    ('{JobName} contains "ge le lt"', ('JobName', 'contains', 'ge le lt')),
+    ('{JobName} eq "a >= b"', ('JobName', 'eq', 'a >= b')),
+    ('{JobName} contains "say \\"contains\\""', ('JobName', 'contains', 'say "contains"')),
+    ('{JobName} eq contains', ('JobName', 'eq', 'contains')),
+])
+def test_split_filter_part(filter_part, expected):
+    assert split_filter_part(filter_part) == expected
+
+
+def test_split_filter_part_without_operator():
+    assert split_filter_part('{JobName}') == (None, None, None)
+    assert split_filter_part('JobName contains x') == (None, None, None)
+
+
+def test_filter_value_with_operator_words():
+    start = datetime(2026, 10, 14, 21)
+    jobs = pd.DataFrame({
+        'JobName': ['12. Exchange Rate Load', '13. Greater Rates', '14. Benchmark'],
+        'StartTime': [start, start + timedelta(minutes=5), start + timedelta(minutes=9)],
+        'EndTime': [start + timedelta(minutes=4), start + timedelta(minutes=8), None],
+        'Status': ['Succeeded', 'Failed', 'Running'],
+    })
+    filtered = apply_filter_query(format_jobs(jobs), '{JobName} contains "Exchange Rate" && {Status} ne Failed')
+    assert filtered['JobName'].tolist() == ['12. Exchange Rate Load']
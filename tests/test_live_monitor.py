@@ -0,0 +1,131 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import live_monitor
+from live_monitor import FakeEventSource, LiveFeed, merge_delta
+
+SELECTED_DATE = '2026-10-14'
+
+
+@pytest.fixture
+def fake_events(monkeypatch):
+    monkeypatch.setattr(live_monitor, 'LIVE_INTERVAL', 0)
+    monkeypatch.setattr(live_monitor, '_states', {})
+    monkeypatch.setattr(live_monitor, 'delta_source', FakeEventSource(seed=1))
+
+
+def events_of(stream):
+    return [json.loads(chunk.split('data: ', 1)[1]) for chunk in stream if 'data: ' in chunk]
+
+
+def test_event_carries_counts_and_changed_rows(fake_events):
+    for _ in range(3):
+        live_monitor.refresh(SELECTED_DATE)
+    event = live_monitor.snapshot(SELECTED_DATE)
+    assert event['rows'] == 2 and event['counts']['Running'] == 1
+    # Only the round that started the second job changed, and the rows are ready to render
+    assert [row['JobName'] for row in event['changed']] == ['2. Job 2']
+    assert event['changed'][0]['EndTime'] == ''
+    json.dumps(event, allow_nan=False)
+
+
+def test_stream_ends_after_its_time(fake_events):
+    feed = LiveFeed(interval=0.05)
+    start = time.monotonic()
+    events = events_of(feed.stream(SELECTED_DATE, seconds=0.3))
+    feed.stop()
+    assert time.monotonic() - start < 2
+    assert events and events[-1]['version'] > events[0]['version']
+    assert feed.watched_dates() == []
+
+
+def test_two_tasks_of_one_job_stay_apart():
+    start = datetime(2026, 10, 14, 21)
+    delta = pd.DataFrame({
+        'Joboid': [7, 7], 'TaskHistoryOid': [101, 102], 'JobName': ['5. Load', '5. Load'],
+        'StartTime': [start, start], 'EndTime': pd.to_datetime([None, None]), 'Status': ['Running', 'Running'],
+    })
+    frame, changed = merge_delta(None, delta)
+    finished = delta.iloc[[1]].assign(EndTime=start + timedelta(minutes=3), Status='Succeeded')
+    frame, changed = merge_delta(frame, finished)
+    assert frame['TaskHistoryOid'].tolist() == [101, 102]
+    assert frame['Status'].tolist() == ['Running', 'Succeeded']
+    assert changed['TaskHistoryOid'].tolist() == [102]
+
+
+DELTA_COLUMNS = ['ProcessingDate', 'Joboid', 'TaskHistoryOid', 'JobName', 'StartTime', 'EndTime', 'Status', 'Message',
+                 'RawStartTime', 'RawEndTime']
+
+
+# Delta rows the way pd.read_sql builds them: dtypes inferred from the values
+def read_sql_delta(*rows):
+    return pd.DataFrame.from_records(list(rows), columns=DELTA_COLUMNS)
+
+
+def test_live_rows_from_the_start_of_the_batch(monkeypatch):
+    start = datetime(2026, 10, 14, 21)
+    extract = (SELECTED_DATE, 1, 101, '1. Extract', start, None, 'Running', None, start, None)
+    extract_done = extract[:5] + (start + timedelta(minutes=5), 'Succeeded', 'Completed', start, start + timedelta(minutes=5))
+    load = (SELECTED_DATE, 2, 102, '2. Load', start + timedelta(minutes=6), None, 'Running', None, start + timedelta(minutes=6), None)
+    deltas = [read_sql_delta(), read_sql_delta(extract), read_sql_delta(extract_done, load)]
+    marks = []
+
+    def source(selected_date, last_start, last_end, pool=None):
+        marks.append((last_start, last_end))
+        return deltas.pop(0)
+
+    monkeypatch.setattr(live_monitor, 'LIVE_INTERVAL', 0)
+    monkeypatch.setattr(live_monitor, '_states', {})
+    monkeypatch.setattr(live_monitor, 'delta_source', source)
+    versions = [live_monitor.refresh(SELECTED_DATE) for _ in range(3)]
+
+    assert versions == [1, 2, 3]
+    frame, counts, _ = live_monitor.changes_since(SELECTED_DATE)
+    assert frame['JobName'].tolist() == ['1. Extract', '2. Load']
+    assert counts == {'Succeeded': 1, 'Running': 1}
+    changed, _, _ = live_monitor.changes_since(SELECTED_DATE, 2)
+    assert changed['TaskHistoryOid'].tolist() == [101, 102]
+    assert marks[-1] == (start, live_monitor.NO_MARK)
+
+
+def test_failed_merge_keeps_the_marks(monkeypatch):
+    start = datetime(2026, 10, 14, 21)
+    running = read_sql_delta((SELECTED_DATE, 1, 101, '1. Extract', start, None, 'Running', None, start, None))
+    monkeypatch.setattr(live_monitor, 'LIVE_INTERVAL', 0)
+    monkeypatch.setattr(live_monitor, '_states', {})
+    monkeypatch.setattr(live_monitor, 'delta_source', lambda *args, **kwargs: running)
+
+    def broken_merge(frame, delta):
+        raise ValueError("merge failed")
+
+    monkeypatch.setattr(live_monitor, 'merge_delta', broken_merge)
+    with pytest.raises(ValueError):
+        live_monitor.refresh(SELECTED_DATE)
+    state = live_monitor._state(SELECTED_DATE)
+    assert (state.last_start, state.last_end) == (live_monitor.NO_MARK, live_monitor.NO_MARK)
+
+
+def test_streams_past_the_limit_poll_instead(fake_events, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main.live_feed, 'max_streams', 1)
+    client = main.server.test_client()
+    first = client.get(f'/live-events?date={SELECTED_DATE}', buffered=False)
+    assert first.status_code == 200
+    refused = client.get(f'/live-events?date={SELECTED_DATE}', buffered=False)
+    assert refused.status_code == 503 and refused.headers['Retry-After'] == str(main.LIVE_INTERVAL)
+
+    state = client.get(f'/live-state?date={SELECTED_DATE}')
+    assert state.status_code == 200 and state.get_json()['rows'] == 1
+    assert client.get('/live-state?date=soon').status_code == 400
+
+    # Closing a stream frees its slot
+    first.close()
+    second = client.get(f'/live-events?date={SELECTED_DATE}', buffered=False)
+    assert second.status_code == 200
+    second.close()
+    main.live_feed.stop()
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import main
+
+SELECTED_DATE = '2026-10-14'
+JOB_ROWS = pd.DataFrame({'JobName': ['1. Extract'], 'Status': ['Running']})
+
+
+@pytest.fixture
+def frames(monkeypatch):
+    fetched = {}
+    requested = []
+
+    def fetch_cached(selected_date, kinds):
+        requested.append(set(kinds))
+        return {kind: fetched.get(kind, pd.DataFrame()) for kind in kinds}
+
+    monkeypatch.setattr(main, 'fetch_cached', fetch_cached)
+    monkeypatch.setattr(main, 'get_cached_outputs', lambda selected_date, output_ids: {})
+    monkeypatch.setattr(main, 'build_outputs', lambda selected_date, frames, output_ids: {output_id: 'built' for output_id in output_ids})
+    return fetched, requested
+
+
+def test_unlock_table_is_built_while_the_batch_runs(frames):
+    fetched, requested = frames
+    fetched['jobs'] = JOB_ROWS
+    # UnLock Online has not run yet, but the date has job rows
+    assert main.load_outputs(SELECTED_DATE, ['unlock-online-table']) == {'unlock-online-table': 'built'}
+    assert 'jobs' in requested[-1]
+
+
+def test_no_job_rows_means_no_data_for_every_output(frames):
+    fetched, _ = frames
+    fetched['failure_trend'] = pd.DataFrame({'Count': [3]})
+    assert main.load_outputs(SELECTED_DATE, ['failure-trend-graph']) is None
+    assert main.load_outputs(SELECTED_DATE, ['unlock-online-table']) is None
+
+
+# The clock main reads, stopped at `now`
+def clock(now):
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+    return Clock
+
+
+def test_unlock_eta_only_for_dates_that_can_have_data(frames, monkeypatch):
+    _, requested = frames
+    monkeypatch.setattr(main, 'is_batch_closed', lambda selected_date: False)
+    monkeypatch.setattr(main, 'cached_profile', lambda runs: None)
+    monkeypatch.setattr(main, 'forecast_unlock', lambda selected_date, jobs, profile: None)
+
+    # Before 9 PM today's batch has not started, and tomorrow's is further off
+    monkeypatch.setattr(main, 'datetime', clock(datetime(2026, 10, 14, 18)))
+    for selected_date in (SELECTED_DATE, '2026-10-15'):
+        assert main.update_unlock_eta(selected_date, None).children is None
+    assert requested == []
+
+    # From 9 PM today's batch runs and gets a forecast
+    monkeypatch.setattr(main, 'datetime', clock(datetime(2026, 10, 14, 22)))
+    main.update_unlock_eta(SELECTED_DATE, None)
+    assert requested == [{'jobs', 'last_30_days'}]
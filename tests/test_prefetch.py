@@ -0,0 +1,25 @@
+import prefetch
+
+
+def test_only_one_holder_of_the_prefetch_lock(tmp_path, monkeypatch):
+    path = str(tmp_path / 'prefetch.lock')
+    started = []
+    monkeypatch.setattr(prefetch, 'start_prefetcher', lambda: started.append(True))
+    monkeypatch.setattr(prefetch, '_lock_file', None)
+    monkeypatch.setattr(prefetch, '_lock_tried', None)
+
+    # Another process holds the lock: this one does not start, and does not retry at once
+    other = prefetch._try_lock(path)
+    assert other is not None
+    assert prefetch.ensure_prefetcher(path) is False
+    other.close()
+    assert prefetch.ensure_prefetcher(path) is False
+    assert started == []
+
+    # Once the retry interval has passed, the freed lock is taken and the prefetcher starts once
+    monkeypatch.setattr(prefetch, 'LOCK_RETRY_INTERVAL', 0)
+    assert prefetch.ensure_prefetcher(path) is True
+    assert prefetch.ensure_prefetcher(path) is True
+    assert started == [True]
+    assert prefetch._try_lock(path) is None
+    prefetch._lock_file.close()
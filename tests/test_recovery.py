@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from recovery import mttr_by, pair_failures
+
+NIGHT = datetime(2026, 10, 14, 21)
+
+
+# One run of a job: starts `start` hours after 9 PM and takes `hours` (None while it runs)
+def run(job_name, start, hours, status, processing_date='2026-10-14'):
+    started = NIGHT + timedelta(hours=start)
+    return {'JobName': job_name, 'ProcessingDate': processing_date, 'StartTime': started,
+            'EndTime': started + timedelta(hours=hours) if hours is not None else None, 'Status': status}
+
+
+RUNS = pd.DataFrame([
+    # Two failures in a row, then one success: both recover at that success
+    run('2. Load', 0, 0.5, 'Failed'),
+    run('2. Load', 1, 0.5, 'Failed'),
+    run('2. Load', 2, 1, 'Succeeded'),
+    # Fails the next night and has not recovered yet
+    run('2. Load', 24, 0.25, 'Failed', '2026-10-15'),
+    # A rerun starts an hour after the failure; recovery counts to its end
+    run('5. Extract', 0, 0.5, 'Failed'),
+    run('5. Extract', 1.5, 0.5, 'Succeeded'),
+])
+
+
+def test_consecutive_failures_recover_at_the_next_success():
+    pairs = pair_failures(RUNS)
+    load = pairs[(pairs['JobName'] == '2. Load') & (pairs['ProcessingDate'] == '2026-10-14')]
+    assert load['RecoveredAt'].tolist() == [NIGHT + timedelta(hours=3)] * 2
+    assert load['RecoveryHours'].tolist() == [2.5, 1.5]
+
+
+def test_failure_without_success_is_not_recovered():
+    pairs = pair_failures(RUNS)
+    open_failure = pairs[pairs['ProcessingDate'] == '2026-10-15']
+    assert len(open_failure) == 1
+    assert pd.isna(open_failure['RecoveredAt'].iloc[0]) and np.isnan(open_failure['RecoveryHours'].iloc[0])
+    by_day = mttr_by(pairs, 'ProcessingDate').set_index('ProcessingDate')
+    assert by_day.loc['2026-10-15', 'Recovered'] == 0
+    assert np.isnan(by_day.loc['2026-10-15', 'MTTRHours'])
+
+
+def test_rows_out_of_order_pair_the_same():
+    shuffled = RUNS.sample(frac=1, random_state=3).reset_index(drop=True)
+    ordered = ['JobName', 'FailedAt']
+    pd.testing.assert_frame_equal(pair_failures(shuffled).sort_values(ordered).reset_index(drop=True),
+                                  pair_failures(RUNS).sort_values(ordered).reset_index(drop=True))
+
+
+def test_mttr_per_job_and_per_day():
+    pairs = pair_failures(RUNS)
+    by_job = mttr_by(pairs, 'JobName').set_index('JobName')
+    assert by_job.loc['2. Load', ['Failures', 'Recovered']].tolist() == [3, 2]
+    assert by_job.loc['2. Load', 'MTTRHours'] == 2.0
+    assert by_job.loc['5. Extract', 'MTTRHours'] == 1.5
+
+    by_day = mttr_by(pairs, 'ProcessingDate').set_index('ProcessingDate')
+    assert by_day.loc['2026-10-14', ['Failures', 'Recovered']].tolist() == [3, 3]
+    assert by_day.loc['2026-10-14', 'MTTRHours'] == (2.5 + 1.5 + 1.5) / 3
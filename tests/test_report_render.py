@@ -0,0 +1,14 @@
+import plotly.graph_objects as go
+import plotly.io as pio
+import pytest
+
+from report_render import export_panels
+
+
+def test_export_without_chrome_says_what_is_missing(monkeypatch):
+    def write_images(*args, **kwargs):
+        raise RuntimeError("\n\nKaleido requires Google Chrome to be installed.\n\n    $ plotly_get_chrome\n")
+
+    monkeypatch.setattr(pio, 'write_images', write_images, raising=False)
+    with pytest.raises(RuntimeError, match=r"unavailable \(Kaleido requires Google Chrome to be installed\.\).*kaleido<1"):
+        export_panels([go.Figure(layout=dict(height=100))])
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import snapshot_store
+from snapshot_store import load_days, load_snapshot, prune_snapshots, save_snapshot, split_window, stored_days
+
+DAYS = ['2026-10-12', '2026-10-13', '2026-10-14', '2026-10-15']
+
+
+# Run both file formats: Arrow IPC when pyarrow is installed, pickles without it
+@pytest.fixture(params=['arrow', 'pickle'])
+def directory(request, tmp_path, monkeypatch):
+    if request.param == 'arrow':
+        pytest.importorskip('pyarrow')
+    else:
+        monkeypatch.setattr(snapshot_store, '_arrow', lambda: None)
+    return str(tmp_path)
+
+
+# Rows of one day as read_sql returns them: text names and statuses, an unfinished run
+def day_rows(day, job_names):
+    start = datetime.strptime(day, '%Y-%m-%d').replace(hour=21)
+    return pd.DataFrame({
+        'ProcessingDate': day,
+        'TaskHistoryOid': range(len(job_names)),
+        'JobName': job_names,
+        'Status': ['Succeeded'] * (len(job_names) - 1) + ['Running'],
+        'StartTime': [start] * len(job_names),
+        'EndTime': [start.replace(hour=22)] * (len(job_names) - 1) + [None],
+    })
+
+
+def test_day_round_trips_with_its_dtypes(directory):
+    save_snapshot('runs', DAYS[0], day_rows(DAYS[0], ['2. Load', '1. Extract']), directory)
+    loaded = load_snapshot('runs', DAYS[0], directory)
+
+    assert loaded['JobName'].dtype == 'category' and loaded['Status'].dtype == 'category'
+    assert list(loaded['JobName'].cat.categories) == ['1. Extract', '2. Load']
+    assert pd.api.types.is_datetime64_any_dtype(loaded['StartTime'])
+    assert pd.api.types.is_datetime64_any_dtype(loaded['EndTime'])
+    assert loaded['JobName'].tolist() == ['2. Load', '1. Extract']
+    assert loaded['TaskHistoryOid'].tolist() == [0, 1]
+    assert pd.isna(loaded['EndTime'].iloc[1])
+    assert load_snapshot('runs', DAYS[1], directory) is None
+
+
+def test_empty_day_keeps_its_columns(directory):
+    rows = day_rows(DAYS[1], ['1. Extract', '2. Load'])
+    save_snapshot('runs', DAYS[0], rows.iloc[:0], directory)
+    save_snapshot('runs', DAYS[1], rows, directory)
+
+    assert list(load_snapshot('runs', DAYS[0], directory).columns) == list(rows.columns)
+    both = load_days('runs', DAYS[:2], directory)
+    assert both['JobName'].tolist() == ['1. Extract', '2. Load']
+    assert pd.api.types.is_datetime64_any_dtype(both['EndTime'])
+
+
+def test_days_with_different_jobs_share_one_dictionary(directory):
+    save_snapshot('runs', DAYS[0], day_rows(DAYS[0], ['3. Stage', '1. Extract']), directory)
+    save_snapshot('runs', DAYS[1], day_rows(DAYS[1], ['2. Load', '3. Stage']), directory)
+
+    window = load_days('runs', DAYS[:2], directory)
+    assert list(window['JobName'].cat.categories) == ['1. Extract', '2. Load', '3. Stage']
+    assert window['JobName'].tolist() == ['3. Stage', '1. Extract', '2. Load', '3. Stage']
+    assert window['Status'].tolist() == ['Succeeded', 'Running'] * 2
+    assert window.groupby('JobName', observed=True).size().to_dict() == {'1. Extract': 1, '2. Load': 1, '3. Stage': 2}
+
+
+def test_split_window_stops_at_the_first_missing_day(directory):
+    assert split_window('runs', DAYS, directory) == ([], DAYS[0])
+    for day in (DAYS[0], DAYS[1], DAYS[3]):
+        save_snapshot('runs', day, day_rows(day, ['1. Extract']), directory)
+    # The stored day after the gap is queried again with the rest
+    assert split_window('runs', DAYS, directory) == (DAYS[:2], DAYS[2])
+    save_snapshot('runs', DAYS[2], day_rows(DAYS[2], ['1. Extract']), directory)
+    assert split_window('runs', DAYS, directory) == (DAYS, None)
+
+
+def test_prune_removes_days_before_the_window(directory):
+    assert prune_snapshots('runs', DAYS[0], directory) == []
+    for day in DAYS:
+        save_snapshot('runs', day, day_rows(day, ['1. Extract']), directory)
+    save_snapshot('jobs', DAYS[0], day_rows(DAYS[0], ['1. Extract']), directory)
+
+    assert prune_snapshots('runs', DAYS[2], directory) == DAYS[:2]
+    assert stored_days('runs', DAYS, directory) == DAYS[2:]
+    assert stored_days('jobs', DAYS, directory) == DAYS[:1]
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from timeline import (ALL_JOBS_STEPS, MAIN_MILESTONES, TIME_DIFFERENCE_MILESTONES, critical_path, job_edges,
+                      milestone_hours, stream_summary)
+
+DATES = ['2026-10-12', '2026-10-13', '2026-10-14']
+
+# Jobs of a night: (name, start, hours), in hours after 9 PM. Step 2 runs two jobs side
+# by side, and step 10 runs after the 'All Jobs' window.
+NIGHT = [
+    ('1. Extract', 0.0, 0.5),
+    ('2. Load', 0.6, 1.0),
+    ('2. Load Reference', 0.6, 1.5),
+    ('9. Stage', 2.2, 0.3),
+    ('10. Publish', 2.6, 2.0),
+    ('18. TRIAD', 4.7, 3.0),
+    ('20. Benchmark Update', 8.0, 0.75),
+]
+
+
+# Runs of every date, each night a little later than the one before
+def runs():
+    rows = []
+    for number, selected_date in enumerate(DATES):
+        night = datetime.strptime(selected_date, '%Y-%m-%d') + timedelta(hours=21, minutes=10 * number)
+        for job_name, start, hours in NIGHT:
+            started = night + timedelta(hours=start)
+            rows.append({'ProcessingDate': selected_date, 'JobName': job_name, 'StartTime': started,
+                         'EndTime': started + timedelta(hours=hours + 0.1 * number), 'Status': 'Succeeded'})
+    return pd.DataFrame(rows)
+
+
+# The Time Difference tab before the milestones: TRIAD and Benchmark Update merged per date
+def old_triad_to_benchmark(df_30_days):
+    triad_df = df_30_days[df_30_days['JobName'] == '18. TRIAD']
+    benchmark_update_df = df_30_days[df_30_days['JobName'] == '20. Benchmark Update']
+    merged_df = pd.merge(triad_df, benchmark_update_df, on='ProcessingDate', suffixes=('_TRIAD', '_Benchmark'))
+    merged_df['TimeDifference'] = (merged_df['EndTime_Benchmark'] - merged_df['EndTime_TRIAD']).dt.total_seconds() / 3600
+    return merged_df.set_index('ProcessingDate')['TimeDifference']
+
+
+# The main dashboard bars before the milestones: a loop over the dates
+def old_main_bars(df_30_days):
+    bars = {}
+    for date in DATES:
+        triad_time = df_30_days[(df_30_days['ProcessingDate'] == date) & (df_30_days['JobName'] == '18. TRIAD')]['EndTime'].max()
+        benchmark_start_time = df_30_days[(df_30_days['ProcessingDate'] == date) & (df_30_days['JobName'] == '20. Benchmark Update')]['StartTime'].min()
+        all_jobs_df = df_30_days[(df_30_days['ProcessingDate'] == date) & (df_30_days['JobName'].str.match(r'^[1-9]\.'))]
+        bars[date] = {
+            'All Jobs': (all_jobs_df['EndTime'].max() - all_jobs_df['StartTime'].min()).total_seconds() / 3600,
+            'Sourcing Job': (benchmark_start_time - triad_time).total_seconds() / 3600,
+        }
+    return pd.DataFrame.from_dict(bars, orient='index')
+
+
+def test_milestones_match_the_old_lookups():
+    df_30_days = runs()
+    edges = job_edges(df_30_days)
+
+    time_difference = milestone_hours(edges, TIME_DIFFERENCE_MILESTONES).set_index('ProcessingDate')
+    pd.testing.assert_series_equal(time_difference['TRIAD to Benchmark Update'], old_triad_to_benchmark(df_30_days),
+                                   check_names=False)
+
+    main = milestone_hours(edges, MAIN_MILESTONES).set_index('ProcessingDate')
+    old = old_main_bars(df_30_days)
+    pd.testing.assert_series_equal(main['Sourcing Job'], old['Sourcing Job'], check_names=False)
+    all_jobs = stream_summary(edges, ALL_JOBS_STEPS).set_index('ProcessingDate')['DurationHours']
+    pd.testing.assert_series_equal(all_jobs, old['All Jobs'], check_names=False)
+
+
+def test_all_jobs_covers_steps_one_to_nine():
+    edges = job_edges(runs())
+    first_night = stream_summary(edges, ALL_JOBS_STEPS).iloc[0]
+    night = datetime(2026, 10, 12, 21)
+    # From Extract's start to Stage's end; Publish (step 10) and later steps are left out
+    assert first_night['StreamStart'] == night
+    assert first_night['StreamEnd'] == night + timedelta(hours=2.5)
+    assert stream_summary(edges).iloc[0]['StreamEnd'] == night + timedelta(hours=8.75)
+
+
+def test_critical_path_with_parallel_jobs():
+    edges = job_edges(runs())
+    path = critical_path(edges, '2026-10-12')
+    # Step 2 ends with its slower job; the faster one finished half an hour earlier
+    assert path['JobName'].tolist() == ['1. Extract', '2. Load Reference', '9. Stage', '10. Publish',
+                                        '18. TRIAD', '20. Benchmark Update']
+    step_two = edges[(edges['ProcessingDate'] == '2026-10-12') & (edges['Step'] == 2)].set_index('JobName')
+    assert step_two.loc['2. Load', 'SlackHours'] == 0.5
+    assert step_two.loc['2. Load Reference', 'SlackHours'] == 0.0
+    assert not step_two.loc['2. Load', 'Critical']
@@ -0,0 +1,75 @@
+from collections import namedtuple
+
+import pandas as pd
+
+# The time from one job's start or end ('Start' / 'End') to another's, per processing date.
+# Negative hours mean the second job started or ended before the first one.
+Milestone = namedtuple('Milestone', ['label', 'from_job', 'from_edge', 'to_job', 'to_edge'])
+
+# Milestones on the Time Difference tab (line and table)
+TIME_DIFFERENCE_MILESTONES = [
+    Milestone('TRIAD to Benchmark Update', '18. TRIAD', 'End', '20. Benchmark Update', 'End'),
+]
+
+# Milestones on the main dashboard's time difference bars, next to 'All Jobs'
+MAIN_MILESTONES = [
+    Milestone('Sourcing Job', '18. TRIAD', 'End', '20. Benchmark Update', 'Start'),
+]
+
+# Job steps whose first start to last end is the main dashboard's 'All Jobs' bar
+ALL_JOBS_STEPS = range(1, 10)
+
+
+# Function to reduce runs to one row per processing date and job in one grouped pass:
+# first Start, last End and the step number from the job name ('18. TRIAD' -> 18).
+# Steps run in number order, so the critical path is the job that ended last in each
+# step; SlackHours is how much earlier than that a job finished.
+def job_edges(runs):
+    edges = runs.groupby(['ProcessingDate', 'JobName'], sort=False, observed=True).agg(
+        Start=('StartTime', 'min'), End=('EndTime', 'max')
+    ).reset_index()
+    edges['Start'] = pd.to_datetime(edges['Start'])
+    edges['End'] = pd.to_datetime(edges['End'])
+    edges['Step'] = pd.to_numeric(edges['JobName'].str.extract(r'^(\d+)\.', expand=False))
+    step_end = edges.groupby(['ProcessingDate', 'Step'])['End'].transform('max')
+    edges['SlackHours'] = (step_end - edges['End']).dt.total_seconds() / 3600
+    edges['Critical'] = edges['Step'].notna() & (edges['End'] == step_end)
+    return edges.sort_values(['ProcessingDate', 'Start'], kind='mergesort').reset_index(drop=True)
+
+
+# Function to get each processing date's stream start, end and length in hours,
+# over the numbered jobs (or only the given steps)
+def stream_summary(edges, steps=None):
+    numbered = edges[edges['Step'].notna()]
+    if steps is not None:
+        numbered = numbered[numbered['Step'].isin(list(steps))]
+    summary = numbered.groupby('ProcessingDate').agg(StreamStart=('Start', 'min'), StreamEnd=('End', 'max'))
+    summary['DurationHours'] = (summary['StreamEnd'] - summary['StreamStart']).dt.total_seconds() / 3600
+    return summary.reset_index()
+
+
+# Function to list a processing date's critical path in step order
+def critical_path(edges, selected_date):
+    path = edges[(edges['ProcessingDate'] == selected_date) & edges['Critical']]
+    return path.sort_values('Step', kind='mergesort').reset_index(drop=True)
+
+
+# Function to compute milestone hours for every processing date.
+# Returns ProcessingDate plus one column per milestone label (empty where a job did not run).
+def milestone_hours(edges, milestones):
+    times = {edge: edges.pivot(index='ProcessingDate', columns='JobName', values=edge) for edge in ('Start', 'End')}
+    hours = pd.DataFrame(index=times['Start'].index)
+    for milestone in milestones:
+        start_times, end_times = times[milestone.from_edge], times[milestone.to_edge]
+        if milestone.from_job in start_times.columns and milestone.to_job in end_times.columns:
+            hours[milestone.label] = (end_times[milestone.to_job] - start_times[milestone.from_job]).dt.total_seconds() / 3600
+        else:
+            hours[milestone.label] = float('nan')
+    return hours.reset_index()
+
+
+# Function to measure the gap between two jobs per processing date, in hours:
+# positive is idle time between them, negative is how long they overlapped
+def gap_hours(edges, from_job, to_job, from_edge='End', to_edge='Start'):
+    gap = Milestone('GapHours', from_job, from_edge, to_job, to_edge)
+    return milestone_hours(edges, [gap])